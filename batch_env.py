@@ -0,0 +1,200 @@
+import argparse
+import os
+import sys
+import time
+
+# 화면/사운드 없이 실행 (shooting_python import 전에 설정해야 함, --render일 때만 창을 띄움)
+if "--render" not in sys.argv:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+import shooting_python as game
+
+# 행동: LEFT/RIGHT/SPACE/Z 입력 비트마스크 (0~15), ESC(일시정지)는 받지 않음
+ACTION_BITS = game.INPUT_LEFT | game.INPUT_RIGHT | game.INPUT_JUMP | game.INPUT_SHOOT
+NUM_ACTIONS = ACTION_BITS + 1
+LIFE_REWARD = 300       # 목숨 하나를 잃으면 -300, 하트로 되찾으면 +300 (적 하나 = 점수 100)
+ITEM_TYPES = ("speed", "shield", "heart")
+
+
+# === [배치 환경] ===
+# GameWorld N개를 같은 틱에 맞춰 한 번에 진행하고, 관측을 고정 크기 numpy 배열로 돌려줍니다.
+# 렌더링은 기본으로 끄며, 판이 끝난 월드는 다음 seed로 바로 새 판을 시작합니다.
+# 관측 배열은 매 step()마다 같은 배열에 덮어쓰므로 보관하려면 복사해서 써야 합니다.
+#
+# 관측 (N = 월드 수):
+#   player   (N, 4)     플레이어 rect (x, y, w, h)
+#   enemies  (N, E, 2)  적 왼쪽 위 좌표, 앞에서부터 enemy_count개만 유효 (나머지는 0)
+#   bullets  (N, B, 3)  총알 좌표 + 방향(1/-1)
+#   items    (N, I, 3)  아이템 좌표 + 종류(1=speed, 2=shield, 3=heart)
+#   *_count  (N,)       실제 개수 (최대 크기를 넘으면 잘림)
+#   lives, stage, score (N,)
+class BatchEnv:
+    def __init__(self, num_envs, seed=0, tuning=None, levels=None, max_enemies=32, max_bullets=16,
+                 max_items=4, frame_skip=1, max_ticks=None, life_reward=LIFE_REWARD, render=False):
+        self.num_envs = num_envs
+        self.seed = seed
+        self.frame_skip = frame_skip
+        self.max_ticks = max_ticks
+        self.life_reward = life_reward
+        self.render_mode = render
+        self.worlds = [game.GameWorld(seed + i, tuning, levels) for i in range(num_envs)]
+        for world in self.worlds:
+            # 파티클은 그림에만 쓰이므로 창에 그릴 때만 만듦
+            world.effects = render
+        self.next_seed = seed + num_envs
+        self.item_codes = {name: code for code, name in enumerate(ITEM_TYPES, 1)}
+
+        n = num_envs
+        self.obs = {
+            "player": np.zeros((n, 4), np.int16),
+            "enemies": np.zeros((n, max_enemies, 2), np.int16),
+            "enemy_count": np.zeros(n, np.int16),
+            "bullets": np.zeros((n, max_bullets, 3), np.int16),
+            "bullet_count": np.zeros(n, np.int16),
+            "items": np.zeros((n, max_items, 3), np.int16),
+            "item_count": np.zeros(n, np.int16),
+            "lives": np.zeros(n, np.int8),
+            "stage": np.zeros(n, np.int16),
+            "score": np.zeros(n, np.int32),
+        }
+        self.rewards = np.zeros(n, np.float32)
+        self.dones = np.zeros(n, bool)
+        self.final_scores = np.zeros(n, np.int32)    # 이번 step()에 끝난 판의 최종 점수 (dones인 자리만)
+        self.episodes = 0
+        self.env_steps = 0
+        self.static_layer = None
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        for i, world in enumerate(self.worlds):
+            world.reset(self.seed + i)
+        self.next_seed = self.seed + self.num_envs
+        self.write_obs()
+        return self.obs
+
+    def step(self, actions):
+        actions = np.asarray(actions).astype(np.int64) & ACTION_BITS
+        rewards = self.rewards
+        dones = self.dones
+        rewards.fill(0)
+        dones.fill(False)
+        life_reward = self.life_reward
+        max_ticks = self.max_ticks
+        for i, (world, bits) in enumerate(zip(self.worlds, actions.tolist())):
+            score = world.score
+            lives = world.player_lives
+            for _ in range(self.frame_skip):
+                world.step(bits)
+                # Z는 누른 틱에만 쏘므로 프레임을 건너뛸 때는 첫 틱에만 넣음
+                bits &= ~game.INPUT_SHOOT
+                if world.game_over:
+                    break
+            rewards[i] = world.score - score + (world.player_lives - lives) * life_reward
+            if world.game_over or (max_ticks is not None and world.tick >= max_ticks):
+                dones[i] = True
+                self.final_scores[i] = world.score
+                self.episodes += 1
+                world.reset(self.next_seed)
+                self.next_seed += 1
+        self.env_steps += self.num_envs
+        self.write_obs()
+        if self.render_mode:
+            self.render()
+            pygame.display.flip()
+        return self.obs, rewards, dones
+
+    def write_obs(self):
+        obs = self.obs
+        worlds = self.worlds
+        obs["player"][:] = [tuple(world.player.rect) for world in worlds]
+        obs["lives"][:] = [world.player_lives for world in worlds]
+        obs["stage"][:] = [world.current_stage for world in worlds]
+        obs["score"][:] = [world.score for world in worlds]
+
+        enemies, bullets, items = obs["enemies"], obs["bullets"], obs["items"]
+        enemies.fill(0)
+        bullets.fill(0)
+        items.fill(0)
+        max_enemies, max_bullets, max_items = enemies.shape[1], bullets.shape[1], items.shape[1]
+        item_codes = self.item_codes
+        counts = []
+        for i, world in enumerate(worlds):
+            # 대부분 몇 개뿐이라 그룹마다 목록을 한 번만 꺼내고, 비어 있으면 건너뜀
+            rows = world.enemies.sprites()[:max_enemies]
+            if rows:
+                enemies[i, :len(rows)] = [e.rect.topleft for e in rows]
+            shots = world.bullets.sprites()[:max_bullets]
+            if shots:
+                bullets[i, :len(shots)] = [(b.rect.x, b.rect.y, 1 if b.speed > 0 else -1) for b in shots]
+            drops = world.items.sprites()[:max_items]
+            if drops:
+                items[i, :len(drops)] = [(it.rect.x, it.rect.y, item_codes[it.item_type]) for it in drops]
+            counts.append((len(rows), len(shots), len(drops)))
+        obs["enemy_count"][:], obs["bullet_count"][:], obs["item_count"][:] = zip(*counts)
+
+    def render(self, index=0, surface=None):
+        # 월드 하나를 게임 화면처럼 그림 (HUD는 점수/목숨/스테이지만)
+        if surface is None:
+            game.init_display()
+            surface = game.screen
+        if self.static_layer is None:
+            self.static_layer = game.StaticLayer()
+        world = self.worlds[index]
+        surface.fill(game.BLACK)
+        self.static_layer.update(world.level.platforms)
+        self.static_layer.draw(surface)
+        game.queue_world(game.render_queue, world)
+        game.render_queue.submit(surface)
+        world.particles.draw(surface)
+        surface.blit(game.text_cache.render(game.font_ui, f"Score: {world.score}", game.WHITE), (10, 10))
+        surface.blit(game.text_cache.render(game.font_ui, f"Stage: {world.current_stage}", game.GOLD),
+                     (game.SCREEN_WIDTH - 150, 10))
+        game.draw_hearts(surface, world.player_lives)
+        return surface
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="배치 환경 처리량 측정")
+    parser.add_argument("--envs", type=int, default=64, help="동시에 돌릴 월드 수")
+    parser.add_argument("--steps", type=int, default=2000, help="step() 호출 수")
+    parser.add_argument("--seed", type=int, default=0, help="첫 월드 seed (월드마다 1씩 증가)")
+    parser.add_argument("--policy", choices=("bot", "random"), default="bot",
+                        help="bot: 자동 플레이 봇(bot_inputs), random: 매 틱 무작위 행동 (총알이 훨씬 많음)")
+    parser.add_argument("--frame-skip", type=int, default=1, help="행동 하나를 몇 틱 동안 유지할지")
+    parser.add_argument("--render", action="store_true", help="0번 월드를 창에 그림")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    env = BatchEnv(args.envs, args.seed, frame_skip=args.frame_skip, render=args.render)
+    env.reset()
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    policy_time = 0.0
+    total_reward = 0.0
+    for _ in range(args.steps):
+        policy_start = time.perf_counter()
+        if args.policy == "bot":
+            actions = [game.bot_inputs(world) for world in env.worlds]
+        else:
+            actions = rng.integers(0, NUM_ACTIONS, args.envs)
+        policy_time += time.perf_counter() - policy_start
+        _, rewards, _ = env.step(actions)
+        total_reward += float(rewards.sum())
+    elapsed = time.perf_counter() - start
+    env_time = elapsed - policy_time
+    ticks = env.env_steps * args.frame_skip
+    print(f"{env.env_steps} env-steps in {elapsed:.2f}s ({env.env_steps / elapsed:.0f} steps/s, "
+          f"{ticks / elapsed:.0f} ticks/s), {env.episodes} episodes finished, total reward {total_reward:.0f}")
+    # 정책 계산을 뺀 환경만의 처리량 (목표 20k steps/s는 정책 시간까지 포함한 위 숫자 기준)
+    print(f"env only: {env.env_steps / env_time:.0f} steps/s (policy {policy_time:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
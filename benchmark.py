@@ -0,0 +1,405 @@
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+# 화면/사운드 없이 실행 (shooting_python import 전에 설정해야 함)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+import shooting_python as game
+
+ENEMY_COUNTS = [50, 100, 250, 500, 1000, 2000]
+PARTICLE_COUNTS = [1000, 10000, 50000]
+STAR_COUNTS = [50, 1000, 10000]
+FRAMES = 30
+
+SUITE_FRAMES = 300
+SUITE_WARMUP = 30
+PHASES = ("update", "collision", "draw", "flip")
+
+
+# 비교용: 공간 해시 없이 전체를 훑는 기존 방식
+class BruteForceIndex:
+    def __init__(self, sprites):
+        self.sprites = sprites
+        self.cells = sprites    # collide_bullets_enemies()는 비었는지만 봄
+
+    @property
+    def order(self):
+        return {sprite: i for i, sprite in enumerate(self.sprites)}
+
+    def query(self, rect):
+        return list(self.sprites)
+
+    def first_hit(self, rect):
+        for sprite in self.sprites:
+            if rect.colliderect(sprite.rect):
+                return sprite
+        return None
+
+    def move(self, sprite):
+        pass
+
+    def remove(self, sprite):
+        pass
+
+    def rebuild(self, sprites):
+        pass
+
+
+def spawn_enemies(count, world):
+    rng = random.Random(count)
+    for _ in range(count):
+        x = rng.randint(0, game.SCREEN_WIDTH - 35)
+        y = rng.randint(0, game.SCREEN_HEIGHT - 60)
+        enemy = game.enemy_pool.acquire(x, y, world.player, 3, game.RED)
+        world.enemies.add(enemy)
+        world.all_sprites.add(enemy)
+
+
+def bench_enemies(count, brute_force=False):
+    # 게임 한 프레임 전체 (world.step + 그리기 + flip)를 적 count마리가 살아 있는 채로 잼
+    screen = game.init_display()
+    world = game.GameWorld(count)
+    spawn_enemies(count, world)
+    if brute_force:
+        world.platform_grid = BruteForceIndex(world.platforms)
+        world.enemy_grid = BruteForceIndex(world.enemies)
+    static_layer = game.StaticLayer()
+    static_layer.update(world.platforms)
+    hud_digits = game.DigitAtlas(game.font_ui, game.WHITE)
+
+    sim_times = []
+    frame_times = []
+    for _ in range(FRAMES):
+        world.player_lives = 3      # 도중에 게임 오버로 끝나지 않도록
+        start = time.perf_counter()
+        world.step(0)
+        draw_start = time.perf_counter()
+        screen.fill(game.BLACK)
+        static_layer.draw(screen)
+        game.draw_playing(screen, world, hud_digits)
+        pygame.display.flip()
+        end = time.perf_counter()
+        sim_times.append(draw_start - start)
+        frame_times.append(end - start)
+
+    for sprite in list(world.enemies):
+        sprite.kill()
+    sim = percentiles(sim_times)
+    frame = percentiles(frame_times)
+    return sim["p50"], frame["p50"], frame["p95"]
+
+
+def bench_particles(count):
+    surface = pygame.Surface((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+    particles = game.ParticleSystem(rng=np.random.default_rng(count))
+    colors = [game.RED, game.ORANGE, game.PURPLE, game.DARK_RED, game.BLUE]
+    # 폭발 한 번에 10개씩, 위치를 흩뿌려서 count개를 채운다
+    rng = random.Random(count)
+    while len(particles) < count:
+        particles.emit(rng.randint(0, game.SCREEN_WIDTH), rng.randint(0, game.SCREEN_HEIGHT), rng.choice(colors), 10)
+    # 측정하는 동안 파티클이 사라지지 않도록 수명/크기를 고정
+    particles.life[:count] = 10000
+
+    update_times = []
+    draw_times = []
+    for _ in range(FRAMES):
+        particles.size[:count] = np.maximum(particles.size[:count], 1)
+        start = time.perf_counter()
+        particles.update()
+        mid = time.perf_counter()
+        particles.draw(surface)
+        update_times.append(mid - start)
+        draw_times.append(time.perf_counter() - mid)
+
+    update_times.sort()
+    draw_times.sort()
+    return update_times[len(update_times) // 2] * 1000, draw_times[len(draw_times) // 2] * 1000
+
+
+def bench_draw(count):
+    world = game.GameWorld(count)
+    spawn_enemies(count, world)
+    player, enemies = world.player, world.enemies
+    player.shield = True
+    surface = pygame.Surface((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+
+    times = []
+    for _ in range(FRAMES):
+        start = time.perf_counter()
+        player.queue_draw(game.render_queue, *player.rect.topleft)
+        game.render_queue.add_sprites(enemies)
+        game.render_queue.submit(surface)
+        game.draw_hearts(surface, 3)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2] * 1000
+
+
+def bench_stars(count):
+    surface = pygame.Surface((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+    stars = game.Starfield(count, rng=np.random.default_rng(count))
+
+    times = []
+    for _ in range(FRAMES):
+        start = time.perf_counter()
+        stars.update(1)
+        stars.draw(surface)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2] * 1000
+
+
+# === 스트레스 시나리오 ===
+# 각 시나리오는 (월드 준비 함수, 틱마다 입력을 돌려주는 함수)
+def stack_enemies(world, count):
+    # init_game()의 발판 위에 적을 층층이 쌓음
+    platforms = sorted(world.platforms, key=lambda p: p.rect.width, reverse=True)
+    placed = 0
+    layer = 0
+    while placed < count:
+        for platform in platforms:
+            for x in range(platform.rect.left, platform.rect.right - 35, 40):
+                if placed >= count:
+                    return
+                y = platform.rect.top - 35 * (layer + 1)
+                enemy = game.enemy_pool.acquire(x, y, world.player, world.current_enemy_speed, game.RED)
+                world.all_sprites.add(enemy)
+                world.enemies.add(enemy)
+                placed += 1
+        layer += 1
+
+def setup_enemies(count):
+    def setup(world):
+        stack_enemies(world, count)
+    return setup
+
+def setup_bullet_storm(world):
+    rng = random.Random(1)
+    for _ in range(500):
+        bullet = game.bullet_pool.acquire(rng.randint(0, game.SCREEN_WIDTH), rng.randint(0, game.SCREEN_HEIGHT), rng.choice((-1, 1)))
+        world.all_sprites.add(bullet)
+        world.bullets.add(bullet)
+    stack_enemies(world, 100)
+
+def setup_stage(stage):
+    def setup(world):
+        # 스테이지를 올릴 때와 같은 규칙으로 속도/생성 간격을 맞춤
+        world.current_stage = stage
+        tuning = world.tuning
+        world.current_enemy_speed = tuning["enemy_speed"] + tuning["speed_step"] * (stage - 1)
+        world.enemy_spawn_time = max(tuning["spawn_min"], tuning["spawn_time"] - tuning["spawn_step"] * (stage - 1))
+        world.timers.schedule("enemy_spawn", game.ms_to_ticks(world.enemy_spawn_time))
+        # 적이 충분히 쌓이도록 1분 동안 미리 돌려 둠 (측정 안 함)
+        for _ in range(game.FPS * 60):
+            world.player_lives = 3
+            world.step(game.bot_inputs(world))
+    return setup
+
+def dense_levels(count):
+    # 작은 발판 count개짜리 레벨 파일 (발판 색인이 발판 수에 상관없이 버티는지 확인용)
+    path = os.path.join(tempfile.gettempdir(), f"shooting_bench_levels_{count}.txt")
+    rng = random.Random(count)
+    with open(path, "w") as f:
+        f.write("level dense 1-\n0 580 800 20 green\n")
+        for _ in range(count - 1):
+            f.write(f"{rng.randint(0, game.SCREEN_WIDTH - 40)} {rng.randint(60, 560)} {rng.randint(20, 60)} 8\n")
+    return game.LevelSet(path)
+
+def setup_platforms(count):
+    def setup(world):
+        world.levels = dense_levels(count)
+        world.reset(world.seed)
+        stack_enemies(world, 300)
+    return setup
+
+def explosions(world):
+    # 매 틱 폭발 20개 (파티클 10개씩), 수명 20~40틱이라 수천 개가 유지됨
+    for _ in range(20):
+        world.particles.emit(world.rng.randint(0, game.SCREEN_WIDTH), world.rng.randint(0, game.SCREEN_HEIGHT), game.ORANGE, 10)
+    return 0
+
+def storm_inputs(world):
+    world.player.recoil_timer = 0
+    return game.INPUT_SHOOT | (game.INPUT_JUMP if world.tick % 40 == 0 else 0)
+
+SCENARIOS = {
+    "enemies_100": (setup_enemies(100), lambda world: 0),
+    "enemies_500": (setup_enemies(500), lambda world: 0),
+    "enemies_1000": (setup_enemies(1000), lambda world: 0),
+    "bullet_storm": (setup_bullet_storm, storm_inputs),
+    "platforms_9": (setup_platforms(9), lambda world: 0),
+    "platforms_500": (setup_platforms(500), lambda world: 0),
+    "particles": (lambda world: None, explosions),
+    "stage_10": (setup_stage(10), game.bot_inputs),
+    "stage_15": (setup_stage(15), game.bot_inputs),
+}
+
+def percentiles(samples):
+    ms = np.array(samples) * 1000
+    return {
+        "p50": round(float(np.percentile(ms, 50)), 4),
+        "p95": round(float(np.percentile(ms, 95)), 4),
+        "p99": round(float(np.percentile(ms, 99)), 4),
+        "mean": round(float(ms.mean()), 4),
+    }
+
+def run_scenario(name, frames=SUITE_FRAMES, seed=1):
+    setup, inputs = SCENARIOS[name]
+    screen = game.init_display()
+    world = game.GameWorld(seed)
+    setup(world)
+    stars = game.Starfield(rng=np.random.default_rng(seed))
+    static_layer = game.StaticLayer()
+    static_layer.update(world.platforms)
+    hud_digits = game.DigitAtlas(game.font_ui, game.WHITE)
+
+    world.timings = {}
+    samples = {phase: [] for phase in PHASES + ("frame",)}
+    peak = {"enemies": 0, "bullets": 0, "particles": 0}
+    for frame in range(SUITE_WARMUP + frames):
+        world.player_lives = 3      # 도중에 게임 오버로 끝나지 않도록
+        start = time.perf_counter()
+        world.step(inputs(world))
+        draw_start = time.perf_counter()
+        screen.fill(game.BLACK)
+        stars.update(1)
+        stars.draw(screen)
+        static_layer.draw(screen)
+        game.draw_playing(screen, world, hud_digits)
+        flip_start = time.perf_counter()
+        pygame.display.flip()
+        end = time.perf_counter()
+
+        if frame < SUITE_WARMUP:
+            continue
+        samples["update"].append(world.timings["update"])
+        samples["collision"].append(world.timings["collision"])
+        samples["draw"].append(flip_start - draw_start)
+        samples["flip"].append(end - flip_start)
+        samples["frame"].append(end - start)
+        peak["enemies"] = max(peak["enemies"], len(world.enemies))
+        peak["bullets"] = max(peak["bullets"], len(world.bullets))
+        peak["particles"] = max(peak["particles"], len(world.particles))
+
+    return {
+        "frames": frames,
+        "peak": peak,
+        "phases": {phase: percentiles(values) for phase, values in samples.items()},
+    }
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+def run_suite(names, frames, json_path=None):
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "scenarios": {},
+    }
+    print(f"{'scenario':<14} {'phase':<10} {'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8}")
+    for name in names:
+        result = run_scenario(name, frames)
+        results["scenarios"][name] = result
+        for phase, stats in result["phases"].items():
+            print(f"{name:<14} {phase:<10} {stats['p50']:>8.3f} {stats['p95']:>8.3f} {stats['p99']:>8.3f}")
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"saved {json_path}")
+    return results
+
+def compare(old_path, new_path):
+    # 두 커밋의 JSON 결과를 비교 (프레임 p95 기준)
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    print(f"{'scenario':<14} {'phase':<10} {'old p95':>8} {'new p95':>8} {'change':>8}")
+    for name, result in new["scenarios"].items():
+        if name not in old["scenarios"]:
+            continue
+        for phase, stats in result["phases"].items():
+            before = old["scenarios"][name]["phases"][phase]["p95"]
+            change = (stats["p95"] - before) / before * 100 if before else 0.0
+            print(f"{name:<14} {phase:<10} {before:>8.3f} {stats['p95']:>8.3f} {change:>+7.1f}%")
+
+def option(name, default=None):
+    if name in sys.argv:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
+
+
+def main():
+    if "suite" in sys.argv:
+        names = option("--scenarios", ",".join(SCENARIOS)).split(",")
+        run_suite(names, int(option("--frames", SUITE_FRAMES)), option("--json"))
+        return
+
+    if "compare" in sys.argv:
+        index = sys.argv.index("compare")
+        compare(sys.argv[index + 1], sys.argv[index + 2])
+        return
+
+    if "stars" in sys.argv:
+        print(f"{'stars':>8} {'frame(ms)':>10}")
+        for count in STAR_COUNTS:
+            print(f"{count:>8} {bench_stars(count):>10.2f}")
+        return
+
+    if "draw" in sys.argv:
+        print(f"{'enemies':>8} {'draw(ms)':>9}")
+        for count in (50, 500, 2000):
+            print(f"{count:>8} {bench_draw(count):>9.2f}")
+        return
+
+    if "particles" in sys.argv:
+        print(f"{'particles':>9} {'update(ms)':>11} {'draw(ms)':>9}")
+        for count in PARTICLE_COUNTS:
+            update_ms, draw_ms = bench_particles(count)
+            print(f"{count:>9} {update_ms:>11.2f} {draw_ms:>9.2f}")
+        return
+
+    brute_force = "--compare" in sys.argv
+    budget_ms = 1000 / game.FPS
+    header = f"{'enemies':>8} {'sim(ms)':>8} {'frame p50':>10} {'frame p95':>10}"
+    if brute_force:
+        header += f" {'brute sim':>10}"
+    print(header)
+    first_over = None
+    frames = []
+    for count in ENEMY_COUNTS:
+        sim_ms, frame_ms, frame_p95 = bench_enemies(count)
+        frames.append(frame_ms)
+        line = f"{count:>8} {sim_ms:>8.2f} {frame_ms:>10.2f} {frame_p95:>10.2f}"
+        if brute_force:
+            line += f" {bench_enemies(count, brute_force=True)[0]:>10.2f}"
+        print(line)
+        if first_over is None and frame_p95 > budget_ms:
+            first_over = count
+    # 적 수에 따라 프레임 시간이 평평하지 않으므로 예산을 처음 넘는 지점을 그대로 보여 줌
+    print(f"frame p50 goes from {frames[0]:.2f} ms at {ENEMY_COUNTS[0]} to {frames[-1]:.2f} ms at {ENEMY_COUNTS[-1]} enemies")
+    if first_over is None:
+        print(f"frame p95 stays within the {budget_ms:.1f} ms budget up to {ENEMY_COUNTS[-1]} enemies")
+    else:
+        print(f"frame p95 first goes over the {budget_ms:.1f} ms budget at {first_over} enemies")
+
+if __name__ == "__main__":
+    main()
+    sys.exit(0)
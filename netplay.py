@@ -0,0 +1,889 @@
+import argparse
+import heapq
+import os
+import random
+import socket
+import struct
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+import shooting_python as game
+
+# === [네트워크 멀티플레이] ===
+# 서버가 GameWorld를 돌리는 권위 서버이고, 클라이언트는 입력만 UDP로 보냅니다.
+#  - coop  : 월드 하나에 플레이어 최대 4명 (점수/목숨 공유)
+#  - versus: 플레이어마다 같은 seed의 월드를 따로 돌리고 서로의 점수/스테이지를 보여 줌
+# 스냅샷은 SNAPSHOT_INTERVAL틱마다 보내고, 클라이언트가 마지막으로 받았다고 알려 준
+# 스냅샷(기준)과 달라진 엔티티만 정수 좌표로 보낸 뒤 deflate로 압축합니다.
+# 클라이언트는 자기 플레이어를 Player.update()로 먼저 움직이고(예측), 서버 상태가 오면
+# 그 상태에서 아직 확인 안 된 입력을 다시 적용합니다(보정).
+
+NET_VERSION = 1
+DEFAULT_PORT = 47800
+SNAPSHOT_INTERVAL = 3       # 틱 (60틱/초 → 초당 20번)
+MAX_SNAPSHOT_INTERVAL = 6   # 대역폭이 모자랄 때 늘릴 수 있는 최대 간격 (초당 10번)
+BANDWIDTH_BUDGET = 10 * 1024    # 클라이언트마다 내려보낼 최대 바이트/초 (UDP/IP 헤더 포함)
+INPUT_REDUNDANCY = 16       # 입력 패킷마다 최근 입력을 겹쳐 보내 손실을 메움
+INPUT_DELAY = 2             # 서버가 클라이언트 입력을 모아 둘 틱 수 (지터 흡수)
+HISTORY = 32                # 기준 스냅샷으로 쓸 수 있게 보관하는 스냅샷 수
+CLIENT_TIMEOUT = 5.0        # 초, 이 시간 동안 패킷이 없으면 연결 끊김으로 봄
+RESTART_TICKS = game.FPS * 3
+MAX_PLAYERS = 4
+UDP_OVERHEAD = 28           # IPv4 + UDP 헤더 (대역폭 계산용)
+
+MSG_HELLO = b"H"
+MSG_WELCOME = b"W"
+MSG_INPUT = b"I"
+MSG_SNAPSHOT = b"S"
+MSG_BYE = b"B"
+
+MODES = ("coop", "versus")
+
+HELLO = struct.Struct("<cB")                # 종류, 버전 (+ 이름 utf-8)
+WELCOME = struct.Struct("<cBBBB")           # 종류, 버전, 플레이어 번호, 모드, 스냅샷 간격
+INPUT_HEADER = struct.Struct("<cIIB")       # 종류, 받은 스냅샷 번호, 첫 입력 번호, 입력 수 (+ 입력 바이트)
+SNAPSHOT_HEADER = struct.Struct("<cII")     # 종류, 스냅샷 번호, 기준 스냅샷 번호 (+ zlib 본문)
+WORLD_STATE = struct.Struct("<IIIBBB")      # seed, 틱, 점수, 목숨, 스테이지, 플래그
+SELF_STATE = struct.Struct("<IhhhBB")       # 적용한 입력 번호, x, y, vel_y, 플래그, 반동 틱
+PEER_STATE = struct.Struct("<BhhB")         # 플레이어 번호, x, y, 플래그
+RIVAL_STATE = struct.Struct("<BIBBB")       # 플레이어 번호, 점수, 스테이지, 목숨, 게임 오버
+FULL_ENTITY = struct.Struct("<Bhhb")        # 종류, x, y, 부가 값 (적 색 / 아이템 종류)
+
+VEL_SCALE = 20              # vel_y 양자화 (0.05픽셀/틱 단위, GRAVITY 0.8의 배수는 정확히 표현)
+ENTITY_GRID = 2             # 적/총알/아이템 좌표 양자화 (픽셀, 보간해서 그리므로 눈에 띄지 않음)
+
+WORLD_GAME_OVER = 1
+WORLD_STAGE_TEXT = 2
+
+PLAYER_FACING = 1
+PLAYER_ON_GROUND = 2
+PLAYER_INVINCIBLE = 4
+PLAYER_VISIBLE = 8
+PLAYER_SHIELD = 16
+PLAYER_SPEED = 32
+PLAYER_RECOIL = 64
+
+ENTITY_ENEMY = 0
+ENTITY_BULLET = 1
+ENTITY_ITEM = 2
+
+ENEMY_COLORS = (game.RED, game.ORANGE, game.PURPLE, game.DARK_RED)
+ITEM_TYPES = ("speed", "shield", "heart")
+
+# 입력이 늦게 오면 누르고 있던 방향/점프만 이어서 씀 (총 쏘기/일시정지는 반복하지 않음)
+HELD_INPUTS = game.INPUT_LEFT | game.INPUT_RIGHT | game.INPUT_JUMP
+
+
+# --- 패킷 인코딩 ---
+def write_ids(out, ids):
+    # 정렬된 id를 앞 id와의 차이로 (대부분 1바이트)
+    game.write_varint(out, len(ids))
+    prev = 0
+    for entity_id in ids:
+        game.write_varint(out, entity_id - prev)
+        prev = entity_id
+
+def read_ids(data, pos):
+    count, pos = game.read_varint(data, pos)
+    ids = []
+    prev = 0
+    for _ in range(count):
+        delta, pos = game.read_varint(data, pos)
+        prev += delta
+        ids.append(prev)
+    return ids, pos
+
+def encode_entities(table, baseline):
+    # table/baseline: id -> (종류, x, y, 부가 값)
+    # 사라진 id, 새로 생겼거나 크게 움직인 엔티티(전체 값), 조금 움직인 엔티티(dx, dy 1바이트씩) 순서
+    out = bytearray()
+    write_ids(out, sorted(baseline.keys() - table.keys()))
+    full = []
+    moved = []
+    for entity_id in sorted(table):
+        kind, x, y, extra = table[entity_id]
+        old = baseline.get(entity_id)
+        if old is None or old[0] != kind or old[3] != extra:
+            full.append(entity_id)
+            continue
+        dx = x - old[1]
+        dy = y - old[2]
+        if dx == 0 and dy == 0:
+            continue
+        if -128 <= dx <= 127 and -128 <= dy <= 127:
+            moved.append((entity_id, dx, dy))
+        else:
+            full.append(entity_id)
+
+    write_ids(out, full)
+    for entity_id in full:
+        out += FULL_ENTITY.pack(*table[entity_id])
+    # 같은 종류의 값끼리 모아 두면 zlib이 잘 줄임 (같은 방향으로 쫓는 적은 dx가 같음)
+    write_ids(out, [entity_id for entity_id, _, _ in moved])
+    out += struct.pack(f"<{len(moved)}b", *(dx for _, dx, _ in moved))
+    out += struct.pack(f"<{len(moved)}b", *(dy for _, _, dy in moved))
+    return out
+
+def decode_entities(data, pos, baseline):
+    table = dict(baseline)
+    removed, pos = read_ids(data, pos)
+    for entity_id in removed:
+        table.pop(entity_id, None)
+    full, pos = read_ids(data, pos)
+    for entity_id in full:
+        table[entity_id] = FULL_ENTITY.unpack_from(data, pos)
+        pos += FULL_ENTITY.size
+    moved, pos = read_ids(data, pos)
+    n = len(moved)
+    dxs = struct.unpack_from(f"<{n}b", data, pos)
+    dys = struct.unpack_from(f"<{n}b", data, pos + n)
+    pos += 2 * n
+    for entity_id, dx, dy in zip(moved, dxs, dys):
+        kind, x, y, extra = table[entity_id]
+        table[entity_id] = (kind, x + dx, y + dy, extra)
+    return table, pos
+
+def compress(body):
+    # zlib 헤더/체크섬 없는 raw deflate (패킷마다 6바이트 절약, UDP 체크섬이 있으므로)
+    packer = zlib.compressobj(9, zlib.DEFLATED, -15)
+    return packer.compress(body) + packer.flush()
+
+def decompress(data):
+    return zlib.decompress(data, -15)
+
+def clamp16(value):
+    return max(-32768, min(32767, value))
+
+def player_flags(player):
+    flags = 0
+    if player.facing_right: flags |= PLAYER_FACING
+    if player.on_ground: flags |= PLAYER_ON_GROUND
+    if player.invincible: flags |= PLAYER_INVINCIBLE
+    if player.visible: flags |= PLAYER_VISIBLE
+    if player.shield: flags |= PLAYER_SHIELD
+    if player.speed_buff: flags |= PLAYER_SPEED
+    if player.recoil_timer > 0: flags |= PLAYER_RECOIL
+    return flags
+
+
+# --- 손실/지연 흉내 소켓 (루프백 테스트용) ---
+class LossySocket:
+    # 보내는 패킷을 loss 확률로 버리고 latency ± jitter 뒤에 실제 소켓으로 보냄
+    def __init__(self, sock, loss=0.0, latency=0.0, jitter=0.0, rng=None, clock=time.perf_counter):
+        self.sock = sock
+        self.loss = loss
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.clock = clock
+        self.queue = []     # (보낼 시각, 순서, 데이터, 주소)
+        self.count = 0
+        self.dropped = 0
+
+    def sendto(self, data, address):
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return len(data)
+        delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+        self.count += 1
+        heapq.heappush(self.queue, (self.clock() + delay, self.count, data, address))
+        self.flush()
+        return len(data)
+
+    def flush(self):
+        now = self.clock()
+        while self.queue and self.queue[0][0] <= now:
+            _, _, data, address = heapq.heappop(self.queue)
+            self.sock.sendto(data, address)
+
+    def recvfrom(self, size):
+        self.flush()
+        return self.sock.recvfrom(size)
+
+    def getsockname(self):
+        return self.sock.getsockname()
+
+    def close(self):
+        self.sock.close()
+
+def udp_socket(host="127.0.0.1", port=0):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, port))
+    sock.setblocking(False)
+    return sock
+
+def receive_all(sock):
+    packets = []
+    while True:
+        try:
+            packets.append(sock.recvfrom(65536))
+        except (BlockingIOError, ConnectionResetError):
+            return packets
+
+
+# === [서버] ===
+class NetEntities:
+    # (월드 스프라이트, 풀에서 꺼낸 순번) → 네트워크 id (스냅샷을 만들 때마다 사라진 스프라이트는 빠짐)
+    # 스냅샷 사이에 풀로 돌아갔다가 다시 나온 스프라이트는 순번이 달라 새 id를 받으므로,
+    # 클라이언트가 예전 위치에서 미끄러져 오게 그리지 않음
+    def __init__(self):
+        self.ids = {}
+        self.next_id = 1
+
+    def table(self, world):
+        ids = {}
+        table = {}
+        for kind, group in ((ENTITY_ENEMY, world.enemies), (ENTITY_BULLET, world.bullets), (ENTITY_ITEM, world.items)):
+            for sprite in group:
+                key = (sprite, sprite.serial)
+                entity_id = self.ids.get(key)
+                if entity_id is None:
+                    entity_id = self.next_id
+                    self.next_id += 1
+                ids[key] = entity_id
+                if kind == ENTITY_ENEMY:
+                    extra = ENEMY_COLORS.index(sprite.color)
+                elif kind == ENTITY_ITEM:
+                    extra = ITEM_TYPES.index(sprite.item_type)
+                else:
+                    extra = 1 if sprite.speed > 0 else -1
+                table[entity_id] = (kind, sprite.rect.x // ENTITY_GRID, sprite.rect.y // ENTITY_GRID, extra)
+        self.ids = ids
+        return table
+
+
+class Session:
+    # 월드 하나와 거기 들어간 클라이언트들 (coop은 하나, versus는 플레이어마다 하나)
+    def __init__(self, seed, tuning=None, levels=None):
+        self.world = game.GameWorld(seed, tuning, levels)
+        self.entities = NetEntities()
+        self.slots = []         # 플레이어 번호 -> ServerClient (나간 자리는 None, 플레이어는 남겨 둠)
+        self.over_ticks = 0
+        self.table = {}
+
+    def join(self, client):
+        if None in self.slots:
+            index = self.slots.index(None)
+        else:
+            index = len(self.slots)
+            if index > 0:
+                self.world.add_player()
+            self.slots.append(None)
+        self.slots[index] = client
+        client.session = self
+        client.index = index
+        return index
+
+    def leave(self, client):
+        self.slots[client.index] = None
+
+    def step(self):
+        world = self.world
+        if world.game_over:
+            # 끝난 판은 잠깐 보여 준 뒤 다음 seed로 다시 시작
+            self.over_ticks += 1
+            if self.over_ticks >= RESTART_TICKS:
+                self.over_ticks = 0
+                world.reset((world.seed + 1) % 2 ** 32)
+                for _ in self.slots[1:]:
+                    world.add_player()
+            return
+        world.step([client.next_input() if client is not None else 0 for client in self.slots])
+
+
+class ServerClient:
+    def __init__(self, address, name, now):
+        self.address = address
+        self.name = name
+        self.session = None
+        self.index = 0
+        self.inputs = {}            # 입력 번호 -> 입력 비트 (아직 적용 안 한 것)
+        self.next_seq = None
+        self.newest_seq = 0
+        self.started = False        # 처음에 INPUT_DELAY틱만큼 입력이 쌓인 뒤부터 적용
+        self.applied_seq = 0
+        self.held = 0
+        self.acked_frame = 0
+        self.history = OrderedDict()    # 스냅샷 번호 -> 보낸 엔티티 표
+        self.last_heard = now
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.interval = SNAPSHOT_INTERVAL
+        self.window_bytes = 0       # 이번 1초 동안 보낸 바이트
+        self.rate = 0               # 지난 1초 동안 보낸 바이트
+
+    @property
+    def player(self):
+        return self.session.world.players[self.index]
+
+    def adapt_rate(self, budget):
+        # 1초마다: 예산에 가까우면 스냅샷 간격을 늘리고, 한 단계 줄여도 여유가 있으면 줄임
+        self.rate = self.window_bytes
+        self.window_bytes = 0
+        if self.rate > budget * 0.9 and self.interval < MAX_SNAPSHOT_INTERVAL:
+            self.interval += 1
+        elif self.interval > SNAPSHOT_INTERVAL and self.rate * self.interval / (self.interval - 1) < budget * 0.8:
+            self.interval -= 1
+
+    def receive_inputs(self, ack_frame, first_seq, bits):
+        if ack_frame in self.history:
+            self.acked_frame = max(self.acked_frame, ack_frame)
+        last_seq = first_seq + len(bits) - 1
+        self.newest_seq = max(self.newest_seq, last_seq)
+        if self.next_seq is None:
+            self.next_seq = first_seq
+        elif last_seq - self.next_seq > INPUT_DELAY * 4:
+            # 클라이언트 시계가 더 빨라 입력이 밀렸으면 버퍼를 줄여 지연이 쌓이지 않게 함
+            self.next_seq = last_seq - INPUT_DELAY
+            self.inputs = {seq: value for seq, value in self.inputs.items() if seq >= self.next_seq}
+        for i, value in enumerate(bits):
+            seq = first_seq + i
+            if seq >= self.next_seq:
+                self.inputs[seq] = value
+
+    def next_input(self):
+        if self.next_seq is None or (not self.started and self.newest_seq - self.next_seq < INPUT_DELAY):
+            return 0
+        self.started = True
+        value = self.inputs.pop(self.next_seq, None)
+        if value is None:
+            # 제때 안 온 입력은 건너뜀 (늦게 와도 버림) - 클라이언트 보정이 맞춰 줌
+            value = self.held & HELD_INPUTS
+        else:
+            self.held = value
+        self.applied_seq = self.next_seq
+        self.next_seq += 1
+        return value
+
+
+class NetServer:
+    def __init__(self, sock, mode="coop", seed=None, budget=BANDWIDTH_BUDGET,
+                 tuning=None, levels=None, clock=time.perf_counter):
+        self.sock = sock
+        self.mode = mode
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.budget = budget
+        self.tuning = tuning
+        self.levels = levels
+        self.clock = clock
+        self.clients = {}       # 주소 -> ServerClient
+        self.sessions = []
+        self.frame = 0
+
+    def session_for_new_client(self):
+        if self.mode == "coop":
+            if not self.sessions:
+                self.sessions.append(Session(self.seed, self.tuning, self.levels))
+            session = self.sessions[0]
+            return session if None in session.slots or len(session.slots) < MAX_PLAYERS else None
+        if len(self.clients) >= MAX_PLAYERS:
+            return None
+        # versus: 모두 같은 seed로 시작해 같은 적/아이템을 상대함
+        session = Session(self.seed, self.tuning, self.levels)
+        self.sessions.append(session)
+        return session
+
+    def poll(self):
+        now = self.clock()
+        for data, address in receive_all(self.sock):
+            client = self.clients.get(address)
+            if client is not None:
+                client.last_heard = now
+                client.bytes_received += len(data) + UDP_OVERHEAD
+            kind = data[:1]
+            if kind == MSG_HELLO and len(data) >= HELLO.size:
+                self.on_hello(data, address, now)
+            elif kind == MSG_INPUT and client is not None and len(data) >= INPUT_HEADER.size:
+                _, ack_frame, first_seq, count = INPUT_HEADER.unpack_from(data)
+                client.receive_inputs(ack_frame, first_seq, data[INPUT_HEADER.size:INPUT_HEADER.size + count])
+            elif kind == MSG_BYE and client is not None:
+                self.drop(client, "left")
+
+        for client in list(self.clients.values()):
+            if now - client.last_heard > CLIENT_TIMEOUT:
+                self.drop(client, "timed out")
+
+    def on_hello(self, data, address, now):
+        _, version = HELLO.unpack_from(data)
+        if version != NET_VERSION:
+            self.sock.sendto(MSG_BYE, address)
+            return
+        client = self.clients.get(address)
+        if client is None:
+            session = self.session_for_new_client()
+            if session is None:
+                self.sock.sendto(MSG_BYE, address)
+                return
+            name = data[HELLO.size:].decode(errors="replace")[:16] or "player"
+            client = ServerClient(address, name, now)
+            session.join(client)
+            self.clients[address] = client
+            print(f"{name} joined from {address[0]}:{address[1]} as player {client.index + 1} ({self.mode})")
+        # WELCOME이 손실됐을 수 있으므로 HELLO가 올 때마다 다시 보냄
+        self.sock.sendto(WELCOME.pack(MSG_WELCOME, NET_VERSION, client.index, MODES.index(self.mode),
+                                      client.interval), address)
+
+    def drop(self, client, reason):
+        del self.clients[client.address]
+        client.session.leave(client)
+        if self.mode == "versus":
+            self.sessions.remove(client.session)
+        print(f"{client.name} {reason}")
+
+    def step(self):
+        for session in self.sessions:
+            session.step()
+        self.frame += 1
+        due = [client for client in self.clients.values() if self.frame % client.interval == 0]
+        if due:
+            self.send_snapshots(due)
+        if self.frame % game.FPS == 0:
+            for client in self.clients.values():
+                client.adapt_rate(self.budget)
+
+    def send_snapshots(self, clients):
+        for session in {client.session for client in clients}:
+            session.table = session.entities.table(session.world)
+        rivals = [(client.index if self.mode == "coop" else slot, client) for slot, client in
+                  enumerate(self.clients.values())]
+        for client in clients:
+            packet = self.snapshot(client, rivals)
+            self.sock.sendto(packet, client.address)
+            client.bytes_sent += len(packet) + UDP_OVERHEAD
+            client.window_bytes += len(packet) + UDP_OVERHEAD
+
+    def snapshot(self, client, rivals):
+        session = client.session
+        world = session.world
+        # 클라이언트가 받았다고 알려 준 스냅샷이 아직 있으면 그것과의 차이만 보냄
+        baseline_frame = client.acked_frame if client.acked_frame in client.history else 0
+        baseline = client.history.get(baseline_frame, {})
+
+        body = bytearray()
+        flags = (WORLD_GAME_OVER if world.game_over else 0) | \
+                (WORLD_STAGE_TEXT if world.timers.active("stage_text") else 0)
+        body += WORLD_STATE.pack(world.seed, world.tick, world.score, world.player_lives,
+                                 min(world.current_stage, 255), flags)
+        player = client.player
+        body += SELF_STATE.pack(client.applied_seq, player.rect.x, player.rect.y,
+                                clamp16(round(player.vel_y * VEL_SCALE)), player_flags(player),
+                                player.recoil_timer)
+
+        peers = [p for p in world.players if p is not player]
+        body.append(len(peers))
+        for peer in peers:
+            body += PEER_STATE.pack(peer.index, peer.rect.x, peer.rect.y, player_flags(peer))
+
+        others = [(slot, other) for slot, other in rivals if other.session is not session]
+        body.append(len(others))
+        for slot, other in others:
+            other_world = other.session.world
+            body += RIVAL_STATE.pack(slot, other_world.score, min(other_world.current_stage, 255),
+                                     other_world.player_lives, other_world.game_over)
+
+        body += encode_entities(session.table, baseline)
+
+        client.history[self.frame] = session.table
+        while len(client.history) > HISTORY:
+            client.history.popitem(last=False)
+        return SNAPSHOT_HEADER.pack(MSG_SNAPSHOT, self.frame, baseline_frame) + compress(bytes(body))
+
+
+# === [클라이언트] ===
+class NetClient:
+    def __init__(self, sock, server_address, name="player", levels=None, clock=time.perf_counter):
+        self.sock = sock
+        self.server_address = server_address
+        self.name = name
+        self.levels = levels or game.default_levels
+        self.clock = clock
+        self.index = None
+        self.mode = None
+        self.snapshot_interval = SNAPSHOT_INTERVAL
+        self.rejected = False
+        self.last_hello = None
+
+        # 예측용 내 플레이어 (서버 상태가 오면 덮어쓰고 남은 입력을 다시 적용)
+        self.player = game.Player(0, 0)
+        self.seq = 0
+        self.unacked = OrderedDict()    # 입력 번호 -> 입력 비트
+        self.sent_at = {}               # 입력 번호 -> 보낸 시각 (지연 측정)
+        self.predicted = {}             # 입력 번호 -> 그 입력까지 적용한 예측 위치 (보정 측정)
+        self.acked_seq = 0
+
+        self.frames = OrderedDict()     # 스냅샷 번호 -> 엔티티 표 (기준 스냅샷으로 씀)
+        self.latest_frame = 0
+        self.entities = {}
+        self.prev_entities = {}
+        self.snapshot_time = None
+        self.world = None               # (seed, 틱, 점수, 목숨, 스테이지, 플래그)
+        self.peers = []
+        self.rivals = []
+        self.level = None
+        self.platform_grid = None
+
+        self.latencies = []
+        self.corrections = []
+        self.snapshots = 0
+        self.undecodable = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+
+    @property
+    def connected(self):
+        return self.index is not None
+
+    def send(self, data):
+        self.sock.sendto(data, self.server_address)
+        self.bytes_sent += len(data) + UDP_OVERHEAD
+
+    def connect(self):
+        # WELCOME이 올 때까지 0.25초마다 HELLO
+        now = self.clock()
+        if self.last_hello is None or now - self.last_hello >= 0.25:
+            self.last_hello = now
+            self.send(HELLO.pack(MSG_HELLO, NET_VERSION) + self.name.encode()[:16])
+
+    def close(self):
+        if self.connected:
+            self.send(MSG_BYE)
+
+    def poll(self):
+        for data, address in receive_all(self.sock):
+            if address != self.server_address:
+                continue
+            self.bytes_received += len(data) + UDP_OVERHEAD
+            kind = data[:1]
+            if kind == MSG_WELCOME and len(data) >= WELCOME.size and not self.connected:
+                _, _, self.index, mode, self.snapshot_interval = WELCOME.unpack_from(data)
+                self.mode = MODES[mode]
+            elif kind == MSG_SNAPSHOT and self.connected:
+                self.on_snapshot(data)
+            elif kind == MSG_BYE:
+                self.rejected = True
+
+    def send_input(self, bits):
+        # 이번 틱 입력을 바로 내 플레이어에 적용(예측)하고, 최근 입력과 함께 보냄
+        self.seq += 1
+        self.unacked[self.seq] = bits
+        self.sent_at[self.seq] = self.clock()
+        if self.platform_grid is not None:
+            self.player.update(self.platform_grid, bits)
+            self.predicted[self.seq] = self.player.rect.topleft
+
+        first = max(self.acked_seq + 1, self.seq - INPUT_REDUNDANCY + 1)
+        values = bytes(self.unacked[seq] for seq in range(first, self.seq + 1))
+        self.send(INPUT_HEADER.pack(MSG_INPUT, self.latest_frame, first, len(values)) + values)
+
+    def on_snapshot(self, data):
+        _, frame, baseline_frame = SNAPSHOT_HEADER.unpack_from(data)
+        if frame <= self.latest_frame:
+            return      # 늦게 도착했거나 중복된 스냅샷
+        if baseline_frame and baseline_frame not in self.frames:
+            self.undecodable += 1
+            return
+        body = decompress(data[SNAPSHOT_HEADER.size:])
+
+        world = WORLD_STATE.unpack_from(body)
+        pos = WORLD_STATE.size
+        ack_seq, x, y, vel_y, flags, recoil = SELF_STATE.unpack_from(body, pos)
+        pos += SELF_STATE.size
+        peers = []
+        for _ in range(body[pos]):
+            peers.append(PEER_STATE.unpack_from(body, pos + 1 + len(peers) * PEER_STATE.size))
+        pos += 1 + len(peers) * PEER_STATE.size
+        rivals = []
+        for _ in range(body[pos]):
+            rivals.append(RIVAL_STATE.unpack_from(body, pos + 1 + len(rivals) * RIVAL_STATE.size))
+        pos += 1 + len(rivals) * RIVAL_STATE.size
+        table, pos = decode_entities(body, pos, self.frames.get(baseline_frame, {}))
+
+        self.frames[frame] = table
+        while len(self.frames) > HISTORY:
+            self.frames.popitem(last=False)
+        if self.latest_frame:
+            # 서버가 대역폭에 맞춰 간격을 바꾸거나 손실이 있으면 간격이 달라지므로 실제 간격으로 보간
+            self.snapshot_interval = frame - self.latest_frame
+        self.latest_frame = frame
+        self.snapshots += 1
+        self.prev_entities = self.entities
+        self.entities = table
+        self.snapshot_time = self.clock()
+        self.peers = peers
+        self.rivals = rivals
+
+        seed, _, _, _, stage, _ = world
+        if self.world is None or (seed, stage) != (self.world[0], self.world[4]):
+            self.level = self.levels.choose(stage, seed)
+            self.platform_grid = self.level.index
+        self.world = world
+        self.reconcile(ack_seq, x, y, vel_y, flags, recoil)
+
+    def reconcile(self, ack_seq, x, y, vel_y, flags, recoil):
+        now = self.clock()
+        sent = self.sent_at.get(ack_seq)
+        if sent is not None:
+            self.latencies.append(now - sent)
+        predicted = self.predicted.get(ack_seq)
+        if predicted is not None:
+            self.corrections.append(abs(predicted[0] - x) + abs(predicted[1] - y))
+        if ack_seq > self.acked_seq:
+            self.acked_seq = ack_seq
+        for seq in [seq for seq in self.sent_at if seq <= ack_seq]:
+            del self.sent_at[seq]
+            self.predicted.pop(seq, None)
+        while self.unacked and next(iter(self.unacked)) <= ack_seq:
+            self.unacked.popitem(last=False)
+
+        # 서버 상태에서 아직 서버가 적용 안 한 입력을 다시 적용
+        player = self.player
+        player.rect.topleft = (x, y)
+        player.vel_y = vel_y / VEL_SCALE
+        player.facing_right = bool(flags & PLAYER_FACING)
+        player.on_ground = bool(flags & PLAYER_ON_GROUND)
+        player.invincible = bool(flags & PLAYER_INVINCIBLE)
+        player.visible = bool(flags & PLAYER_VISIBLE)
+        player.shield = bool(flags & PLAYER_SHIELD)
+        player.speed_buff = bool(flags & PLAYER_SPEED)
+        player.recoil_timer = recoil
+        for seq, bits in self.unacked.items():
+            player.update(self.platform_grid, bits)
+            self.predicted[seq] = player.rect.topleft
+
+    def interpolated_entities(self, now):
+        # 직전 스냅샷과 최근 스냅샷 사이를 보간한 (종류, x, y, 부가 값) 목록
+        if self.snapshot_time is None:
+            return []
+        alpha = min(1.0, (now - self.snapshot_time) * game.FPS / self.snapshot_interval)
+        prev = self.prev_entities
+        result = []
+        for entity_id, (kind, x, y, extra) in self.entities.items():
+            old = prev.get(entity_id)
+            if old is not None and old[0] == kind:
+                x = old[1] + (x - old[1]) * alpha
+                y = old[2] + (y - old[2]) * alpha
+            result.append((kind, round(x * ENTITY_GRID), round(y * ENTITY_GRID), extra))
+        return result
+
+
+# === [클라이언트 화면] ===
+def draw_client(surface, client, hud_digits, static_layer):
+    surface.fill(game.BLACK)
+    if client.world is None:
+        text = "connecting..." if not client.rejected else "server full or version mismatch"
+        game.draw_text_center(surface, text, game.font_ui, game.WHITE)
+        return
+
+    static_layer.update(client.level.platforms)
+    static_layer.draw(surface)
+
+    queue = game.render_queue
+    for kind, x, y, extra in client.interpolated_entities(client.clock()):
+        if kind == ENTITY_ENEMY:
+            queue.add(game.LAYER_ENEMIES, game.sprite_atlas.enemy_key(ENEMY_COLORS[extra]), x, y)
+        elif kind == ENTITY_BULLET:
+            queue.add(game.LAYER_BULLETS, "bullet", x, y)
+        else:
+            queue.add(game.LAYER_ITEMS, ("item", ITEM_TYPES[extra]), x, y)
+    for _, x, y, flags in client.peers:
+        if flags & PLAYER_VISIBLE:
+            queue.add(game.LAYER_PLAYER, ("player", bool(flags & PLAYER_FACING), bool(flags & PLAYER_RECOIL)), x, y)
+            if flags & PLAYER_SHIELD:
+                queue.add(game.LAYER_PLAYER, "shield", x, y)
+    client.player.queue_draw(queue, *client.player.rect.topleft)
+    queue.submit(surface)
+
+    seed, tick, score, lives, stage, flags = client.world
+    game.draw_hud_value(surface, "Score: ", str(score), hud_digits, (10, 10))
+    game.draw_hud_value(surface, "Time: ", f"{tick / game.FPS:.1f}s", hud_digits, (10, 85))
+    surface.blit(game.text_cache.render(game.font_ui, f"Stage: {stage}", game.GOLD), (game.SCREEN_WIDTH - 150, 10))
+    game.draw_hearts(surface, lives)
+    for i, (slot, rival_score, rival_stage, rival_lives, rival_over) in enumerate(client.rivals):
+        status = "OUT" if rival_over else f"stage {rival_stage}  lives {rival_lives}"
+        text = f"P{slot + 1}: {rival_score}  {status}"
+        surface.blit(game.text_cache.render(game.font_info, text, game.WHITE), (game.SCREEN_WIDTH - 260, 50 + i * 25))
+    if flags & WORLD_GAME_OVER:
+        game.draw_text_center(surface, "GAME OVER", game.font_title, game.RED, -50)
+    elif flags & WORLD_STAGE_TEXT:
+        game.draw_text_center(surface, f"STAGE {stage}", game.font_title, game.GOLD, -50)
+
+def run_client(host, port, name):
+    game.init_display()
+    pygame.display.set_caption(f"Shooting Python - {name} @ {host}:{port}")
+    address = (socket.gethostbyname(host), port)
+    client = NetClient(udp_socket("0.0.0.0", 0), address, name)
+    hud_digits = game.DigitAtlas(game.font_ui, game.WHITE)
+    static_layer = game.StaticLayer()
+    clock = pygame.time.Clock()
+
+    running = True
+    while running:
+        clock.tick(game.FPS)
+        inputs = game.read_held_inputs()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_z:
+                inputs |= game.INPUT_SHOOT
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                running = False
+
+        client.poll()
+        if client.connected:
+            client.send_input(inputs)
+        elif not client.rejected:
+            client.connect()
+        draw_client(game.screen, client, hud_digits, static_layer)
+        pygame.display.flip()
+
+    client.close()
+    pygame.quit()
+
+def run_server(host, port, mode, seed, budget):
+    server = NetServer(udp_socket(host, port), mode, seed, budget)
+    print(f"listening on {host}:{port} ({mode}, seed={server.seed}, {budget / 1024:.1f} KB/s per client)")
+    tick_seconds = 1 / game.FPS
+    next_tick = time.perf_counter()
+    next_report = next_tick + 10
+    try:
+        while True:
+            server.poll()
+            server.step()
+            next_tick += tick_seconds
+            now = time.perf_counter()
+            if next_tick > now:
+                time.sleep(next_tick - now)
+            elif now - next_tick > 0.25:
+                next_tick = now     # 너무 밀렸으면 따라잡지 않고 지금부터 다시
+            if now >= next_report and server.clients:
+                for client in server.clients.values():
+                    print(f"  {client.name}: {client.rate / 1024:.1f} KB/s down, "
+                          f"{game.FPS // client.interval} snapshots/s")
+                next_report = now + 10
+    except KeyboardInterrupt:
+        pass
+
+
+# === [루프백 테스트] ===
+class VirtualClock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+def loopback_bot(rng, state):
+    # 방향을 가끔 바꾸며 뛰고 쏘는 간단한 봇 (state: [방향, 남은 틱])
+    if state[1] <= 0:
+        state[0] = rng.choice((game.INPUT_LEFT, game.INPUT_RIGHT, 0))
+        state[1] = rng.randint(20, 90)
+    state[1] -= 1
+    inputs = state[0]
+    if rng.random() < 0.03:
+        inputs |= game.INPUT_JUMP
+    if rng.random() < 0.08:
+        inputs |= game.INPUT_SHOOT
+    return inputs
+
+def run_loopback(clients=2, mode="coop", seconds=30.0, loss=0.05, latency=0.04, jitter=0.01, enemies=200,
+                 seed=1, budget=BANDWIDTH_BUDGET):
+    # 서버와 봇 클라이언트를 가상 시계 하나로 같이 돌림 (실제 UDP 소켓, 시간은 틱마다 1/60초씩)
+    clock = VirtualClock()
+    rng = random.Random(seed)
+    server_sock = LossySocket(udp_socket(), loss, latency, jitter, random.Random(rng.random()), clock)
+    server = NetServer(server_sock, mode, seed, budget, clock=clock)
+    bots = []
+    for i in range(clients):
+        sock = LossySocket(udp_socket(), loss, latency, jitter, random.Random(rng.random()), clock)
+        bots.append((NetClient(sock, server_sock.getsockname(), f"bot{i + 1}", clock=clock),
+                     random.Random(rng.random()), [0, 0]))
+
+    ticks = int(seconds * game.FPS)
+    alive = []
+    start = time.perf_counter()
+    for _ in range(ticks):
+        clock.time += 1 / game.FPS
+        for client, bot_rng, state in bots:
+            client.poll()
+            if client.connected:
+                client.send_input(loopback_bot(bot_rng, state))
+            else:
+                client.connect()
+        server.poll()
+        # 측정 조건 유지: 적을 enemies 마리로 채우고 게임이 끝나지 않게 목숨 유지
+        for session in server.sessions:
+            world = session.world
+            world.player_lives = 3
+            while len(world.enemies) < enemies:
+                world.spawn_enemy()
+            alive.append(len(world.enemies))
+        server.step()
+    wall = time.perf_counter() - start
+
+    print(f"{clients} clients ({mode}), {seconds:.0f}s simulated in {wall:.1f}s, "
+          f"loss {loss * 100:.0f}%, latency {latency * 1000:.0f}±{jitter * 1000:.0f} ms one way, "
+          f"budget {budget / 1024:.1f} KB/s, {np.mean(alive) if alive else 0:.0f} enemies alive")
+    print(f"{'client':>8} {'down KB/s':>10} {'up KB/s':>8} {'snaps/s':>8} {'undecoded':>10} "
+          f"{'ack p50':>8} {'p95':>6} {'max':>6} {'corrected':>10} {'mean px':>8}")
+    for client, _, _ in bots:
+        latencies = np.array(client.latencies or [0.0]) * 1000
+        corrections = np.array(client.corrections or [0])
+        print(f"{client.name:>8} {client.bytes_received / seconds / 1024:>10.2f} {client.bytes_sent / seconds / 1024:>8.2f} "
+              f"{client.snapshots / seconds:>8.1f} {client.undecodable:>10} {np.percentile(latencies, 50):>6.0f}ms "
+              f"{np.percentile(latencies, 95):>4.0f}ms {latencies.max():>4.0f}ms "
+              f"{np.count_nonzero(corrections):>10} {corrections[corrections > 0].mean() if corrections.any() else 0:>8.1f}")
+        client.close()
+    server.poll()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Shooting Python 네트워크 협동/대전 (UDP)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    server = commands.add_parser("server", help="권위 서버 실행")
+    server.add_argument("--host", default="0.0.0.0")
+    server.add_argument("--port", type=int, default=DEFAULT_PORT)
+    server.add_argument("--mode", choices=MODES, default="coop", help="coop: 한 월드 협동, versus: 같은 seed로 각자 대결")
+    server.add_argument("--seed", type=int, default=None)
+    server.add_argument("--budget", type=float, default=BANDWIDTH_BUDGET / 1024,
+                        help="클라이언트마다 내려보낼 최대 KB/s (넘으면 스냅샷 간격을 늘림)")
+
+    client = commands.add_parser("client", help="서버에 접속해서 플레이")
+    client.add_argument("--host", default="127.0.0.1")
+    client.add_argument("--port", type=int, default=DEFAULT_PORT)
+    client.add_argument("--name", default=None, help="플레이어 이름 (기본: 로그인 사용자 이름)")
+
+    loopback = commands.add_parser("loopback", help="봇 클라이언트로 지연/대역폭 측정 (가상 시계, 손실 흉내)")
+    loopback.add_argument("--clients", type=int, default=2)
+    loopback.add_argument("--mode", choices=MODES, default="coop")
+    loopback.add_argument("--seconds", type=float, default=30)
+    loopback.add_argument("--loss", type=float, default=0.05, help="패킷 손실 확률 (양방향 각각)")
+    loopback.add_argument("--latency", type=float, default=40, help="한쪽 방향 지연 (ms)")
+    loopback.add_argument("--jitter", type=float, default=10, help="지연 흔들림 ± (ms)")
+    loopback.add_argument("--enemies", type=int, default=200, help="월드마다 유지할 적 수")
+    loopback.add_argument("--seed", type=int, default=1)
+    loopback.add_argument("--budget", type=float, default=BANDWIDTH_BUDGET / 1024, help="클라이언트마다 최대 KB/s")
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args()
+    if args.command == "client":
+        run_client(args.host, args.port, args.name or game.default_player_name())
+        return
+    # 서버/테스트는 창 없이 돌림
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    budget = args.budget * 1024
+    if args.command == "server":
+        run_server(args.host, args.port, args.mode, args.seed, budget)
+    else:
+        run_loopback(args.clients, args.mode, args.seconds, args.loss, args.latency / 1000, args.jitter / 1000,
+                     args.enemies, args.seed, budget)
+
+
+if __name__ == "__main__":
+    main()
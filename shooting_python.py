@@ -1,789 +1,3383 @@
-import pygame
-import random
-import sys
-
-# --- 초기화 ---
-pygame.init()
-pygame.mixer.init() 
-pygame.font.init() 
-
-# --- 색상 정의 (RGB) ---
-WHITE = (255, 255, 255)
-BLACK = (20, 20, 30)     
-RED = (255, 60, 60)      
-BLUE = (60, 120, 255)    
-YELLOW = (255, 255, 0)   
-GREY = (100, 100, 100)   
-GREEN = (50, 200, 80)    
-GOLD = (255, 215, 0)     
-ORANGE = (255, 165, 0)
-PURPLE = (180, 50, 255)  # 고레벨 적 색상
-DARK_RED = (150, 0, 0)   # 최고레벨 적 색상
-
-# 버튼용 색상
-BTN_RED = (255, 107, 107)    
-BTN_GREEN = (78, 205, 196)   
-BTN_BLUE = (50, 150, 255)    
-BTN_YELLOW = (255, 230, 109) 
-
-# --- 게임 설정 ---
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 600
-FPS = 60
-
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Shooting Python - Final")
-clock = pygame.time.Clock()
-
-# 폰트 설정
-font_title = pygame.font.SysFont("arial", 70, True)
-font_btn = pygame.font.SysFont("arial", 40, True)
-font_sub = pygame.font.SysFont("arial", 40)
-font_info = pygame.font.SysFont("arial", 25)
-font_ui = pygame.font.SysFont("arial", 30, True)
-
-# --- 물리 엔진 상수 ---
-GRAVITY = 0.8
-PLAYER_SPEED = 5
-JUMP_FORCE = 16       
-BULLET_SPEED = 15     
-
-# --- 게임 상태 상수 ---
-STATE_MENU = 0      
-STATE_GUIDE = 1     
-STATE_OPTION = 2    
-STATE_PLAYING = 3   
-STATE_GAMEOVER = 4  
-STATE_PAUSE = 5     
-
-# === [버튼 클래스] ===
-class Button:
-    def __init__(self, text, x, y, width, height, color, text_color=BLACK):
-        self.text = text
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
-        self.color = color
-        self.text_color = text_color
-        self.rect = pygame.Rect(x, y, width, height)
-        self.hovered = False
-
-    def draw(self, screen):
-        mouse_pos = pygame.mouse.get_pos()
-        self.hovered = self.rect.collidepoint(mouse_pos)
-
-        current_color = self.color
-        draw_rect = self.rect.copy()
-
-        if self.hovered:
-            scale = 5
-            draw_rect = pygame.Rect(self.x - scale, self.y - scale, self.width + scale*2, self.height + scale*2)
-            current_color = (min(self.color[0]+30, 255), min(self.color[1]+30, 255), min(self.color[2]+30, 255))
-
-        pygame.draw.rect(screen, current_color, draw_rect, border_radius=15)
-        pygame.draw.rect(screen, WHITE, draw_rect, 3, border_radius=15)
-
-        text_surf = font_btn.render(self.text, True, self.text_color)
-        text_rect = text_surf.get_rect(center=draw_rect.center)
-        screen.blit(text_surf, text_rect)
-
-    def is_clicked(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            if self.hovered:
-                return True
-        return False
-
-# === [파티클 클래스] ===
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = random.randint(4, 8)
-        self.life = random.randint(20, 40)
-        self.vel_x = random.uniform(-3, 3)
-        self.vel_y = random.uniform(-3, 3)
-    
-    def update(self):
-        self.x += self.vel_x
-        self.y += self.vel_y
-        self.life -= 1
-        self.size -= 0.1 
-        
-    def draw(self, surface, shake_x=0, shake_y=0):
-        if self.size > 0:
-            rect = (self.x + shake_x, self.y + shake_y, self.size, self.size)
-            pygame.draw.rect(surface, self.color, rect)
-
-# === [배경 별 클래스] ===
-class Star:
-    def __init__(self):
-        self.x = random.randint(0, SCREEN_WIDTH)
-        self.y = random.randint(0, SCREEN_HEIGHT)
-        self.size = random.randint(1, 3)
-        self.speed = random.uniform(0.2, 1.0)
-    
-    def update(self):
-        self.y += self.speed
-        if self.y > SCREEN_HEIGHT:
-            self.y = 0
-            self.x = random.randint(0, SCREEN_WIDTH)
-            
-    def draw(self, surface):
-        pygame.draw.circle(surface, (200, 200, 255), (int(self.x), int(self.y)), self.size)
-
-# === [아이템 클래스] ===
-class Item(pygame.sprite.Sprite):
-    def __init__(self, x, y, item_type):
-        super().__init__()
-        self.item_type = item_type 
-        self.image = pygame.Surface((32, 32), pygame.SRCALPHA)
-
-        if item_type == "speed":
-            self.draw_shoe(self.image, (80, 180, 255))
-        elif item_type == "shield":
-            self.draw_shield(self.image, (255, 255, 120))
-        elif item_type == "heart":
-            self.draw_heart(self.image, (255, 70, 100))
-
-        self.rect = self.image.get_rect(center=(x, y))
-
-    def update(self):
-        self.rect.y += 2 
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
-
-    def draw_heart(self, surface, color):
-        pygame.draw.circle(surface, color, (10, 12), 8)
-        pygame.draw.circle(surface, color, (22, 12), 8)
-        pygame.draw.polygon(surface, color, [(4, 16), (28, 16), (16, 30)])
-
-    def draw_shoe(self, surface, color):
-        pygame.draw.rect(surface, color, (5, 20, 22, 7))
-        pygame.draw.rect(surface, (255, 255, 255), (5, 23, 22, 3))
-        pygame.draw.polygon(surface, color, [(7, 20), (20, 10), (27, 12), (25, 20)])
-        pygame.draw.line(surface, (255, 255, 255), (12, 17), (20, 14), 2)
-
-    def draw_shield(self, surface, color):
-        pygame.draw.polygon(surface, color, [(16, 4), (26, 14), (20, 26), (12, 26), (6, 14)])
-        pygame.draw.circle(surface, (255, 255, 255, 80), (14, 12), 4)
-
-
-class Player(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super().__init__()
-        self.image = pygame.Surface((30, 50)) 
-        self.image.fill(BLUE)
-        self.rect = self.image.get_rect()
-        self.rect.topleft = (x, y)
-        
-        self.vel_y = 0
-        self.on_ground = False
-        self.facing_right = True 
-        self.recoil_timer = 0
-        self.invincible = False      
-        self.invincible_timer = 0    
-        self.visible = True          
-
-        self.speed_buff = 0       
-        self.shield = False       
-
-    def update(self, platforms):
-        if self.invincible:
-            self.invincible_timer -= 1
-            if self.invincible_timer <= 0:
-                self.invincible = False
-                self.visible = True
-            else:
-                if self.invincible_timer % 10 < 5:
-                    self.visible = False
-                else:
-                    self.visible = True
-        
-        current_speed = PLAYER_SPEED
-        if self.speed_buff > 0:
-            current_speed = PLAYER_SPEED * 1.5 
-            self.speed_buff -= 1
-
-        keys = pygame.key.get_pressed()
-        dx = 0
-        if keys[pygame.K_LEFT]:
-            dx = -current_speed
-            self.facing_right = False
-        if keys[pygame.K_RIGHT]:
-            dx = current_speed
-            self.facing_right = True
-        
-        if keys[pygame.K_SPACE] and self.on_ground:
-            self.vel_y = -JUMP_FORCE
-            self.on_ground = False
-
-        self.vel_y += GRAVITY
-        
-        self.rect.x += dx
-        if self.rect.left < 0: self.rect.left = 0
-        if self.rect.right > SCREEN_WIDTH: self.rect.right = SCREEN_WIDTH
-
-        self.rect.y += self.vel_y
-
-        self.on_ground = False
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
-                if self.vel_y > 0 and self.rect.bottom < platform.rect.bottom + self.vel_y:
-                    self.rect.bottom = platform.rect.top
-                    self.vel_y = 0
-                    self.on_ground = True
-        
-        if self.recoil_timer > 0:
-            self.recoil_timer -= 1
-
-    def shoot(self):
-        self.recoil_timer = 5 
-        direction = 1 if self.facing_right else -1
-        bullet = Bullet(self.rect.centerx, self.rect.centery, direction)
-        return bullet
-    
-    def get_hit(self):
-        if self.shield:
-            self.shield = False
-            self.invincible = True
-            self.invincible_timer = 60 
-            return False 
-
-        if not self.invincible:
-            self.invincible = True
-            self.invincible_timer = 120 
-            return True 
-        return False 
-
-    def draw_custom(self, surface, shake_x=0, shake_y=0):
-        if not self.visible: return 
-
-        draw_rect = self.rect.move(shake_x, shake_y)
-        pygame.draw.rect(surface, BLUE, draw_rect)
-        eye_x_offset = 15 if self.facing_right else 5
-        pygame.draw.rect(surface, WHITE, (draw_rect.x + eye_x_offset, draw_rect.y + 10, 10, 10))
-        pygame.draw.rect(surface, RED, (draw_rect.x, draw_rect.y + 5, 30, 5))
-        gun_x = draw_rect.right if self.facing_right else draw_rect.left - 15
-        if self.recoil_timer > 0: 
-            gun_x -= 5 if self.facing_right else -5
-        pygame.draw.rect(surface, GREY, (gun_x - (5 if self.facing_right else -5), draw_rect.centery, 15, 8))
-
-        if self.shield:
-            cx = draw_rect.x + draw_rect.width // 2
-            cy = draw_rect.y + draw_rect.height // 2
-            radius = max(draw_rect.width, draw_rect.height)
-            shield_surf = pygame.Surface((radius * 4, radius * 4), pygame.SRCALPHA)
-            pygame.draw.circle(shield_surf, (100, 200, 255, 100), (radius * 2, radius * 2), radius + 5, width=3)
-            surface.blit(shield_surf, (cx - radius * 2, cy - radius * 2))
-
-
-class Platform(pygame.sprite.Sprite):
-    def __init__(self, x, y, width, height, color=GREY):
-        super().__init__()
-        self.image = pygame.Surface((width, height))
-        self.image.fill(color)
-        pygame.draw.rect(self.image, (200, 200, 200), (0, 0, width, 4)) 
-        self.rect = self.image.get_rect()
-        self.rect.topleft = (x, y)
-
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, direction):
-        super().__init__()
-        self.image = pygame.Surface((16, 8))
-        self.image.fill(YELLOW)
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)
-        self.speed = BULLET_SPEED * direction
-
-    def update(self):
-        self.rect.x += self.speed
-        if self.rect.right < 0 or self.rect.left > SCREEN_WIDTH:
-            self.kill()
-
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y, player, speed, color):
-        super().__init__()
-        self.image = pygame.Surface((35, 35))
-        self.image.fill(color) 
-        self.color = color 
-        self.rect = self.image.get_rect()
-        self.rect.topleft = (x, y)
-        self.player = player
-        self.speed = speed 
-        self.vel_y = 0
-    
-    def update(self, platforms, enemies):
-        dist_x = self.player.rect.centerx - self.rect.centerx
-        dist_y = self.player.rect.centery - self.rect.centery
-
-        if abs(dist_x) > 5:
-            if dist_x > 0: self.rect.x += self.speed 
-            else: self.rect.x -= self.speed
-        elif abs(dist_y) > 50:
-            if self.rect.centerx < SCREEN_WIDTH // 2:
-                self.rect.x += self.speed
-            else:
-                self.rect.x -= self.speed
-        
-        self.vel_y += GRAVITY
-        self.rect.y += self.vel_y
-        
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
-                if self.vel_y > 0:
-                    self.rect.bottom = platform.rect.top
-                    self.vel_y = 0
-
-        for other in enemies:
-            if other != self: 
-                if self.rect.colliderect(other.rect):
-                    if self.rect.centerx < other.rect.centerx:
-                        self.rect.x -= self.speed 
-                    else:
-                        self.rect.x += self.speed 
-    
-    def draw_custom(self, surface, shake_x=0, shake_y=0):
-        draw_rect = self.rect.move(shake_x, shake_y)
-        pygame.draw.rect(surface, self.color, draw_rect) 
-        pygame.draw.rect(surface, BLACK, (draw_rect.x + 5, draw_rect.y + 10, 8, 8))
-        pygame.draw.rect(surface, BLACK, (draw_rect.right - 13, draw_rect.y + 10, 8, 8))
-        pygame.draw.line(surface, BLACK, (draw_rect.x + 2, draw_rect.y + 8), (draw_rect.x + 15, draw_rect.y + 15), 3)
-        pygame.draw.line(surface, BLACK, (draw_rect.right - 2, draw_rect.y + 8), (draw_rect.right - 15, draw_rect.y + 15), 3)
-
-
-def init_game():
-    all_sprites = pygame.sprite.Group()
-    platforms = pygame.sprite.Group()
-    bullets = pygame.sprite.Group()
-    enemies = pygame.sprite.Group()
-    items = pygame.sprite.Group() 
-
-    platforms.add(Platform(0, SCREEN_HEIGHT - 20, SCREEN_WIDTH, 20, GREEN))
-    platforms.add(Platform(50, 450, 150, 20))
-    platforms.add(Platform(0, 350, 100, 20))
-    platforms.add(Platform(SCREEN_WIDTH - 200, 450, 150, 20))
-    platforms.add(Platform(SCREEN_WIDTH - 100, 350, 100, 20))
-    platforms.add(Platform(300, 250, 200, 20))
-    platforms.add(Platform(250, 520, 50, 60))
-    platforms.add(Platform(500, 520, 50, 60))
-    platforms.add(Platform(300, 420, 200, 20))
-
-    for p in platforms:
-        all_sprites.add(p)
-
-    player = Player(SCREEN_WIDTH // 2, 200)
-    all_sprites.add(player)
-
-    return player, all_sprites, platforms, bullets, enemies, items
-
-def draw_text_center(surf, text, font, color, y_offset=0):
-    text_surface = font.render(text, True, color)
-    rect = text_surface.get_rect()
-    rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + y_offset)
-    surf.blit(text_surface, rect)
-
-def draw_hearts(surf, lives):
-    for i in range(lives):
-        x = 10 + (i * 40)
-        y = 50 
-        pygame.draw.circle(surf, RED, (x + 10, y + 10), 10)
-        pygame.draw.circle(surf, RED, (x + 25, y + 10), 10)
-        pygame.draw.polygon(surf, RED, [(x, y + 15), (x + 35, y + 15), (x + 17, y + 35)])
-
-def main():
-    game_state = STATE_MENU 
-    
-    player = None
-    all_sprites = None
-    platforms = None
-    bullets = None
-    enemies = None
-    items = None
-
-    score = 0
-    start_ticks = 0 
-    final_time = 0  
-    high_scores = [0, 0, 0] 
-    player_lives = 3 
-
-    current_stage = 1
-    kill_count = 0
-    kill_goal = 10 
-    enemy_spawn_time = 1500 
-    current_enemy_speed = 3 
-    stage_text_timer = 0 
-
-    particles = []          
-    screen_shake = 0        
-    background_stars = [Star() for _ in range(50)] 
-
-    ENEMY_SPAWN_EVENT = pygame.USEREVENT + 1
-    pygame.time.set_timer(ENEMY_SPAWN_EVENT, enemy_spawn_time) 
-
-    ITEM_SPAWN_EVENT = pygame.USEREVENT + 2
-    pygame.time.set_timer(ITEM_SPAWN_EVENT, 5000)
-
-    current_volume = 0.5
-    current_bgm = "music.mp3"
-
-    def play_music(filename):
-        try:
-            pygame.mixer.music.load(filename)
-            pygame.mixer.music.set_volume(current_volume)
-            pygame.mixer.music.play(-1)
-            print(f"Music Playing: {filename}")
-        except:
-            print(f"Error: {filename} not found.")
-
-    play_music("music.mp3")
-
-    btn_width, btn_height = 250, 60
-    center_x = SCREEN_WIDTH // 2 - btn_width // 2
-    
-    btn_start = Button("GAME START", center_x, 250, btn_width, btn_height, BTN_RED)
-    btn_guide = Button("HOW TO PLAY", center_x, 330, btn_width, btn_height, BTN_GREEN)
-    btn_option = Button("OPTION", center_x, 410, btn_width, btn_height, BTN_BLUE)
-    btn_exit = Button("EXIT", center_x, 490, btn_width, btn_height, BTN_YELLOW)
-    
-    menu_buttons = [btn_start, btn_guide, btn_option, btn_exit]
-
-    btn_back = Button("BACK", center_x, 500, btn_width, btn_height, GREY, WHITE)
-    btn_vol_down = Button("-", center_x - 80, 300, 60, 60, GREY, WHITE)
-    btn_vol_up = Button("+", center_x + 270, 300, 60, 60, GREY, WHITE)
-    btn_pause_exit = Button("EXIT GAME", center_x, 400, btn_width, btn_height, BTN_YELLOW)
-
-    running = True
-
-    while running:
-        clock.tick(FPS)
-
-        if screen_shake > 0:
-            screen_shake -= 1
-        
-        shake_x = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
-        shake_y = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
-
-        # === 이벤트 처리 ===
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            
-            if game_state == STATE_MENU:
-                if btn_start.is_clicked(event):
-                    player, all_sprites, platforms, bullets, enemies, items = init_game()
-                    score = 0
-                    player_lives = 3 
-                    
-                    # 게임 초기화
-                    current_stage = 1
-                    kill_count = 0
-                    enemy_spawn_time = 1500
-                    current_enemy_speed = 3
-                    stage_text_timer = 120 
-                    pygame.time.set_timer(ENEMY_SPAWN_EVENT, enemy_spawn_time)
-                    
-                    if current_bgm != "music.mp3":
-                        current_bgm = "music.mp3"
-                        play_music("music.mp3")
-
-                    start_ticks = pygame.time.get_ticks()
-                    particles = []
-                    game_state = STATE_PLAYING
-                elif btn_guide.is_clicked(event):
-                    game_state = STATE_GUIDE
-                elif btn_option.is_clicked(event):
-                    game_state = STATE_OPTION
-                elif btn_exit.is_clicked(event):
-                    running = False
-
-            elif game_state == STATE_GUIDE:
-                if btn_back.is_clicked(event):
-                    game_state = STATE_MENU
-
-            elif game_state == STATE_OPTION:
-                if btn_back.is_clicked(event):
-                    game_state = STATE_MENU
-                
-                if btn_vol_down.is_clicked(event):
-                    current_volume = max(0.0, current_volume - 0.1)
-                    pygame.mixer.music.set_volume(current_volume)
-                elif btn_vol_up.is_clicked(event):
-                    current_volume = min(1.0, current_volume + 0.1)
-                    pygame.mixer.music.set_volume(current_volume)
-
-            elif game_state == STATE_PLAYING:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_z:
-                        if player: 
-                            bullet = player.shoot()
-                            all_sprites.add(bullet)
-                            bullets.add(bullet)
-                            screen_shake = 2
-                    elif event.key == pygame.K_ESCAPE:
-                        game_state = STATE_PAUSE
-                
-                if event.type == ENEMY_SPAWN_EVENT:
-                    spawn_x = random.randint(0, SCREEN_WIDTH)
-                    spawn_color = RED
-                    if current_stage == 2: spawn_color = ORANGE
-                    elif current_stage >= 3: spawn_color = PURPLE
-                    if current_stage >= 4: spawn_color = DARK_RED
-
-                    enemy = Enemy(spawn_x, -50, player, current_enemy_speed, spawn_color)
-                    all_sprites.add(enemy)
-                    enemies.add(enemy)
-                
-                if event.type == ITEM_SPAWN_EVENT:
-                    ix = random.randint(50, SCREEN_WIDTH - 50)
-                    item_type = random.choice(["speed", "shield", "heart"])
-                    new_item = Item(ix, -30, item_type)
-                    all_sprites.add(new_item)
-                    items.add(new_item)
-
-            elif game_state == STATE_PAUSE:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        game_state = STATE_PLAYING
-                
-                if btn_vol_down.is_clicked(event):
-                    current_volume = max(0.0, current_volume - 0.1)
-                    pygame.mixer.music.set_volume(current_volume)
-                elif btn_vol_up.is_clicked(event):
-                    current_volume = min(1.0, current_volume + 0.1)
-                    pygame.mixer.music.set_volume(current_volume)
-                elif btn_pause_exit.is_clicked(event):
-                    game_state = STATE_MENU
-
-            elif game_state == STATE_GAMEOVER:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_r:
-                        player, all_sprites, platforms, bullets, enemies, items = init_game()
-                        score = 0
-                        player_lives = 3 
-                        
-                        current_stage = 1
-                        kill_count = 0
-                        enemy_spawn_time = 1500
-                        current_enemy_speed = 3
-                        stage_text_timer = 120
-                        pygame.time.set_timer(ENEMY_SPAWN_EVENT, enemy_spawn_time)
-
-                        if current_bgm != "music.mp3":
-                            current_bgm = "music.mp3"
-                            play_music("music.mp3")
-
-                        start_ticks = pygame.time.get_ticks()
-                        particles = []
-                        game_state = STATE_PLAYING
-                    elif event.key == pygame.K_m: 
-                        game_state = STATE_MENU
-
-        # === 화면 그리기 ===
-        screen.fill(BLACK)
-
-        for star in background_stars:
-            star.update()
-            star.draw(screen)
-
-        if game_state == STATE_MENU:
-            draw_text_center(screen, "Shooting Python", font_title, BLUE, -200)
-            for btn in menu_buttons:
-                btn.draw(screen)
-
-        elif game_state == STATE_GUIDE:
-            draw_text_center(screen, "HOW TO PLAY", font_title, BTN_GREEN, -150)
-            guide_rect = pygame.Rect(150, 200, 500, 250)
-            pygame.draw.rect(screen, (30, 30, 40), guide_rect, border_radius=10)
-            pygame.draw.rect(screen, WHITE, guide_rect, 2, border_radius=10)
-            
-            instructions = ["MOVE: Arrow Keys", "JUMP: Space", "SHOOT: Z Key", "RESTART: R Key"]
-            for i, line in enumerate(instructions):
-                text_surf = font_ui.render(line, True, WHITE)
-                screen.blit(text_surf, (200, 230 + i*50))
-            btn_back.draw(screen)
-
-        elif game_state == STATE_OPTION:
-            draw_text_center(screen, "OPTIONS", font_title, BTN_BLUE, -150)
-            draw_text_center(screen, "MUSIC VOLUME", font_sub, WHITE, -50)
-            bar_width = 300
-            bar_height = 30
-            bar_x = (SCREEN_WIDTH - bar_width) // 2
-            bar_y = 315
-            pygame.draw.rect(screen, GREY, (bar_x, bar_y, bar_width, bar_height), border_radius=5)
-            fill_width = int(bar_width * current_volume)
-            pygame.draw.rect(screen, BTN_BLUE, (bar_x, bar_y, fill_width, bar_height), border_radius=5)
-            pygame.draw.rect(screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 3, border_radius=5)
-            vol_percent = int(current_volume * 100)
-            draw_text_center(screen, f"{vol_percent}%", font_ui, WHITE, 20)
-            btn_vol_down.draw(screen)
-            btn_vol_up.draw(screen)
-            btn_back.draw(screen)
-
-        elif game_state == STATE_PLAYING:
-            player.update(platforms)
-            bullets.update()
-            enemies.update(platforms, enemies)
-            items.update() 
-
-            for p in particles[:]:
-                p.update()
-                if p.life <= 0 or p.size <= 0:
-                    particles.remove(p)
-
-            item_hits = pygame.sprite.spritecollide(player, items, True)
-            for item in item_hits:
-                if item.item_type == "speed":
-                    player.speed_buff = FPS * 5 
-                elif item.item_type == "shield":
-                    player.shield = True
-                elif item.item_type == "heart":
-                    if player_lives < 3:
-                        player_lives += 1
-
-            hits = pygame.sprite.groupcollide(enemies, bullets, True, True)
-            for enemy, bullet_list in hits.items():
-                score += 100
-                screen_shake = 10 
-                # 스테이지 진행 로직
-                kill_count += 1
-                if kill_count >= kill_goal:
-                    current_stage += 1
-                    kill_count = 0 
-                    
-                    current_enemy_speed += 0.3 
-                    enemy_spawn_time = max(500, enemy_spawn_time - 200) 
-                    pygame.time.set_timer(ENEMY_SPAWN_EVENT, enemy_spawn_time)
-                    
-                    stage_text_timer = 180 
-
-                    if current_stage == 3:
-                        if current_bgm != "music2.mp3":
-                            current_bgm = "music2.mp3"
-                            play_music("music2.mp3")
-
-                for _ in range(10):
-                    particles.append(Particle(enemy.rect.centerx, enemy.rect.centery, enemy.color))
-            
-            if pygame.sprite.spritecollide(player, enemies, False):
-                if player.get_hit(): 
-                    player_lives -= 1
-                    screen_shake = 30 
-                    
-                    for _ in range(20):
-                        particles.append(Particle(player.rect.centerx, player.rect.centery, BLUE))
-
-                    if player_lives <= 0:
-                        final_time = (pygame.time.get_ticks() - start_ticks) / 1000
-                        high_scores.append(score)
-                        high_scores.sort(reverse=True)
-                        high_scores = high_scores[:3]
-                        game_state = STATE_GAMEOVER
-                        
-                        # [NEW] 게임 오버 시 원래 음악으로 복귀
-                        if current_bgm != "music.mp3":
-                            current_bgm = "music.mp3"
-                            play_music("music.mp3")
-                else:
-                    pass
-
-            for sprite in all_sprites:
-                if sprite != player and sprite not in enemies and sprite not in items:
-                    screen.blit(sprite.image, (sprite.rect.x + shake_x, sprite.rect.y + shake_y))
-            
-            for item in items: 
-                screen.blit(item.image, (item.rect.x + shake_x, item.rect.y + shake_y))
-
-            for bullet in bullets:
-                 screen.blit(bullet.image, (bullet.rect.x + shake_x, bullet.rect.y + shake_y))
-
-            player.draw_custom(screen, shake_x, shake_y)
-            for enemy in enemies:
-                enemy.draw_custom(screen, shake_x, shake_y)
-
-            for p in particles:
-                p.draw(screen, shake_x, shake_y)
-
-            elapsed_seconds = (pygame.time.get_ticks() - start_ticks) / 1000
-            score_text = font_ui.render(f"Score: {score}", True, WHITE)
-            time_text = font_ui.render(f"Time: {elapsed_seconds:.1f}s", True, WHITE)
-            stage_info = font_ui.render(f"Stage: {current_stage}", True, GOLD)
-            
-            screen.blit(score_text, (10, 10))
-            screen.blit(time_text, (10, 85)) 
-            screen.blit(stage_info, (SCREEN_WIDTH - 150, 10)) 
-            
-            draw_hearts(screen, player_lives)
-
-            if stage_text_timer > 0:
-                draw_text_center(screen, f"STAGE {current_stage}", font_title, GOLD, -50)
-                stage_text_timer -= 1
-
-        elif game_state == STATE_PAUSE:
-            for sprite in all_sprites:
-                if sprite != player and sprite not in enemies:
-                    screen.blit(sprite.image, sprite.rect)
-            for bullet in bullets:
-                 screen.blit(bullet.image, bullet.rect)
-            for item in items:
-                screen.blit(item.image, item.rect)
-            player.draw_custom(screen)
-            for enemy in enemies:
-                enemy.draw_custom(screen)
-            
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(150)
-            overlay.fill(BLACK)
-            screen.blit(overlay, (0, 0))
-
-            draw_text_center(screen, "PAUSED", font_title, WHITE, -150)
-            
-            draw_text_center(screen, "MUSIC VOLUME", font_sub, WHITE, -50)
-            bar_width = 300
-            bar_height = 30
-            bar_x = (SCREEN_WIDTH - bar_width) // 2
-            bar_y = 315
-            pygame.draw.rect(screen, GREY, (bar_x, bar_y, bar_width, bar_height), border_radius=5)
-            fill_width = int(bar_width * current_volume)
-            pygame.draw.rect(screen, BTN_BLUE, (bar_x, bar_y, fill_width, bar_height), border_radius=5)
-            pygame.draw.rect(screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 3, border_radius=5)
-            vol_percent = int(current_volume * 100)
-            draw_text_center(screen, f"{vol_percent}%", font_ui, WHITE, 20)
-
-            btn_vol_down.draw(screen)
-            btn_vol_up.draw(screen)
-            btn_pause_exit.draw(screen)
-
-        elif game_state == STATE_GAMEOVER:
-            for p in platforms:
-                screen.blit(p.image, p.rect)
-            player.draw_custom(screen)
-            for enemy in enemies:
-                enemy.draw_custom(screen)
-
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(200)
-            overlay.fill(BLACK)
-            screen.blit(overlay, (0, 0))
-            
-            draw_text_center(screen, "GAME OVER", font_title, RED, -200)
-            result_text = f"YOUR SCORE: {score}    TIME: {final_time:.1f}s"
-            draw_text_center(screen, result_text, font_ui, WHITE, -130)
-
-            draw_text_center(screen, "--- TOP 3 HIGH SCORES ---", font_ui, GOLD, -60)
-            for i, rank_score in enumerate(high_scores):
-                rank_text = f"{i+1}. {rank_score} point"
-                color = YELLOW if rank_score == score and score > 0 else WHITE
-                draw_text_center(screen, rank_text, font_ui, color, -20 + (i * 40))
-
-            draw_text_center(screen, "Press 'R' to Restart", font_sub, BLUE, 120)
-            draw_text_center(screen, "Press 'M' for Main Menu", font_info, GREY, 170)
-
-        pygame.display.flip()
-
-    pygame.quit()
-    sys.exit()
-
-if __name__ == "__main__":
-    main()
+# --startup-time: import부터 첫 프레임까지 재기 위해 가장 먼저 시각을 찍어 둠
+import time
+STARTUP_START = time.perf_counter()
+
+import argparse
+import ast
+import bisect
+import getpass
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import pygame
+import queue
+import random
+import struct
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+import numpy as np
+
+# --- 초기화 ---
+# 헤드리스 모드: 창/사운드 장치 없이 시뮬레이션만 돌림 (pygame.init 전에 설정)
+if "--headless" in sys.argv:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# pygame.init()으로 모든 서브시스템을 한꺼번에 켜지 않고 창/폰트/사운드는 처음 쓸 때 켭니다.
+# (헤드리스 실행, 벤치마크, 스윕 워커는 창이나 폰트가 필요 없음)
+
+# --- 색상 정의 (RGB) ---
+WHITE = (255, 255, 255)
+BLACK = (20, 20, 30)     
+RED = (255, 60, 60)      
+BLUE = (60, 120, 255)    
+YELLOW = (255, 255, 0)   
+GREY = (100, 100, 100)   
+GREEN = (50, 200, 80)    
+GOLD = (255, 215, 0)     
+ORANGE = (255, 165, 0)
+PURPLE = (180, 50, 255)  # 고레벨 적 색상
+DARK_RED = (150, 0, 0)   # 최고레벨 적 색상
+
+# 버튼용 색상
+BTN_RED = (255, 107, 107)    
+BTN_GREEN = (78, 205, 196)   
+BTN_BLUE = (50, 150, 255)    
+BTN_YELLOW = (255, 230, 109) 
+
+# --- 게임 설정 ---
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+FPS = 60                      # 시뮬레이션 틱 속도 (고정)
+TICK_SECONDS = 1 / FPS
+MAX_FRAME_TIME = 0.25         # 한 프레임에 따라잡을 최대 시간 (초)
+
+screen = None       # init_display()에서 생성
+clock = pygame.time.Clock()
+
+# --startup-time 측정용 (단계 이름, 시각)
+startup_marks = []
+
+def mark_startup(label):
+    startup_marks.append((label, time.perf_counter()))
+
+def init_display():
+    global screen
+    if screen is None:
+        pygame.display.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Shooting Python - Final")
+        mark_startup("display")
+    return screen
+
+# === [폰트 경로 캐시] ===
+# SysFont는 처음 부를 때 시스템 폰트 목록 전체를 훑기 때문에(fc-list 등) 폰트가 많은 기기에서 느립니다.
+# (이름, 굵게, 기울임) -> (폰트 파일, 가짜 굵게, 가짜 기울임) 결과를 파일로 저장해 두고 다음 실행부터 바로 엽니다.
+FONT_CACHE_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                               "shooting_python", "fonts.json")
+
+class FontCache:
+    def __init__(self, path=FONT_CACHE_PATH):
+        self.path = path
+        self.entries = None
+        self.hits = 0
+        self.misses = 0
+        self.loaded = 0
+        self.load_seconds = 0.0
+
+    def read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def write(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass    # 캐시를 못 쓰면 다음 실행에서 다시 찾을 뿐
+
+    def resolve(self, name, bold, italic):
+        if self.entries is None:
+            self.entries = self.read()
+        key = f"{name}|{int(bold)}|{int(italic)}"
+        entry = self.entries.get(key)
+        # 폰트가 지워졌으면 다시 찾음 (None은 pygame 기본 폰트)
+        if entry is not None and (entry[0] is None or os.path.exists(entry[0])):
+            self.hits += 1
+            return entry
+        self.misses += 1
+        found = []
+        pygame.font.SysFont(name, 1, bold, italic,
+                            constructor=lambda path, size, set_bold, set_italic: found.append([path, set_bold, set_italic]))
+        self.entries[key] = found[0]
+        self.write()
+        return found[0]
+
+    def font(self, name, size, bold=False, italic=False):
+        # pygame.font.SysFont(name, size, bold, italic)와 같은 폰트
+        start = time.perf_counter()
+        if not pygame.font.get_init():
+            pygame.font.init()
+        path, set_bold, set_italic = self.resolve(name, bold, italic)
+        font = pygame.font.Font(path, size)
+        if set_bold:
+            font.set_bold(True)
+        if set_italic:
+            font.set_italic(True)
+        self.loaded += 1
+        self.load_seconds += time.perf_counter() - start
+        return font
+
+    def stats(self):
+        return (f"fonts: {self.loaded} loaded in {self.load_seconds * 1000:.1f} ms "
+                f"(path cache {self.hits} hits / {self.misses} misses, {self.path})")
+
+font_cache = FontCache()
+
+# 처음 render() 등을 부를 때 실제 폰트를 연다
+class LazyFont:
+    def __init__(self, name, size, bold=False, italic=False):
+        self.spec = (name, size, bold, italic)
+        self.font = None
+
+    def __getattr__(self, attr):
+        if self.font is None:
+            self.font = font_cache.font(*self.spec)
+        return getattr(self.font, attr)
+
+# 폰트 설정
+font_title = LazyFont("arial", 70, True)
+font_btn = LazyFont("arial", 40, True)
+font_sub = LazyFont("arial", 40)
+font_info = LazyFont("arial", 25)
+font_ui = LazyFont("arial", 30, True)
+
+# --- 물리 엔진 상수 ---
+GRAVITY = 0.8
+PLAYER_SPEED = 5
+JUMP_FORCE = 16       
+BULLET_SPEED = 15     
+
+# --- 게임 상태 상수 ---
+STATE_MENU = 0      
+STATE_GUIDE = 1     
+STATE_OPTION = 2    
+STATE_PLAYING = 3   
+STATE_GAMEOVER = 4  
+STATE_PAUSE = 5     
+
+# --- 렌더 큐 레이어 (작은 번호부터 그림) ---
+LAYER_ITEMS = 0
+LAYER_BULLETS = 1
+LAYER_PLAYER = 2
+LAYER_ENEMIES = 3
+
+# --- 입력 비트마스크 (틱마다 GameWorld.step에 전달) ---
+INPUT_LEFT = 1      # 누르고 있는 상태
+INPUT_RIGHT = 2     # 누르고 있는 상태
+INPUT_JUMP = 4      # SPACE, 누르고 있는 상태
+INPUT_SHOOT = 8     # Z, 이번 틱에 눌림 (KEYDOWN)
+INPUT_PAUSE = 16    # ESC, 이번 틱에 눌림 (KEYDOWN)
+
+# --- 스테이지 설정 ---
+ENEMY_SPAWN_TIME = 1500   # ms
+ITEM_SPAWN_TIME = 5000    # ms
+
+# 난이도 조절값 (GameWorld(tuning=...)으로 일부만 바꿔서 실험할 수 있음, sweep.py 참고)
+DEFAULT_TUNING = {
+    "kill_goal": 10,                    # 스테이지당 처치 수
+    "spawn_time": ENEMY_SPAWN_TIME,     # 첫 스테이지 적 생성 간격 (ms)
+    "spawn_step": 200,                  # 스테이지마다 줄어드는 생성 간격 (ms)
+    "spawn_min": 500,                   # 생성 간격 하한 (ms)
+    "enemy_speed": 3,                   # 첫 스테이지 적 속도
+    "speed_step": 0.3,                  # 스테이지마다 늘어나는 적 속도
+    "item_time": ITEM_SPAWN_TIME,       # 아이템 생성 간격 (ms)
+}
+
+# === [텍스트 캐시 클래스] ===
+# font.render는 매번 새 Surface를 만들기 때문에, 한 번 그린 글자는 (폰트, 문자열, 색, 안티앨리어싱)
+# 키로 보관했다가 재사용합니다. 오래 안 쓴 것부터 버리는 LRU 방식입니다.
+class TextCache:
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.entries[key] = surf
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return surf
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return f"text cache: {self.hits} hits / {self.misses} misses ({self.hit_rate() * 100:.1f}%), {len(self.entries)} entries"
+
+# === [숫자 아틀라스 클래스] ===
+# 점수/시간처럼 매 프레임 바뀌는 숫자는 문자열 전체를 캐시하면 캐시가 금방 넘치므로,
+# 글자(0-9, '.' 등) 하나씩 미리 그려두고 이어 붙여서 그립니다.
+class DigitAtlas:
+    def __init__(self, font, color, chars="0123456789.-s%"):
+        self.font = font
+        self.color = color
+        self.glyphs = {}
+        for ch in chars:
+            self.glyph(ch)
+
+    def glyph(self, ch):
+        surf = self.glyphs.get(ch)
+        if surf is None:
+            surf = self.font.render(ch, True, self.color)
+            self.glyphs[ch] = surf
+        return surf
+
+    def draw(self, surface, text, pos):
+        x, y = pos
+        blit_list = []
+        for ch in text:
+            surf = self.glyph(ch)
+            blit_list.append((surf, (x, y)))
+            x += surf.get_width()
+        surface.blits(blit_list, False)
+        return x
+
+text_cache = TextCache()
+
+# === [버튼 클래스] ===
+class Button:
+    def __init__(self, text, x, y, width, height, color, text_color=BLACK):
+        self.text = text
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.color = color
+        self.text_color = text_color
+        self.rect = pygame.Rect(x, y, width, height)
+        self.hovered = False
+
+    def update_hover(self):
+        mouse_pos = pygame.mouse.get_pos()
+        self.hovered = self.rect.collidepoint(mouse_pos)
+
+    def draw(self, screen):
+        self.update_hover()
+
+        current_color = self.color
+        draw_rect = self.rect.copy()
+
+        if self.hovered:
+            scale = 5
+            draw_rect = pygame.Rect(self.x - scale, self.y - scale, self.width + scale*2, self.height + scale*2)
+            current_color = (min(self.color[0]+30, 255), min(self.color[1]+30, 255), min(self.color[2]+30, 255))
+
+        pygame.draw.rect(screen, current_color, draw_rect, border_radius=15)
+        pygame.draw.rect(screen, WHITE, draw_rect, 3, border_radius=15)
+
+        text_surf = text_cache.render(font_btn, self.text, self.text_color)
+        text_rect = text_surf.get_rect(center=draw_rect.center)
+        screen.blit(text_surf, text_rect)
+
+    def is_clicked(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.hovered:
+                return True
+        return False
+
+def pixel_format(surface):
+    # map_colors()에 필요한 surface 형식 (알파 마스크, 시프트, 손실 비트)
+    return surface.get_masks()[3], surface.get_shifts(), surface.get_losses()
+
+def map_colors(surface, rgb, fmt=None):
+    # (N, 3) uint8 RGB 배열을 surface의 픽셀 값으로 변환 (fmt를 주면 surface 없이 그 형식으로)
+    alpha, shifts, losses = fmt or pixel_format(surface)
+    rgb = rgb.astype(np.uint32)
+    mapped = np.full(len(rgb), alpha, np.uint32)
+    for ch in range(3):
+        mapped |= (rgb[:, ch] >> losses[ch]) << shifts[ch]
+    return mapped
+
+# === [파티클 시스템 클래스] ===
+# 파티클을 하나씩 객체로 만들지 않고, 미리 할당한 NumPy 배열에 모아서 관리합니다.
+# 갱신/삭제는 배열 연산 한 번으로 처리하고, 그리기도 크기별로 묶어서 한 번에 씁니다.
+class ParticleSystem:
+    MAX_SIZE = 8
+
+    def __init__(self, capacity=65536, rng=None):
+        self.capacity = capacity
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.life = np.zeros(capacity, np.int32)
+        self.size = np.zeros(capacity)
+        self.color = np.zeros((capacity, 3), np.uint8)
+        # color를 그릴 surface의 픽셀 값으로 바꿔 둔 것 (형식이 바뀔 때만 전부 다시 계산)
+        self.pixel = np.zeros(capacity, np.uint32)
+        self.pixel_format = None
+        # 생성 순서대로 붙이는 번호: 앞으로 당겨져도 바뀌지 않아서 화질을 낮출 때 같은 파티클만 골라 그림
+        self.ids = np.zeros(capacity, np.int64)
+        self.next_id = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+        self.next_id = 0
+
+    def snapshot(self):
+        n = self.count
+        arrays = tuple(arr[:n].copy() for arr in (self.pos, self.vel, self.life, self.size, self.color, self.ids))
+        return arrays, self.rng.bit_generator.state, self.next_id
+
+    def restore(self, state):
+        arrays, rng_state, self.next_id = state
+        n = len(arrays[0])
+        for arr, saved in zip((self.pos, self.vel, self.life, self.size, self.color, self.ids), arrays):
+            arr[:n] = saved
+        self.count = n
+        self.rng.bit_generator.state = rng_state
+        self.pixel_format = None
+
+    def emit(self, x, y, color, count):
+        count = min(count, self.capacity - self.count)
+        if count <= 0: return
+        s = slice(self.count, self.count + count)
+        self.pos[s] = (x, y)
+        self.vel[s] = self.rng.uniform(-3, 3, (count, 2))
+        self.life[s] = self.rng.integers(20, 41, count)
+        self.size[s] = self.rng.integers(4, self.MAX_SIZE + 1, count)
+        self.color[s] = color[:3]
+        self.ids[s] = np.arange(self.next_id, self.next_id + count)
+        self.next_id += count
+        if self.pixel_format is not None:
+            self.pixel[s] = map_colors(None, np.array([color[:3]], np.uint8), self.pixel_format)[0]
+        self.count += count
+
+    def update(self):
+        n = self.count
+        if n == 0: return
+        self.pos[:n] += self.vel[:n]
+        self.life[:n] -= 1
+        self.size[:n] -= 0.1
+
+        # 수명이 끝난 파티클은 살아있는 것들을 앞으로 당겨서 한 번에 제거
+        alive = (self.life[:n] > 0) & (self.size[:n] > 0)
+        if not alive.all():
+            idx = np.flatnonzero(alive)
+            k = len(idx)
+            for arr in (self.pos, self.vel, self.life, self.size, self.color, self.pixel, self.ids):
+                arr[:k] = arr[idx]
+            self.count = k
+
+    def draw(self, surface, shake_x=0, shake_y=0, step=1):
+        # 파티클 전체를 감싸는 영역을 돌려줌 (더티 렉트 렌더링용)
+        # step > 1이면 번호가 step의 배수인 파티클만 그림 (화질을 낮출 때, 시뮬레이션은 그대로)
+        # 배열 위치로 고르면 앞쪽 파티클이 사라질 때마다 그려지는 파티클이 바뀌어 깜빡거림
+        n = self.count
+        if n == 0: return []
+        pick = slice(0, n) if step == 1 else np.flatnonzero(self.ids[:n] % step == 0)
+        pos = self.pos[pick]
+        if len(pos) == 0: return []
+        xs = np.floor(pos[:, 0] + shake_x + 0.5).astype(np.int64)
+        ys = np.floor(pos[:, 1] + shake_y + 0.5).astype(np.int64)
+        sizes = np.floor(self.size[pick] + 0.5).astype(np.int64)
+        width, height = surface.get_size()
+        visible = (sizes > 0) & (xs + sizes > 0) & (ys + sizes > 0) & (xs < width) & (ys < height)
+        if not visible.any(): return []
+        vx = xs[visible]
+        vy = ys[visible]
+        vs = sizes[visible]
+        left = max(0, int(vx.min()))
+        top = max(0, int(vy.min()))
+        bounds = pygame.Rect(left, top, min(width, int((vx + vs).max())) - left, min(height, int((vy + vs).max())) - top)
+
+        bytesize = surface.get_bytesize()
+        if bytesize not in (2, 4):
+            self.draw_rects(surface, np.flatnonzero(visible), xs, ys, sizes, self.color[pick])
+            return [bounds]
+
+        fmt = pixel_format(surface)
+        if fmt != self.pixel_format:
+            self.pixel_format = fmt
+            self.pixel[:n] = map_colors(surface, self.color[:n], fmt)
+        mapped = self.pixel[pick]
+
+        stride = surface.get_pitch() // bytesize
+        base = ys * stride + xs
+        view = surface.get_view("1")
+        pixels = np.frombuffer(view, dtype=np.uint32 if bytesize == 4 else np.uint16)
+        inside = visible & (xs >= 0) & (ys >= 0) & (xs + sizes <= width) & (ys + sizes <= height)
+        # 크기별로 묶어서, 정사각형 안의 칸(dy, dx)마다 그 크기 파티클 전부를 한 번에 씀
+        # (파티클 x 칸 수만큼의 인덱스 배열을 한꺼번에 만드는 것보다 임시 배열이 작아 두 배쯤 빠름)
+        for size in range(1, self.MAX_SIZE + 1):
+            group = inside & (sizes == size)
+            if not group.any(): continue
+            group_base = base[group]
+            group_pixels = mapped[group]
+            for dy in range(size):
+                row = group_base + dy * stride
+                for dx in range(size):
+                    pixels[row + dx] = group_pixels
+
+        # 화면 경계에 걸친 파티클은 화면 안에 들어오는 칸만 씀
+        edge = visible & ~inside
+        if edge.any():
+            ex, ey, es, edge_pixels = xs[edge], ys[edge], sizes[edge], mapped[edge]
+            for dy in range(int(es.max())):
+                y = ey + dy
+                row_ok = (dy < es) & (y >= 0) & (y < height)
+                for dx in range(int(es.max())):
+                    x = ex + dx
+                    ok = row_ok & (dx < es) & (x >= 0) & (x < width)
+                    pixels[(y * stride + x)[ok]] = edge_pixels[ok]
+        del pixels, view
+        return [bounds]
+
+    def draw_rects(self, surface, indices, xs, ys, sizes, colors):
+        # 픽셀 버퍼를 직접 쓸 수 없는 형식(8/24비트)의 surface용
+        # fill()은 왼쪽/위로 벗어난 rect를 자르지 않고 밀어 넣으므로 화면 영역으로 먼저 자름
+        clip = surface.get_rect()
+        for i in indices:
+            surface.fill(colors[i].tolist(), pygame.Rect(int(xs[i]), int(ys[i]), int(sizes[i]), int(sizes[i])).clip(clip))
+
+def merge_rects(rects):
+    # 겹치는 Rect를 합쳐서 서로 겹치지 않는 목록으로 만듦 (반투명 레이어를 같은 곳에 두 번 덮지 않도록)
+    merged = []
+    for rect in rects:
+        if not (rect.width and rect.height): continue
+        rect = rect.copy()
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+# === [배경 별 필드 클래스] ===
+# 별 하나하나를 객체로 두지 않고 NumPy 배열로 한 번에 움직이고, 픽셀 버퍼에 한 번에 찍습니다.
+# 가까운 별(depth가 큰 별)일수록 크고 빠르게 움직여서 시차(parallax) 효과가 납니다.
+class Starfield:
+    COLOR = (200, 200, 255)
+    MAX_DIRTY_STARS = 200   # 이보다 많으면 더티 렉트 대신 화면 전체를 갱신
+    STAMP_BATCH = 100       # 같은 크기 별이 이보다 많을 때만 도장 칸별로 나눠 씀 (적으면 한 번에 쓰는 게 빠름)
+
+    def __init__(self, count=50, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = count
+        self.width = width
+        self.height = height
+        depth = self.rng.uniform(0, 1, count)
+        self.x = self.rng.integers(0, width + 1, count).astype(float)
+        self.y = self.rng.integers(0, height + 1, count).astype(float)
+        self.speed = 0.2 + 0.8 * depth
+        self.size = 1 + np.rint(2 * depth).astype(np.int64)
+        self.stamps = {}
+        self.shown = count      # 앞에서부터 이만큼만 그림 (화질을 낮출 때 줄임)
+        self.drawn = None       # moved_rects()를 마지막으로 부른 때의 (x, y, shown)
+
+    def update(self, ticks=1.0):
+        # ticks: 이번 프레임 동안 흐른 시간 (60fps 한 프레임 = 1.0)
+        self.y += self.speed * ticks
+        wrapped = self.y > self.height
+        if wrapped.any():
+            self.y[wrapped] = 0
+            self.x[wrapped] = self.rng.integers(0, self.width + 1, int(wrapped.sum()))
+
+    def stamp(self, radius):
+        # pygame.draw.circle이 실제로 칠하는 픽셀 모양을 한 번만 구해서 재사용
+        offsets = self.stamps.get(radius)
+        if offsets is None:
+            surf = pygame.Surface((radius * 2 + 1, radius * 2 + 1))
+            surf.fill((0, 0, 0))
+            pygame.draw.circle(surf, (255, 255, 255), (radius, radius), radius)
+            dx, dy = np.nonzero(pygame.surfarray.array2d(surf))
+            offsets = (dx - radius, dy - radius)
+            self.stamps[radius] = offsets
+        return offsets
+
+    def moved_rects(self):
+        # 지난번 호출 뒤로 픽셀 위치가 바뀐(또는 새로 보이거나 사라진) 별의 이전/현재 영역
+        # 메뉴류 화면의 더티 렉트용: 이 영역만 지우고 다시 그리면 나머지 별은 그대로 둬도 됨
+        xs = self.x.astype(np.int64)
+        ys = self.y.astype(np.int64)
+        drawn, self.drawn = self.drawn, (xs, ys, self.shown)
+        screen_rect = pygame.Rect(0, 0, self.width, self.height)
+        if drawn is None:
+            return [screen_rect]
+        old_xs, old_ys, old_shown = drawn
+        n = max(self.shown, old_shown)
+        moved = (xs[:n] != old_xs[:n]) | (ys[:n] != old_ys[:n])
+        moved[min(self.shown, old_shown):] = True
+        idx = np.flatnonzero(moved)
+        if len(idx) * 2 > self.MAX_DIRTY_STARS:
+            return [screen_rect]
+        rects = []
+        for i, r in zip(idx.tolist(), self.size[idx].tolist()):
+            if i < old_shown:
+                rects.append(pygame.Rect(int(old_xs[i]) - r, int(old_ys[i]) - r, r * 2 + 1, r * 2 + 1).clip(screen_rect))
+            if i < self.shown:
+                rects.append(pygame.Rect(int(xs[i]) - r, int(ys[i]) - r, r * 2 + 1, r * 2 + 1).clip(screen_rect))
+        return merge_rects(rects)
+
+    def draw(self, surface, area=None):
+        # 그린 영역 목록을 돌려줌 (별이 많으면 화면 전체 한 칸)
+        # area: Rect 목록을 주면 그 안의 픽셀만 씀 (지운 곳만 다시 채울 때, 걸친 별도 잘라서 그림)
+        n = self.shown
+        xs = self.x[:n].astype(np.int64)
+        ys = self.y[:n].astype(np.int64)
+        sizes = self.size[:n]
+        width, height = surface.get_size()
+        mask = None
+        if area is not None:
+            if not area:
+                return []
+            bounds = np.array([tuple(rect) for rect in area], np.int64)
+            left, top = bounds[:, 0], bounds[:, 1]
+            right, bottom = left + bounds[:, 2], top + bounds[:, 3]
+            touches = ((xs[:, None] + sizes[:, None] >= left) & (xs[:, None] - sizes[:, None] < right) &
+                       (ys[:, None] + sizes[:, None] >= top) & (ys[:, None] - sizes[:, None] < bottom)).any(axis=1)
+            xs, ys, sizes = xs[touches], ys[touches], sizes[touches]
+            n = len(xs)
+            mask = np.zeros((width, height), bool)
+            for x, y, w, h in area:
+                mask[x:x + w, y:y + h] = True
+
+        if surface.get_bytesize() != 4:
+            for rect in area or [None]:
+                surface.set_clip(rect)
+                for x, y, size in zip(xs.tolist(), ys.tolist(), sizes.tolist()):
+                    pygame.draw.circle(surface, self.COLOR, (x, y), size)
+            surface.set_clip(None)
+        elif n:
+            color = map_colors(surface, np.array([self.COLOR], np.uint8))[0]
+            stride = surface.get_pitch() // 4
+            view = surface.get_view("1")
+            pixels = np.frombuffer(view, dtype=np.uint32)
+            for radius in range(1, int(sizes.max(initial=0)) + 1):
+                group = sizes == radius
+                if not group.any(): continue
+                dx, dy = self.stamp(radius)
+                gx = xs[group]
+                gy = ys[group]
+                if mask is None and len(gx) > self.STAMP_BATCH:
+                    # 별이 많으면, 화면 안에 다 들어오는 별은 도장의 칸마다 그 크기 별 전부를 한 번에 씀
+                    inner = (gx >= radius) & (gx < width - radius) & (gy >= radius) & (gy < height - radius)
+                    base = gy[inner] * stride + gx[inner]
+                    for offset in (dy * stride + dx).tolist():
+                        pixels[base + offset] = color
+                    gx = gx[~inner]
+                    gy = gy[~inner]
+                # 화면 경계에 걸친 별과 영역을 준 경우는 픽셀마다 잘라서 씀
+                px = (gx[:, None] + dx[None, :]).ravel()
+                py = (gy[:, None] + dy[None, :]).ravel()
+                inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+                if mask is not None:
+                    inside[inside] = mask[px[inside], py[inside]]
+                pixels[py[inside] * stride + px[inside]] = color
+            del pixels, view
+
+        if area is not None:
+            return area
+        if n > self.MAX_DIRTY_STARS:
+            return [surface.get_rect()]
+        screen_rect = surface.get_rect()
+        return [pygame.Rect(x - r, y - r, r * 2 + 1, r * 2 + 1).clip(screen_rect)
+                for x, y, r in zip(xs.tolist(), ys.tolist(), sizes.tolist())]
+
+# === [정적 레이어 클래스] ===
+# 움직이지 않는 발판을 한 장의 Surface에 미리 그려둡니다. 레벨(발판 그룹)이 바뀔 때만 다시 만듭니다.
+class StaticLayer:
+    COLORKEY = (255, 0, 255)
+
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.surface = pygame.Surface(size)
+        self.surface.set_colorkey(self.COLORKEY, pygame.RLEACCEL)
+        self.platforms = None
+
+    def update(self, platforms):
+        # 다시 그렸으면 True
+        if platforms is self.platforms:
+            return False
+        self.platforms = platforms
+        self.surface.fill(self.COLORKEY)
+        for p in platforms:
+            self.surface.blit(p.image, p.rect)
+        return True
+
+    def draw(self, surface, shake_x=0, shake_y=0):
+        return surface.blit(self.surface, (shake_x, shake_y))
+
+    def draw_area(self, surface, rect):
+        # 별처럼 발판 뒤에 그려진 작은 영역만 발판으로 다시 덮을 때
+        return surface.blit(self.surface, rect, rect)
+
+# === [정지 화면 레이어 클래스] ===
+# 일시정지/게임오버 화면에 들어갈 때 멈춘 월드를 한 번만 그리고, 어둡게 덮는
+# 반투명 오버레이까지 미리 합성해 둡니다. 이후 매 프레임은 별 위에 이 한 장만 올림.
+class FrozenLayer:
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.overlays = {}
+
+    def overlay(self, color, alpha):
+        key = (color, alpha)
+        overlay = self.overlays.get(key)
+        if overlay is None:
+            overlay = pygame.Surface(self.surface.get_size(), pygame.SRCALPHA)
+            overlay.fill((*color, alpha))
+            self.overlays[key] = overlay
+        return overlay
+
+    def capture(self, draw_world, alpha, color=BLACK):
+        layer = self.surface
+        layer.fill((0, 0, 0, 0))
+        draw_world(layer)
+
+        # "월드 위에 (color, alpha) 오버레이"를 한 장의 RGBA로 합침.
+        # 대부분은 빈 칸이므로 월드가 그려진 픽셀만 numpy로 계산하고,
+        # 빈 칸은 오버레이를 blit 해서 채움 (투명한 칸에는 그대로 복사됨)
+        rgb = pygame.surfarray.pixels3d(layer)
+        a = pygame.surfarray.pixels_alpha(layer)
+        drawn = a.nonzero()
+        # 투명한 바탕 위에 그린 픽셀에는 알파가 곱해지지 않은 원래 색이 들어 있음
+        src_rgb = rgb[drawn].astype(np.float32)
+        src_a = a[drawn].astype(np.float32) / 255
+        del rgb, a
+
+        layer.blit(self.overlay(color, alpha), (0, 0))
+
+        o = alpha / 255
+        out_a = 1 - (1 - o) * (1 - src_a)
+        rgb = pygame.surfarray.pixels3d(layer)
+        a = pygame.surfarray.pixels_alpha(layer)
+        rgb[drawn] = ((1 - o) * src_rgb * src_a[:, None] + o * np.array(color, np.float32)) / out_a[:, None]
+        a[drawn] = np.rint(out_a * 255)
+        del rgb, a
+
+    def draw(self, surface):
+        return surface.blit(self.surface, (0, 0))
+
+# === [공간 해시 클래스] ===
+# 화면을 균일한 격자 칸으로 나누고, 각 칸에 걸친 스프라이트만 기록합니다.
+# 충돌 검사 시 근처 칸만 조회하므로 적이 많아져도 O(n^2) 루프가 생기지 않습니다.
+class SpatialHash:
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.sprite_cells = {}
+        self.order = {}         # 스프라이트 -> 그룹 순서 (rebuild에 넘긴 순서, 이후 추가는 뒤로)
+        self.next_order = 0
+
+    def cell_keys(self, rect):
+        cs = self.cell_size
+        x, y, w, h = rect
+        x0 = x // cs
+        x1 = (x + w - 1) // cs
+        y0 = y // cs
+        y1 = (y + h - 1) // cs
+        if x1 <= x0 and y1 <= y0:
+            return [(x0, y0)]
+        return [(cx, cy) for cx in range(x0, max(x0, x1) + 1) for cy in range(y0, max(y0, y1) + 1)]
+
+    def insert(self, sprite):
+        keys = self.cell_keys(sprite.rect)
+        for key in keys:
+            self.cells.setdefault(key, []).append(sprite)
+        self.sprite_cells[sprite] = keys
+        self.order[sprite] = self.next_order
+        self.next_order += 1
+
+    def remove(self, sprite):
+        self.unlink(sprite)
+        self.order.pop(sprite, None)
+
+    def unlink(self, sprite):
+        keys = self.sprite_cells.pop(sprite, None)
+        if keys is None: return
+        for key in keys:
+            cell = self.cells[key]
+            cell.remove(sprite)
+            if not cell:
+                del self.cells[key]
+
+    def move(self, sprite):
+        # 차지하는 칸이 바뀐 경우에만 다시 등록 (증분 갱신, 그룹 순서는 그대로)
+        keys = self.cell_keys(sprite.rect)
+        if keys != self.sprite_cells.get(sprite):
+            self.unlink(sprite)
+            for key in keys:
+                self.cells.setdefault(key, []).append(sprite)
+            self.sprite_cells[sprite] = keys
+
+    def rebuild(self, sprites):
+        self.cells.clear()
+        self.sprite_cells.clear()
+        self.order.clear()
+        self.next_order = 0
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def query(self, rect):
+        # 중복 없이, 항상 같은 순서로 돌려주기 위해 dict 사용
+        keys = self.cell_keys(rect)
+        if len(keys) == 1:
+            cell = self.cells.get(keys[0])
+            return dict.fromkeys(cell) if cell else {}
+        cells = self.cells
+        return dict.fromkeys(itertools.chain.from_iterable(cells[key] for key in keys if key in cells))
+
+    def first_hit(self, rect):
+        # rect와 겹치는 스프라이트 중 그룹 순서가 가장 앞인 것 (groupcollide/spritecollide와 같은 선택)
+        # 칸 안의 순서는 move()로 바뀌므로 칸 순서가 아니라 order로 고름
+        cells = self.cells
+        order = self.order
+        best = None
+        for key in self.cell_keys(rect):
+            cell = cells.get(key)
+            if cell:
+                for sprite in cell:
+                    if rect.colliderect(sprite.rect) and (best is None or order[sprite] < order[best]):
+                        best = sprite
+        return best
+
+# === [정적 발판 색인] ===
+# 발판은 움직이지 않으므로 레벨을 불러올 때 한 번만 만듭니다. x 구간(열)마다 걸친 발판을
+# 윗면 y 순으로 정렬해 두고, 엔티티 아래 열에서 세로로 겹칠 수 있는 구간만 이분 탐색으로 꺼냅니다.
+# 발판이 수백 개여도 엔티티 하나가 보는 발판 수는 늘어나지 않습니다.
+class PlatformIndex:
+    def __init__(self, platforms, column_width=64):
+        self.column_width = column_width
+        self.platforms = list(platforms)
+        # 윗면 y를 이만큼 위까지 보면 세로로 겹치는 발판을 놓치지 않음
+        self.max_height = max((p.rect.height for p in self.platforms), default=0)
+        columns = {}
+        for order, platform in enumerate(self.platforms):
+            x, y, w, h = platform.rect
+            for col in range(x // column_width, (x + w - 1) // column_width + 1):
+                columns.setdefault(col, []).append((y, order, platform))
+        # 열 -> (윗면 y 목록, 발판 목록), 높은 발판(윗면 y가 작은 것)부터
+        self.columns = {}
+        for col, entries in columns.items():
+            entries.sort(key=lambda entry: entry[:2])
+            self.columns[col] = ([entry[0] for entry in entries], [entry[2] for entry in entries])
+
+        self.order_of = {platform: order for order, platform in enumerate(self.platforms)}
+
+    def query(self, rect):
+        # 겹칠 수 있는 발판 후보. 착지는 먼저 나온 발판이 이기므로, 후보가 여럿이면
+        # 예전 발판 격자(SpatialHash, 같은 칸 크기)로 조회했을 때와 같은 순서로 돌려줌
+        cw = self.column_width
+        x, y, w, h = rect
+        low = y - self.max_height + 1
+        high = y + h
+        c0 = x // cw
+        c1 = (x + w - 1) // cw
+        if c1 <= c0:
+            entry = self.columns.get(c0)
+            if entry is None:
+                return ()
+            tops, column = entry
+            found = column[bisect.bisect_left(tops, low):bisect.bisect_left(tops, high)]
+        else:
+            found = {}
+            for col in range(c0, c1 + 1):
+                entry = self.columns.get(col)
+                if entry is not None:
+                    tops, column = entry
+                    for platform in column[bisect.bisect_left(tops, low):bisect.bisect_left(tops, high)]:
+                        found[platform] = None
+        if len(found) <= 1:
+            return found
+        # 격자는 칸을 x, y 순으로 훑고 칸 안에서는 등록(파일) 순서이므로, 엔티티가 걸친 칸 중
+        # 발판을 처음 만나는 칸과 파일 순서로 정렬하면 같은 순서가 됨
+        row = y // cw
+        order_of = self.order_of
+        return sorted(found, key=lambda p: (max(c0, p.rect.x // cw), max(row, p.rect.y // cw), order_of[p]))
+
+# === [오브젝트 풀 클래스] ===
+# 총알/적/아이템은 짧은 시간에 계속 생겼다 사라지므로, kill()된 객체를
+# 버리지 않고 모아뒀다가 acquire()에서 reset()으로 다시 초기화해 씁니다.
+class EntityPool:
+    def __init__(self, name, cls):
+        self.name = name
+        self.cls = cls
+        self.free = []
+        self.active = 0
+        self.allocs = 0      # 새로 만든 객체 수
+        self.acquires = 0    # acquire 호출 수 (재사용 포함)
+
+    def acquire(self, *args):
+        self.acquires += 1
+        self.active += 1
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+        else:
+            self.allocs += 1
+            obj = self.cls(*args)
+        obj.pool = self
+        # 같은 객체를 다시 꺼내도 다른 엔티티로 구별할 수 있도록 (netplay의 엔티티 id)
+        obj.serial = self.acquires
+        return obj
+
+    def release(self, obj):
+        obj.pool = None
+        self.active -= 1
+        self.free.append(obj)
+
+    def stats(self, seconds=None):
+        line = f"{self.name} pool: {self.active} active / {len(self.free)} free, {self.allocs} allocs / {self.acquires} acquires"
+        if seconds:
+            line += f" ({self.allocs / seconds:.2f} allocs/s)"
+        return line
+
+# 풀에서 꺼낸 스프라이트는 kill() 될 때 자동으로 풀에 반납됨
+class PooledSprite(pygame.sprite.Sprite):
+    pool = None
+    serial = 0      # 풀에서 꺼낸 순번 (EntityPool.acquire)
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
+
+# 같은 크기/색의 단색 이미지는 한 장만 만들어 공유
+solid_images = {}
+
+def solid_image(size, color):
+    key = (size, color)
+    image = solid_images.get(key)
+    if image is None:
+        image = pygame.Surface(size)
+        image.fill(color)
+        solid_images[key] = image
+    return image
+
+class Item(PooledSprite):
+    render_layer = LAYER_ITEMS
+
+    def __init__(self, x, y, item_type):
+        super().__init__()
+        self.reset(x, y, item_type)
+
+    def reset(self, x, y, item_type):
+        self.item_type = item_type 
+        # 아이콘은 스프라이트 아틀라스에 미리 구워둔 것을 같이 씀
+        self.atlas_key = ("item", item_type)
+        self.image = sprite_atlas.image(self.atlas_key)
+
+        self.rect = self.image.get_rect(center=(x, y))
+        self.prev_topleft = self.rect.topleft   # 보간 렌더링용 직전 틱 위치
+
+    def update(self):
+        self.rect.y += 2 
+        if self.rect.top > SCREEN_HEIGHT:
+            self.kill()
+
+    @staticmethod
+    def draw_heart(surface, color):
+        pygame.draw.circle(surface, color, (10, 12), 8)
+        pygame.draw.circle(surface, color, (22, 12), 8)
+        pygame.draw.polygon(surface, color, [(4, 16), (28, 16), (16, 30)])
+
+    @staticmethod
+    def draw_shoe(surface, color):
+        pygame.draw.rect(surface, color, (5, 20, 22, 7))
+        pygame.draw.rect(surface, (255, 255, 255), (5, 23, 22, 3))
+        pygame.draw.polygon(surface, color, [(7, 20), (20, 10), (27, 12), (25, 20)])
+        pygame.draw.line(surface, (255, 255, 255), (12, 17), (20, 14), 2)
+
+    @staticmethod
+    def draw_shield(surface, color):
+        pygame.draw.polygon(surface, color, [(16, 4), (26, 14), (20, 26), (12, 26), (6, 14)])
+        pygame.draw.circle(surface, (255, 255, 255, 80), (14, 12), 4)
+
+
+# === [스프라이트 아틀라스 클래스] ===
+# 플레이어/적/아이템/하트/쉴드를 매 프레임 도형으로 그리지 않고, 시작할 때 변형마다 한 번씩
+# 하나의 큰 Surface에 구워둡니다. 그릴 때는 해당 영역을 blit 한 번(여러 개면 blits 한 번)만 합니다.
+class SpriteAtlas:
+    def __init__(self, width=512, height=512):
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        # key -> (아틀라스 안의 영역, 엔티티 rect 좌상단 기준 그릴 위치 오프셋)
+        self.regions = {}
+        self.cursor_x = 0
+        self.cursor_y = 0
+        self.row_height = 0
+
+        for facing_right in (True, False):
+            for recoil in (True, False):
+                self.bake(("player", facing_right, recoil), (50, 50), (-10, 0),
+                          lambda surf, f=facing_right, r=recoil: self.paint_player(surf, f, r))
+        self.bake("shield", (112, 112), (15 - 56, 25 - 56), self.paint_shield)
+        self.bake("heart", (36, 36), (0, 0), self.paint_heart)
+        self.bake("bullet", (16, 8), (0, 0), lambda surf: surf.fill(YELLOW))
+        self.bake(("item", "speed"), (32, 32), (0, 0), lambda surf: Item.draw_shoe(surf, (80, 180, 255)))
+        self.bake(("item", "shield"), (32, 32), (0, 0), lambda surf: Item.draw_shield(surf, (255, 255, 120)))
+        self.bake(("item", "heart"), (32, 32), (0, 0), lambda surf: Item.draw_heart(surf, (255, 70, 100)))
+        for color in (RED, ORANGE, PURPLE, DARK_RED):
+            self.enemy_key(color)
+
+    def bake(self, key, size, offset, paint):
+        width, height = size
+        if self.cursor_x + width > self.surface.get_width():
+            self.cursor_x = 0
+            self.cursor_y += self.row_height
+            self.row_height = 0
+        area = pygame.Rect(self.cursor_x, self.cursor_y, width, height)
+        paint(self.surface.subsurface(area))
+        self.cursor_x += width
+        self.row_height = max(self.row_height, height)
+        self.regions[key] = (area, offset)
+
+    def enemy_key(self, color):
+        key = ("enemy", color)
+        if key not in self.regions:
+            self.bake(key, (35, 35), (0, 0), lambda surf: self.paint_enemy(surf, color))
+        return key
+
+    def entry(self, key, x, y):
+        # Surface.blits()에 그대로 넘길 수 있는 (source, dest, area) 튜플
+        area, (ox, oy) = self.regions[key]
+        return (self.surface, (x + ox, y + oy), area)
+
+    def blit(self, surface, key, x, y):
+        area, (ox, oy) = self.regions[key]
+        return surface.blit(self.surface, (x + ox, y + oy), area)
+
+    def image(self, key):
+        # 아틀라스 영역을 가리키는 subsurface (픽셀은 복사하지 않음)
+        return self.surface.subsurface(self.regions[key][0])
+
+    def paint_player(self, surf, facing_right, recoil):
+        # 원래 Player.draw_custom과 같은 도형 (몸통 rect 좌상단 = (10, 0))
+        body = pygame.Rect(10, 0, 30, 50)
+        pygame.draw.rect(surf, BLUE, body)
+        eye_x_offset = 15 if facing_right else 5
+        pygame.draw.rect(surf, WHITE, (body.x + eye_x_offset, body.y + 10, 10, 10))
+        pygame.draw.rect(surf, RED, (body.x, body.y + 5, 30, 5))
+        gun_x = body.right if facing_right else body.left - 15
+        if recoil:
+            gun_x -= 5 if facing_right else -5
+        pygame.draw.rect(surf, GREY, (gun_x - (5 if facing_right else -5), body.centery, 15, 8))
+
+    def paint_shield(self, surf):
+        pygame.draw.circle(surf, (100, 200, 255, 100), (56, 56), 55, width=3)
+
+    def paint_enemy(self, surf, color):
+        pygame.draw.rect(surf, color, (0, 0, 35, 35))
+        pygame.draw.rect(surf, BLACK, (5, 10, 8, 8))
+        pygame.draw.rect(surf, BLACK, (35 - 13, 10, 8, 8))
+        pygame.draw.line(surf, BLACK, (2, 8), (15, 15), 3)
+        pygame.draw.line(surf, BLACK, (35 - 2, 8), (35 - 15, 15), 3)
+
+    def paint_heart(self, surf):
+        pygame.draw.circle(surf, RED, (10, 10), 10)
+        pygame.draw.circle(surf, RED, (25, 10), 10)
+        pygame.draw.polygon(surf, RED, [(0, 15), (35, 15), (17, 35)])
+
+sprite_atlas = SpriteAtlas()
+
+# === [레이어 렌더 큐] ===
+# 엔티티는 정해진 레이어(render_layer)에 아틀라스 키와 위치만 넣고,
+# submit()이 레이어 순서대로 레이어마다 Surface.blits() 한 번으로 그립니다.
+# 화면 흔들림 오프셋은 넣을 때가 아니라 제출할 때 한 번에 더합니다.
+# (배경 = 별 + 발판 정적 레이어, 파티클, HUD는 각자 전용 경로로 큐 앞뒤에 그림)
+
+class RenderQueue:
+    def __init__(self, atlas, layer_count=4):
+        self.atlas = atlas
+        self.layers = [[] for _ in range(layer_count)]
+
+    def add(self, layer, key, x, y):
+        self.layers[layer].append(self.atlas.entry(key, x, y))
+
+    def add_sprites(self, sprites, alpha=None):
+        # 스프라이트마다 자기 render_layer / atlas_key로 넣음 (alpha가 있으면 보간 위치)
+        layers = self.layers
+        source = self.atlas.surface
+        regions = self.atlas.regions
+        for sprite in sprites:
+            x, y = sprite.rect.topleft
+            if alpha is not None:
+                dx, dy = interp_offset(sprite, alpha)
+                x += dx
+                y += dy
+            area, (ox, oy) = regions[sprite.atlas_key]
+            layers[sprite.render_layer].append((source, (x + ox, y + oy), area))
+
+    def submit(self, surface, shake_x=0, shake_y=0):
+        # 큐를 비우면서 그리고, 그린 영역(Rect) 목록을 돌려줌
+        rects = []
+        for layer in self.layers:
+            if not layer:
+                continue
+            if shake_x or shake_y:
+                layer = [(source, (x + shake_x, y + shake_y), area) for source, (x, y), area in layer]
+            rects += surface.blits(layer)
+        for layer in self.layers:
+            layer.clear()
+        return rects
+
+render_queue = RenderQueue(sprite_atlas)
+
+
+class Player(pygame.sprite.Sprite):
+    render_layer = LAYER_PLAYER
+
+    def __init__(self, x, y):
+        super().__init__()
+        self.image = pygame.Surface((30, 50)) 
+        self.image.fill(BLUE)
+        self.rect = self.image.get_rect()
+        self.rect.topleft = (x, y)
+        self.prev_topleft = self.rect.topleft   # 보간 렌더링용 직전 틱 위치
+        
+        self.vel_y = 0
+        self.on_ground = False
+        self.facing_right = True 
+        self.recoil_timer = 0
+        self.invincible = False      # 끝나는 시점은 월드의 "invincible" 타이머
+        self.visible = True          
+
+        self.speed_buff = False      # 끝나는 시점은 월드의 "speed_buff" 타이머
+        self.shield = False       
+        self.index = 0               # 월드 안 플레이어 번호 (협동 모드에서 타이머 이름에 씀)
+
+    def update(self, platform_grid, inputs):
+        current_speed = PLAYER_SPEED
+        if self.speed_buff:
+            current_speed = PLAYER_SPEED * 1.5 
+
+        dx = 0
+        if inputs & INPUT_LEFT:
+            dx = -current_speed
+            self.facing_right = False
+        if inputs & INPUT_RIGHT:
+            dx = current_speed
+            self.facing_right = True
+        
+        if inputs & INPUT_JUMP and self.on_ground:
+            self.vel_y = -JUMP_FORCE
+            self.on_ground = False
+
+        self.vel_y += GRAVITY
+        
+        self.rect.x += dx
+        if self.rect.left < 0: self.rect.left = 0
+        if self.rect.right > SCREEN_WIDTH: self.rect.right = SCREEN_WIDTH
+
+        self.rect.y += self.vel_y
+
+        self.on_ground = False
+        for platform in platform_grid.query(self.rect):
+            if self.rect.colliderect(platform.rect):
+                if self.vel_y > 0 and self.rect.bottom < platform.rect.bottom + self.vel_y:
+                    self.rect.bottom = platform.rect.top
+                    self.vel_y = 0
+                    self.on_ground = True
+        
+        if self.recoil_timer > 0:
+            self.recoil_timer -= 1
+
+    def shoot(self):
+        self.recoil_timer = 5 
+        direction = 1 if self.facing_right else -1
+        bullet = bullet_pool.acquire(self.rect.centerx, self.rect.centery, direction)
+        return bullet
+    
+    def get_hit(self, timers):
+        if self.shield:
+            self.shield = False
+            self.invincible = True
+            timers.schedule(("invincible", self.index), 60)
+            return False 
+
+        if not self.invincible:
+            self.invincible = True
+            timers.schedule(("invincible", self.index), 120)
+            return True 
+        return False 
+
+    def queue_draw(self, queue, x, y):
+        # 깜빡이는 동안 안 보이는 틱에는 넣지 않음, 보호막은 몸 위에 겹침
+        if not self.visible: return
+
+        queue.add(LAYER_PLAYER, ("player", self.facing_right, self.recoil_timer > 0), x, y)
+        if self.shield:
+            queue.add(LAYER_PLAYER, "shield", x, y)
+
+
+class Platform(pygame.sprite.Sprite):
+    def __init__(self, x, y, width, height, color=GREY):
+        super().__init__()
+        self.image = pygame.Surface((width, height))
+        self.image.fill(color)
+        pygame.draw.rect(self.image, (200, 200, 200), (0, 0, width, 4)) 
+        self.rect = self.image.get_rect()
+        self.rect.topleft = (x, y)
+
+class Bullet(PooledSprite):
+    render_layer = LAYER_BULLETS
+    atlas_key = "bullet"
+
+    def __init__(self, x, y, direction):
+        super().__init__()
+        self.reset(x, y, direction)
+
+    def reset(self, x, y, direction):
+        self.image = sprite_atlas.image(self.atlas_key)
+        self.rect = self.image.get_rect()
+        self.rect.center = (x, y)
+        self.prev_topleft = self.rect.topleft   # 보간 렌더링용 직전 틱 위치
+        self.speed = BULLET_SPEED * direction
+
+    def update(self):
+        self.rect.x += self.speed
+        if self.rect.right < 0 or self.rect.left > SCREEN_WIDTH:
+            self.kill()
+
+class Enemy(PooledSprite):
+    render_layer = LAYER_ENEMIES
+
+    def __init__(self, x, y, player, speed, color):
+        super().__init__()
+        self.reset(x, y, player, speed, color)
+
+    def reset(self, x, y, player, speed, color):
+        self.image = solid_image((35, 35), color)
+        self.color = color 
+        self.rect = self.image.get_rect()
+        self.rect.topleft = (x, y)
+        self.prev_topleft = self.rect.topleft   # 보간 렌더링용 직전 틱 위치
+        self.player = player
+        self.speed = speed 
+        self.vel_y = 0
+        self.atlas_key = sprite_atlas.enemy_key(color)
+    
+    def update(self, platform_grid, enemy_grid):
+        dist_x = self.player.rect.centerx - self.rect.centerx
+        dist_y = self.player.rect.centery - self.rect.centery
+
+        if abs(dist_x) > 5:
+            if dist_x > 0: self.rect.x += self.speed 
+            else: self.rect.x -= self.speed
+        elif abs(dist_y) > 50:
+            if self.rect.centerx < SCREEN_WIDTH // 2:
+                self.rect.x += self.speed
+            else:
+                self.rect.x -= self.speed
+        
+        self.vel_y += GRAVITY
+        self.rect.y += self.vel_y
+        
+        for platform in platform_grid.query(self.rect):
+            if self.rect.colliderect(platform.rect):
+                if self.vel_y > 0:
+                    self.rect.bottom = platform.rect.top
+                    self.vel_y = 0
+
+        # 화면 옆으로 밀려나 떨어진 적은 다시 올라올 수 없으므로 제거
+        if self.rect.top > SCREEN_HEIGHT:
+            enemy_grid.remove(self)
+            self.kill()
+            return
+
+        self.separate(enemy_grid)
+
+    def separate(self, enemy_grid):
+        # 앞 순서의 적은 이번 틱 위치, 뒤 순서의 적은 지난 틱 위치와 비교하므로 순서대로 처리해야 함
+        # 밀어내기로 옆 칸까지 움직일 수 있으므로 좌우로 조금 넓혀서 조회
+        nearby = enemy_grid.query(self.rect.inflate(int(self.speed * 4), 0))
+        for other in nearby:
+            if other != self:
+                if self.rect.colliderect(other.rect):
+                    if self.rect.centerx < other.rect.centerx:
+                        self.rect.x -= self.speed
+                    else:
+                        self.rect.x += self.speed
+        enemy_grid.move(self)
+
+
+bullet_pool = EntityPool("bullet", Bullet)
+enemy_pool = EntityPool("enemy", Enemy)
+item_pool = EntityPool("item", Item)
+ENTITY_POOLS = (bullet_pool, enemy_pool, item_pool)
+
+def pool_stats(seconds=None):
+    return "\n".join(pool.stats(seconds) for pool in ENTITY_POOLS)
+
+
+# === [레벨] ===
+# 발판 배치는 levels.txt에서 읽습니다 (형식은 파일 맨 위 주석 참고).
+# 레벨마다 발판 스프라이트와 PlatformIndex를 불러올 때 한 번만 만들어 모든 판이 같이 씁니다.
+LEVELS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels.txt")
+LEVEL_COLORS = {"grey": GREY, "green": GREEN, "red": RED, "blue": BLUE, "yellow": YELLOW,
+                "gold": GOLD, "orange": ORANGE, "purple": PURPLE}
+
+class Level:
+    def __init__(self, name, first_stage, last_stage, specs):
+        self.name = name
+        self.first_stage = first_stage
+        self.last_stage = last_stage    # None이면 끝까지
+        self.specs = specs              # (x, y, 너비, 높이, 색)
+        self.platforms = [Platform(*spec) for spec in specs]
+        self.index = PlatformIndex(self.platforms)
+
+    def covers(self, stage):
+        return self.first_stage <= stage and (self.last_stage is None or stage <= self.last_stage)
+
+def parse_color(text):
+    if text in LEVEL_COLORS:
+        return LEVEL_COLORS[text]
+    color = tuple(int(v) for v in text.split(","))
+    if len(color) != 3 or not all(0 <= v <= 255 for v in color):
+        raise ValueError(f"bad color {text!r}")
+    return color
+
+def parse_levels(path):
+    levels = []
+    with open(path) as f:
+        for lineno, line in enumerate(f, 1):
+            fields = line.split("#", 1)[0].split()
+            if not fields:
+                continue
+            try:
+                if fields[0] == "level":
+                    if len(fields) != 3:
+                        raise ValueError("expected 'level <name> <stages>'")
+                    name, stages = fields[1], fields[2]
+                    first, dash, last = stages.partition("-")
+                    first = int(first)
+                    last = (int(last) if last else None) if dash else first
+                    levels.append((name, first, last, []))
+                else:
+                    if not levels:
+                        raise ValueError("platform before the first 'level' line")
+                    if len(fields) not in (4, 5):
+                        raise ValueError("expected 'x y width height [color]'")
+                    x, y, w, h = (int(v) for v in fields[:4])
+                    if w <= 0 or h <= 0:
+                        raise ValueError("platform size must be positive")
+                    color = parse_color(fields[4]) if len(fields) > 4 else GREY
+                    levels[-1][3].append((x, y, w, h, color))
+            except ValueError as e:
+                raise ValueError(f"{path}:{lineno}: {e}") from None
+    levels = [Level(*level) for level in levels]
+    if not any(level.covers(1) for level in levels):
+        raise ValueError(f"{path}: no level for stage 1")
+    return levels
+
+class LevelSet:
+    def __init__(self, path=LEVELS_PATH):
+        self.path = path
+        self.levels = None      # 처음 쓸 때 불러옴
+
+    def choose(self, stage, seed=None):
+        # 스테이지를 맡는 레벨 중 하나 (없으면 그 아래 스테이지 중 가장 가까운 것의 레벨).
+        # world.rng를 건드리지 않도록 (seed, 스테이지)로 따로 골라서, 같은 판이면 항상 같은 레벨
+        if self.levels is None:
+            self.levels = parse_levels(self.path)
+        for stage in range(stage, 0, -1):
+            candidates = [level for level in self.levels if level.covers(stage)]
+            if candidates:
+                break
+        if len(candidates) == 1:
+            return candidates[0]
+        return random.Random(f"{seed}:{stage}").choice(candidates)
+
+default_levels = LevelSet()
+
+
+def init_game(previous_sprites=None, level=None):
+    # 이전 판의 총알/적/아이템은 kill()로 풀에 돌려보내고 다시 씀
+    if previous_sprites is not None:
+        for sprite in list(previous_sprites):
+            sprite.kill()
+    if level is None:
+        level = default_levels.choose(1)
+
+    all_sprites = pygame.sprite.Group()
+    bullets = pygame.sprite.Group()
+    enemies = pygame.sprite.Group()
+    items = pygame.sprite.Group() 
+
+    # 발판 스프라이트는 레벨이 갖고 있고 여러 판/월드가 같이 쓰므로 all_sprites(새 판마다 kill)에는 넣지 않음
+    platforms = pygame.sprite.Group(level.platforms)
+    platform_grid = level.index
+    enemy_grid = SpatialHash()
+
+    player = Player(SCREEN_WIDTH // 2, 200)
+    all_sprites.add(player)
+
+    return player, all_sprites, platforms, bullets, enemies, items, platform_grid, enemy_grid
+
+def collide_bullets_enemies(bullets, enemy_grid):
+    # groupcollide(enemies, bullets, True, True) 대체: 총알 근처 칸의 적만 검사
+    # 총알 하나는 적 하나만 맞힌다 (기존 동작과 동일)
+    hits = {}
+    if not enemy_grid.cells:
+        return hits
+    for bullet in list(bullets):
+        enemy = enemy_grid.first_hit(bullet.rect)
+        if enemy is not None:
+            hits.setdefault(enemy, []).append(bullet)
+            bullet.kill()
+    # groupcollide처럼 적 그룹 순서로 (점수/파티클 생성 순서가 같도록)
+    order = enemy_grid.order
+    hits = {enemy: hits[enemy] for enemy in sorted(hits, key=order.__getitem__)}
+    for enemy in hits:
+        enemy.kill()
+        enemy_grid.remove(enemy)
+    return hits
+
+def collide_player_enemies(player, enemy_grid):
+    return enemy_grid.first_hit(player.rect) is not None
+
+def ms_to_ticks(ms):
+    # 밀리초 타이머를 시뮬레이션 틱 수로 변환 (60틱 = 1초)
+    return max(1, round(ms * FPS / 1000))
+
+# === [틱 스케줄러] ===
+# 이름 붙은 타이머를 시뮬레이션 틱 기준으로 관리합니다 (heapq, 등록/변경 O(log n)).
+# advance()는 GameWorld.step()에서만 부르므로 일시정지/메뉴 중에는 시간이 흐르지 않고,
+# 같은 틱에 만료되는 타이머는 처음 등록된 순서대로 나옵니다 (매번 같은 순서 → 결정적).
+class TickScheduler:
+    def __init__(self, names=()):
+        self.now = 0
+        self.heap = []      # (만료 틱, 순서, 이름) - 다시 잡거나 취소한 옛 항목은 꺼낼 때 버림
+        self.due = {}       # 이름 -> 만료 틱 (살아 있는 타이머만)
+        self.order = {}     # 이름 -> 같은 틱일 때의 순서
+        for name in names:
+            self.order[name] = len(self.order)
+
+    def schedule(self, name, delay):
+        # delay틱 뒤(최소 1)에 만료되도록 잡음. 이미 있으면 만료 시점만 바꿈 (생성 간격 변경 등)
+        due = self.now + max(1, delay)
+        if self.due.get(name) == due:
+            return
+        if name not in self.order:
+            self.order[name] = len(self.order)
+        self.due[name] = due
+        heapq.heappush(self.heap, (due, self.order[name], name))
+
+    def cancel(self, name):
+        self.due.pop(name, None)
+
+    def active(self, name):
+        return name in self.due
+
+    def remaining(self, name):
+        due = self.due.get(name)
+        return 0 if due is None else due - self.now
+
+    def advance(self):
+        # 1틱 진행하고 이번 틱에 만료된 타이머 이름 목록을 돌려줌
+        self.now += 1
+        fired = []
+        heap = self.heap
+        while heap and heap[0][0] <= self.now:
+            due, _, name = heapq.heappop(heap)
+            if self.due.get(name) == due:
+                del self.due[name]
+                fired.append(name)
+        return fired
+
+    def clear(self):
+        self.now = 0
+        self.heap = []
+        self.due = {}
+
+    def snapshot(self):
+        # 같은 틱 순서도 저장 (협동 모드 플레이어 타이머는 처음 잡힐 때 순서가 정해짐)
+        return self.now, tuple(self.due.items()), tuple(self.order.items())
+
+    def restore(self, state):
+        self.now, entries, order = state
+        self.order = dict(order)
+        self.due = dict(entries)
+        self.heap = [(due, self.order[name], name) for name, due in entries]
+        heapq.heapify(self.heap)
+
+def interp_offset(sprite, alpha):
+    # 직전 틱 위치와 현재 위치 사이를 alpha 비율로 보간했을 때의 화면 오프셋
+    px, py = sprite.prev_topleft
+    return round((px - sprite.rect.x) * (1 - alpha)), round((py - sprite.rect.y) * (1 - alpha))
+
+def stage_color(stage):
+    spawn_color = RED
+    if stage == 2: spawn_color = ORANGE
+    elif stage >= 3: spawn_color = PURPLE
+    if stage >= 4: spawn_color = DARK_RED
+    return spawn_color
+
+# === [게임 월드 클래스] ===
+# 화면, 시계, 전역 random과 분리된 순수 시뮬레이션 상태입니다.
+# step(inputs)을 한 번 부를 때마다 정확히 1틱(1/60초)이 진행되며,
+# 같은 seed와 같은 입력이면 어느 기기에서든 같은 상태가 나옵니다.
+class GameWorld:
+    # snapshot()/restore()로 저장하는 값들 (스프라이트/난수 상태는 따로 저장)
+    SNAPSHOT_FIELDS = (
+        "seed", "tick", "score", "player_lives", "game_over", "current_stage", "kill_count",
+        "kill_goal", "enemy_spawn_time", "current_enemy_speed", "screen_shake",
+    )
+    PLAYER_FIELDS = (
+        "prev_topleft", "vel_y", "on_ground", "facing_right", "recoil_timer", "invincible",
+        "visible", "speed_buff", "shield",
+    )
+    # 틱 타이머 이름 (같은 틱에 만료되면 이 순서로 처리, 플레이어 타이머는 (종류, 플레이어 번호))
+    TIMERS = ("enemy_spawn", "item_spawn", ("invincible", 0), ("speed_buff", 0), "stage_text")
+
+    def __init__(self, seed=None, tuning=None, levels=None):
+        self.tuning = {**DEFAULT_TUNING, **(tuning or {})}
+        self.levels = levels or default_levels
+        self.particles = ParticleSystem()
+        self.recorder = None    # 리플레이 녹화기 (ReplayRecorder)
+        self.timings = None     # dict를 넣으면 step()이 단계별 소요 시간(초)을 기록
+        self.effects = True     # False면 파티클을 만들지 않음 (화면 없이 돌리는 봇용, 게임 결과는 같음)
+        self.timers = TickScheduler(self.TIMERS)
+        self.timer_handlers = {
+            "enemy_spawn": self.on_enemy_spawn,
+            "item_spawn": self.on_item_spawn,
+            "stage_text": lambda: None,     # 배너는 타이머가 살아 있는 동안만 그림
+        }
+        self.player_timer_handlers = {
+            "invincible": self.on_invincible_end,
+            "speed_buff": self.on_speed_buff_end,
+        }
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.particles.rng = np.random.default_rng(seed)
+        self.particles.clear()
+
+        self.level = self.levels.choose(1, seed)
+        (self.player, self.all_sprites, self.platforms, self.bullets,
+         self.enemies, self.items, self.platform_grid, self.enemy_grid) = init_game(getattr(self, "all_sprites", None), self.level)
+        self.players = [self.player]
+
+        self.tick = 0
+        self.score = 0
+        self.player_lives = 3
+        self.game_over = False
+
+        self.current_stage = 1
+        self.kill_count = 0
+        tuning = self.tuning
+        self.kill_goal = tuning["kill_goal"]
+        self.enemy_spawn_time = tuning["spawn_time"]
+        self.current_enemy_speed = tuning["enemy_speed"]
+        self.screen_shake = 0
+
+        # pygame.time.set_timer 대신 틱 단위 타이머
+        self.timers.clear()
+        self.timers.schedule("enemy_spawn", ms_to_ticks(self.enemy_spawn_time))
+        self.timers.schedule("item_spawn", ms_to_ticks(tuning["item_time"]))
+        self.timers.schedule("stage_text", 120)
+        self.events = []
+
+    @property
+    def elapsed_seconds(self):
+        return self.tick / FPS
+
+    def change_level(self, stage):
+        # 스테이지를 맡는 레벨이 지금과 다르면 발판만 바꿈 (적/아이템은 그대로 떨어지며 새 발판에 착지)
+        level = self.levels.choose(stage, self.seed)
+        if level is self.level:
+            return
+        self.level = level
+        self.platforms = pygame.sprite.Group(level.platforms)
+        self.platform_grid = level.index
+
+    def add_player(self):
+        # 협동 모드용 플레이어 추가 (step()에 플레이어 순서대로 입력 목록을 넘김)
+        player = Player(SCREEN_WIDTH // 2 + 80 * len(self.players), 200)
+        player.index = len(self.players)
+        self.all_sprites.add(player)
+        self.players.append(player)
+        return player
+
+    def spawn_enemy(self):
+        spawn_x = self.rng.randint(0, SCREEN_WIDTH)
+        target = self.player
+        if len(self.players) > 1:
+            # 생성 위치에서 가로로 가장 가까운 플레이어를 쫓음 (난수를 쓰지 않아 혼자일 때와 결과가 같음)
+            target = min(self.players, key=lambda p: abs(p.rect.centerx - spawn_x))
+        enemy = enemy_pool.acquire(spawn_x, -50, target, self.current_enemy_speed, stage_color(self.current_stage))
+        self.all_sprites.add(enemy)
+        self.enemies.add(enemy)
+
+    def spawn_item(self):
+        ix = self.rng.randint(50, SCREEN_WIDTH - 50)
+        item_type = self.rng.choice(["speed", "shield", "heart"])
+        new_item = item_pool.acquire(ix, -30, item_type)
+        self.all_sprites.add(new_item)
+        self.items.add(new_item)
+
+    def on_enemy_spawn(self):
+        self.timers.schedule("enemy_spawn", ms_to_ticks(self.enemy_spawn_time))
+        self.spawn_enemy()
+
+    def on_item_spawn(self):
+        self.timers.schedule("item_spawn", ms_to_ticks(self.tuning["item_time"]))
+        self.spawn_item()
+
+    def on_invincible_end(self, player):
+        player.invincible = False
+        player.visible = True
+
+    def on_speed_buff_end(self, player):
+        player.speed_buff = False
+
+    def step(self, inputs):
+        # inputs: 입력 비트마스크 (협동 모드면 플레이어 순서대로 비트마스크 목록)
+        # 이번 틱에 일어난 일 ("shoot", "kill", "stage_up", "hit", "game_over")
+        self.events = []
+        if self.game_over:
+            return self.events
+        self.tick += 1
+        players = self.players
+        player_inputs = inputs if isinstance(inputs, (list, tuple)) else (inputs,)
+        timings = self.timings
+        if timings is not None:
+            update_start = time.perf_counter()
+
+        for sprite in self.all_sprites:
+            sprite.prev_topleft = sprite.rect.topleft
+
+        if self.screen_shake > 0:
+            self.screen_shake -= 1
+
+        for player, bits in zip(players, player_inputs):
+            if bits & INPUT_SHOOT:
+                bullet = player.shoot()
+                self.all_sprites.add(bullet)
+                self.bullets.add(bullet)
+                self.screen_shake = 2
+                self.events.append("shoot")
+
+        for name in self.timers.advance():
+            if isinstance(name, tuple):
+                kind, index = name
+                self.player_timer_handlers[kind](players[index])
+            else:
+                self.timer_handlers[name]()
+        if timings is not None:
+            player_start = time.perf_counter()
+        for player, bits in zip(players, player_inputs):
+            if player.invincible:
+                # 무적 중에는 5틱마다 깜빡임
+                player.visible = self.timers.remaining(("invincible", player.index)) % 10 >= 5
+            player.update(self.platform_grid, bits)
+
+        if timings is not None:
+            bullets_start = time.perf_counter()
+        self.bullets.update()
+        if timings is not None:
+            enemies_start = time.perf_counter()
+        self.enemy_grid.rebuild(self.enemies)
+        self.enemies.update(self.platform_grid, self.enemy_grid)
+        self.items.update()
+        if timings is not None:
+            particles_start = time.perf_counter()
+        self.particles.update()
+
+        if timings is not None:
+            collision_start = time.perf_counter()
+            timings["update"] = collision_start - update_start
+            timings["timers"] = player_start - update_start        # 발사, 생성/버프 타이머
+            timings["player"] = bullets_start - player_start
+            timings["bullets"] = enemies_start - bullets_start
+            timings["enemies"] = particles_start - enemies_start   # 적 (+아이템)
+            timings["particles"] = collision_start - particles_start
+
+        for player in players:
+            for item in pygame.sprite.spritecollide(player, self.items, True):
+                if item.item_type == "speed":
+                    # 주운 다음 틱부터 5초(300틱) 동안 적용 → 301틱째 시작에 만료
+                    player.speed_buff = True
+                    self.timers.schedule(("speed_buff", player.index), FPS * 5 + 1)
+                elif item.item_type == "shield":
+                    player.shield = True
+                elif item.item_type == "heart":
+                    if self.player_lives < 3:
+                        self.player_lives += 1
+
+        hits = collide_bullets_enemies(self.bullets, self.enemy_grid)
+        for enemy, bullet_list in hits.items():
+            self.score += 100
+            self.screen_shake = 10
+            self.events.append("kill")
+            # 스테이지 진행 로직
+            self.kill_count += 1
+            if self.kill_count >= self.kill_goal:
+                self.current_stage += 1
+                self.kill_count = 0
+
+                tuning = self.tuning
+                self.current_enemy_speed += tuning["speed_step"]
+                self.enemy_spawn_time = max(tuning["spawn_min"], self.enemy_spawn_time - tuning["spawn_step"])
+                self.timers.schedule("enemy_spawn", ms_to_ticks(self.enemy_spawn_time))
+
+                self.timers.schedule("stage_text", 180)
+                self.change_level(self.current_stage)
+                self.events.append("stage_up")
+
+            if self.effects:
+                self.particles.emit(enemy.rect.centerx, enemy.rect.centery, enemy.color, 10)
+
+        # 협동 모드에서는 목숨을 같이 씀
+        for player in players:
+            if collide_player_enemies(player, self.enemy_grid) and player.get_hit(self.timers):
+                self.player_lives -= 1
+                self.screen_shake = 30
+                self.events.append("hit")
+
+                if self.effects:
+                    self.particles.emit(player.rect.centerx, player.rect.centery, BLUE, 20)
+
+                if self.player_lives <= 0 and not self.game_over:
+                    self.game_over = True
+                    self.events.append("game_over")
+
+        if timings is not None:
+            timings["collision"] = time.perf_counter() - collision_start
+
+        if self.recorder is not None:
+            self.recorder.record(inputs, self)
+
+        return self.events
+
+    def snapshot(self):
+        # 리플레이 키프레임용: 이 틱의 시뮬레이션 상태 전체를 보관
+        return {
+            "fields": tuple(getattr(self, name) for name in self.SNAPSHOT_FIELDS),
+            "rng": self.rng_state(),
+            "timers": self.timers.snapshot(),
+            "particles": self.particles.snapshot(),
+            "players": [(tuple(p.rect), tuple(getattr(p, name) for name in self.PLAYER_FIELDS)) for p in self.players],
+            "bullets": [(tuple(b.rect), b.prev_topleft, b.speed) for b in self.bullets],
+            "enemies": [(tuple(e.rect), e.prev_topleft, e.speed, e.color, e.vel_y, e.player.index) for e in self.enemies],
+            "items": [(tuple(i.rect), i.prev_topleft, i.item_type) for i in self.items],
+        }
+
+    def rng_state(self):
+        # 메르센 트위스터 상태 625개 정수를 uint32 배열로: 키프레임 크기의 대부분이라 repr보다 훨씬 작게 저장됨
+        version, internal, gauss = self.rng.getstate()
+        return version, np.array(internal, dtype=np.uint32), gauss
+
+    def restore(self, state):
+        for name, value in zip(self.SNAPSHOT_FIELDS, state["fields"]):
+            setattr(self, name, value)
+        version, internal, gauss = state["rng"]
+        self.rng.setstate((version, tuple(int(word) for word in internal), gauss))
+        self.timers.restore(state["timers"])
+        self.particles.restore(state["particles"])
+        self.change_level(self.current_stage)
+        self.events = []
+
+        # 협동 모드: 저장할 때와 플레이어 수를 맞춤
+        saved_players = state["players"]
+        while len(self.players) < len(saved_players):
+            self.add_player()
+        for player in self.players[len(saved_players):]:
+            player.kill()
+        del self.players[len(saved_players):]
+        for player, (rect, values) in zip(self.players, saved_players):
+            player.rect = pygame.Rect(rect)
+            for name, value in zip(self.PLAYER_FIELDS, values):
+                setattr(player, name, value)
+
+        # 지금 있는 총알/적/아이템은 풀로 돌려보내고 저장된 것으로 다시 채움
+        for group in (self.bullets, self.enemies, self.items):
+            for sprite in list(group):
+                sprite.kill()
+        for rect, prev_topleft, speed in state["bullets"]:
+            bullet = bullet_pool.acquire(0, 0, 1)
+            bullet.speed = speed
+            self.add_restored(bullet, self.bullets, rect, prev_topleft)
+        for rect, prev_topleft, speed, color, vel_y, target in state["enemies"]:
+            enemy = enemy_pool.acquire(0, 0, self.players[target], speed, color)
+            enemy.vel_y = vel_y
+            self.add_restored(enemy, self.enemies, rect, prev_topleft)
+        for rect, prev_topleft, item_type in state["items"]:
+            item = item_pool.acquire(0, 0, item_type)
+            self.add_restored(item, self.items, rect, prev_topleft)
+        self.enemy_grid.rebuild(self.enemies)
+
+    def add_restored(self, sprite, group, rect, prev_topleft):
+        sprite.rect.topleft = rect[:2]
+        sprite.prev_topleft = prev_topleft
+        self.all_sprites.add(sprite)
+        group.add(sprite)
+
+    def state_digest(self):
+        # 기기 간 결정성 확인용 상태 요약 해시
+        state = (
+            self.tick, self.score, self.player_lives, self.current_stage, self.kill_count,
+            tuple(self.player.rect), self.player.vel_y,
+            [(tuple(e.rect), e.vel_y) for e in self.enemies],
+            [tuple(b.rect) for b in self.bullets],
+            [(i.item_type, tuple(i.rect)) for i in self.items],
+        )
+        if len(self.players) > 1:
+            # 협동 모드: 나머지 플레이어와 그 타이머, 적이 쫓는 플레이어 (혼자일 때는 해시가 예전과 같도록 붙이지 않음)
+            timers = self.timers
+            state += (
+                [(tuple(p.rect), p.vel_y, p.shield, p.speed_buff, p.invincible,
+                  timers.remaining(("invincible", p.index)), timers.remaining(("speed_buff", p.index)))
+                 for p in self.players[1:]],
+                [e.player.index for e in self.enemies],
+            )
+        h = hashlib.sha1(repr(state).encode())
+        n = self.particles.count
+        h.update(self.particles.pos[:n].tobytes())
+        return h.hexdigest()[:16]
+
+# === [자동 플레이 봇] ===
+# 헤드리스 실행/테스트용: 가장 가까운 적 쪽을 보고 쏘면서 좌우로 움직입니다.
+# 옆으로 바짝 붙은 적이나 머리 위로 떨어질 적이 있으면 먼저 반대쪽으로 물러납니다.
+BOT_BACK_OFF_X = 80     # 같은 높이의 적이 이만큼 가까우면 물러남
+BOT_DODGE_X = 50        # 머리 위 적과의 가로 거리가 이보다 가까우면 피함
+BOT_DODGE_Y = 160       # 떨어지는 중이 아니어도 이만큼 위에 있으면 곧 내려올 적으로 봄
+
+def bot_inputs(world):
+    player = world.player
+    inputs = 0
+    target = None
+    best = None
+    threat = None
+    threat_rank = None
+    for enemy in world.enemies:
+        dx = enemy.rect.centerx - player.rect.centerx
+        dy = enemy.rect.centery - player.rect.centery
+        dist = abs(dx) + abs(dy)
+        if best is None or dist < best:
+            best = dist
+            target = enemy
+        # 같은 높이의 가까운 적을 머리 위 적보다 먼저 피함
+        if abs(dy) < 40 and abs(dx) < BOT_BACK_OFF_X:
+            rank = abs(dx)
+        elif dy < 0 and abs(dx) < BOT_DODGE_X and (enemy.vel_y > 0 or dy > -BOT_DODGE_Y):
+            rank = abs(dx) + SCREEN_WIDTH
+        else:
+            continue
+        if threat is None or rank < threat_rank:
+            threat = enemy
+            threat_rank = rank
+    if threat is not None:
+        # 벽에 몰리면 적 밑을 지나서라도 넓은 쪽으로 빠져나감
+        go_left = threat.rect.centerx >= player.rect.centerx
+        if player.rect.left < 100:
+            go_left = False
+        elif player.rect.right > SCREEN_WIDTH - 100:
+            go_left = True
+        inputs |= INPUT_LEFT if go_left else INPUT_RIGHT
+    elif target is not None:
+        if target.rect.centerx < player.rect.centerx:
+            if player.facing_right or best > 200:
+                inputs |= INPUT_LEFT
+        else:
+            if not player.facing_right or best > 200:
+                inputs |= INPUT_RIGHT
+    if target is not None and world.tick % 8 == 0:
+        inputs |= INPUT_SHOOT
+    # 위쪽 발판은 적이 생기는 자리와 가까워 피할 틈이 없으므로 아래쪽에서만 점프
+    if world.tick % 90 == 0 and threat is None and player.rect.centery > SCREEN_HEIGHT // 2:
+        inputs |= INPUT_JUMP
+    return inputs
+
+def run_headless(ticks, seed=None, record_path=None):
+    # 렌더링 없이 시뮬레이션만 최대 속도로 돌림 (테스트/장시간 실행용)
+    world = GameWorld(seed)
+    games = 1
+    if record_path:
+        world.recorder = ReplayRecorder(record_path, world.seed)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        world.step(bot_inputs(world))
+        if world.game_over:
+            print(f"game {games}: seed={world.seed} score={world.score} stage={world.current_stage} time={world.elapsed_seconds:.1f}s")
+            games += 1
+            world.reset(world.rng.randrange(2 ** 32))
+            if record_path:
+                world.recorder.close()
+                world.recorder = ReplayRecorder(numbered_path(record_path, games), world.seed)
+    if world.recorder is not None:
+        world.recorder.close()
+    elapsed = time.perf_counter() - start
+    print(f"{ticks} ticks in {elapsed:.2f}s ({ticks / elapsed:.0f} ticks/s), {games} game(s)")
+    print(pool_stats(ticks / FPS))
+    print(f"state: {world.state_digest()}")
+
+# === [리플레이] ===
+# 파일 형식 (리틀 엔디언):
+#   헤더: "SPRP", 버전(u8), seed(u64), 키프레임 간격(u32, 틱)
+#   본문: 입력 비트마스크(LEFT/RIGHT/SPACE/Z/ESC)의 run-length 구간들
+#     - 1바이트: 하위 5비트 = 입력, 상위 3비트 = 길이(1~7)
+#     - 상위 3비트가 0이면 뒤에 varint 길이가 따라옴 (8틱 이상)
+#     - 길이 0인 구간은 키프레임 표시: 뒤에 그 틱의 state_digest 8바이트,
+#       varint 길이 + 그 틱의 GameWorld.snapshot()을 압축한 것 (버전 1 파일에는 해시만 있음)
+# 구간은 닫힐 때마다 바로 파일에 쓰므로 중간에 꺼져도 그때까지는 재생 가능.
+REPLAY_MAGIC = b"SPRP"
+REPLAY_VERSION = 2
+REPLAY_HEADER = struct.Struct("<4sBQI")
+REPLAY_KEYFRAME_TICKS = FPS * 60   # 키프레임 하나가 3~4KB라 1분마다: 한 시간에 ~250KB, 탐색은 최대 1분 재시뮬레이션
+REPLAY_CACHE_TICKS = FPS * 10      # 재생 중에는 10초마다 메모리에도 스냅샷을 남겨 뒤로 가기를 빠르게
+REPLAY_INPUT_MASK = 0x1F
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def pack_snapshot(state):
+    # GameWorld.snapshot()을 파일에 쓸 바이트로: numpy 값은 파이썬 값/(dtype, shape, 위치)로 바꾼 repr 뒤에
+    # 배열 원본 바이트를 이어 붙여 압축 (읽을 때 ast.literal_eval을 쓰므로 남의 리플레이 파일을 열어도 코드가 실행되지 않음)
+    blobs = []
+    def encode(value):
+        if isinstance(value, np.ndarray):
+            blobs.append(value.tobytes())
+            return ("ndarray", value.dtype.str, value.shape, len(blobs) - 1)
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, dict):
+            return {key: encode(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(encode(item) for item in value)
+        return value
+    tree = repr(encode(state)).encode()
+    out = bytearray()
+    write_varint(out, len(tree))
+    out += tree
+    for blob in blobs:
+        write_varint(out, len(blob))
+        out += blob
+    return zlib.compress(bytes(out), 6)
+
+def unpack_snapshot(data):
+    data = zlib.decompress(data)
+    size, pos = read_varint(data, 0)
+    tree = ast.literal_eval(data[pos:pos + size].decode())
+    pos += size
+    blobs = []
+    while pos < len(data):
+        size, pos = read_varint(data, pos)
+        blobs.append(data[pos:pos + size])
+        pos += size
+    def decode(value):
+        if isinstance(value, tuple) and len(value) == 4 and value[0] == "ndarray":
+            _, dtype, shape, index = value
+            return np.frombuffer(blobs[index], dtype).reshape(shape).copy()
+        if isinstance(value, dict):
+            return {key: decode(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(decode(item) for item in value)
+        return value
+    return decode(tree)
+
+def numbered_path(path, number):
+    # 두 번째 판부터는 replay-2.rpl, replay-3.rpl ... 로 저장
+    if number <= 1:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{number}{ext}"
+
+class ReplayRecorder:
+    def __init__(self, path, seed, keyframe_ticks=REPLAY_KEYFRAME_TICKS):
+        self.path = path
+        self.keyframe_ticks = keyframe_ticks
+        self.file = open(path, "wb")
+        self.file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, seed, keyframe_ticks))
+        self.run_inputs = None
+        self.run_length = 0
+        self.ticks = 0
+
+    def record(self, inputs, world):
+        inputs &= REPLAY_INPUT_MASK
+        if inputs == self.run_inputs:
+            self.run_length += 1
+        else:
+            self.flush_run()
+            self.run_inputs = inputs
+            self.run_length = 1
+        self.ticks += 1
+        if self.ticks % self.keyframe_ticks == 0:
+            self.flush_run()
+            # 해시는 재생할 때 어긋남 확인용, 스냅샷은 이 틱으로 바로 찾아가는 용도
+            state = pack_snapshot(world.snapshot())
+            out = bytearray(b"\x00\x00" + bytes.fromhex(world.state_digest()))
+            write_varint(out, len(state))
+            self.file.write(out + state)
+
+    def flush_run(self):
+        if self.run_length == 0:
+            return
+        out = bytearray()
+        if self.run_length <= 7:
+            out.append(self.run_inputs | self.run_length << 5)
+        else:
+            out.append(self.run_inputs)
+            write_varint(out, self.run_length)
+        self.file.write(out)
+        self.run_inputs = None
+        self.run_length = 0
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush_run()
+        self.file.close()
+
+class Replay:
+    def __init__(self, seed, inputs, keyframe_ticks, digests, keyframes=None):
+        self.seed = seed
+        self.inputs = inputs            # 틱별 입력 (numpy uint8 배열)
+        self.keyframe_ticks = keyframe_ticks
+        self.digests = digests          # {틱: 녹화 당시 state_digest}
+        self.keyframes = keyframes or {}    # {틱: 압축된 snapshot (pack_snapshot)}
+
+    def __len__(self):
+        return len(self.inputs)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, keyframe_ticks = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version not in (1, REPLAY_VERSION):
+            raise ValueError(f"{path}: not a replay file (version {REPLAY_VERSION})")
+
+        values = []
+        lengths = []
+        digests = {}
+        keyframes = {}
+        tick = 0
+        pos = REPLAY_HEADER.size
+        try:
+            while pos < len(data):
+                byte = data[pos]
+                pos += 1
+                length = byte >> 5
+                if length == 0:
+                    length, pos = read_varint(data, pos)
+                if length == 0:
+                    if pos + 8 > len(data):
+                        break
+                    digest = data[pos:pos + 8].hex()
+                    pos += 8
+                    if version >= 2:
+                        size, pos = read_varint(data, pos)
+                        if pos + size > len(data):
+                            break
+                        keyframes[tick] = data[pos:pos + size]
+                        pos += size
+                    digests[tick] = digest
+                    continue
+                values.append(byte & REPLAY_INPUT_MASK)
+                lengths.append(length)
+                tick += length
+        except IndexError:
+            pass    # 녹화 중에 끊긴 파일: 마지막 온전한 구간까지만 사용
+        inputs = np.repeat(np.array(values, np.uint8), lengths)
+        return cls(seed, inputs, keyframe_ticks, digests, keyframes)
+
+class ReplayPlayer:
+    # 녹화된 입력으로 월드를 다시 돌림. 파일에 키프레임 간격마다 월드 상태가 들어 있으므로
+    # 어느 틱이든 (가장 가까운 앞쪽 키프레임 복원 + 최대 간격만큼의 틱)으로 찾아감.
+    # 키프레임이 해시뿐인 옛 파일은 재생하면서 지나간 스냅샷만 메모리에 보관해서 씀.
+    def __init__(self, replay):
+        self.replay = replay
+        self.world = GameWorld(replay.seed)
+        self.keyframes = {0: self.world.snapshot()}     # 지나가면서 만든 스냅샷 (옛 파일/되감기용)
+        self.desyncs = []
+
+    @property
+    def done(self):
+        return self.world.tick >= len(self.replay) or self.world.game_over
+
+    def step(self):
+        if self.done:
+            return []
+        world = self.world
+        events = world.step(int(self.replay.inputs[world.tick]))
+        if world.tick % REPLAY_CACHE_TICKS == 0 and world.tick not in self.replay.keyframes:
+            self.keyframes.setdefault(world.tick, world.snapshot())
+        if world.tick % self.replay.keyframe_ticks == 0:
+            expected = self.replay.digests.get(world.tick)
+            if expected is not None and expected != world.state_digest():
+                self.desyncs.append(world.tick)
+        return events
+
+    def seek(self, tick):
+        tick = max(0, min(tick, len(self.replay)))
+        recorded = max((t for t in self.replay.keyframes if t <= tick), default=-1)
+        visited = max(t for t in self.keyframes if t <= tick)
+        # 지금 위치가 가장 가까운 키프레임과 목표 사이면 복원하지 않고 이어서 돌림
+        if not max(recorded, visited) <= self.world.tick <= tick:
+            if recorded >= visited:
+                self.world.restore(unpack_snapshot(self.replay.keyframes[recorded]))
+            else:
+                self.world.restore(self.keyframes[visited])
+        while self.world.tick < tick and not self.done:
+            self.step()
+
+def run_replay(path, seek=None):
+    replay = Replay.load(path)
+    player = ReplayPlayer(replay)
+    start = time.perf_counter()
+    if seek is not None:
+        player.seek(seek)
+    else:
+        while not player.done:
+            player.step()
+    elapsed = time.perf_counter() - start
+    world = player.world
+    print(f"replay {path}: seed={replay.seed} {len(replay)} ticks ({len(replay) / FPS:.1f}s), {len(replay.digests)} keyframes")
+    print(f"tick {world.tick} in {elapsed:.2f}s ({world.tick / FPS / max(elapsed, 1e-9):.0f}x real time): score={world.score} stage={world.current_stage}")
+    if player.desyncs:
+        print(f"DESYNC at ticks {player.desyncs[:10]}")
+    print(f"state: {world.state_digest()}")
+
+# === [최고 점수 저장소] ===
+# 파일 형식 (리틀 엔디언):
+#   헤더: "SPHS", 버전(u8)
+#   레코드: crc32(u32), 본문 길이(u16), 본문 = 점수(u32), 스테이지(u16), 틱(u32), seed(u64), 시각(f64), 이름(utf-8)
+# 레코드는 끝에 덧붙이기만 하므로, 쓰는 도중 꺼져서 잘리거나 깨진 꼬리는 다음에 열 때 CRC로 찾아 잘라냅니다.
+# 디스크 쓰기는 백그라운드 스레드가 묶어서 하고(묶음마다 fsync 한 번), 조회는 메모리 색인만 봅니다.
+SCORES_MAGIC = b"SPHS"
+SCORES_VERSION = 1
+SCORES_HEADER = struct.Struct("<4sB")
+SCORE_RECORD_HEADER = struct.Struct("<IH")
+SCORE_RECORD = struct.Struct("<IHIQd")
+SCORES_PATH = os.path.join(os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"),
+                           "shooting_python", "scores.log")
+
+def default_player_name():
+    try:
+        return getpass.getuser()
+    except (KeyError, OSError):
+        return "player"
+
+class ScoreRecord:
+    def __init__(self, name, score, stage, ticks, seed, timestamp):
+        self.name = name
+        self.score = score
+        self.stage = stage
+        self.ticks = ticks
+        self.seed = seed
+        self.timestamp = timestamp
+        self.seq = None     # 기록 순서 (같은 점수면 먼저 낸 기록이 위): 파일에서 읽은 기록은 음수, 이번 실행에서 낸 기록은 0부터
+        self.saved = False  # 로그 파일에 이미 들어갔는지
+
+    def encode(self):
+        payload = SCORE_RECORD.pack(self.score, self.stage, self.ticks, self.seed, self.timestamp) + self.name.encode()[:255]
+        return SCORE_RECORD_HEADER.pack(zlib.crc32(payload), len(payload)) + payload
+
+    @classmethod
+    def decode(cls, payload):
+        score, stage, ticks, seed, timestamp = SCORE_RECORD.unpack_from(payload)
+        return cls(payload[SCORE_RECORD.size:].decode(errors="replace"), score, stage, ticks, seed, timestamp)
+
+
+class ScoreStore:
+    def __init__(self, path=SCORES_PATH, keep=100, batch_seconds=0.5):
+        self.path = path
+        self.keep = keep                    # 압축할 때 남길 전체 상위 기록 수 (+ 플레이어별 최고 기록)
+        self.batch_seconds = batch_seconds  # 이 시간 안에 들어온 기록은 fsync 한 번으로 묶음
+        self.lock = threading.Lock()
+        self.ranked = []        # ((-점수, seq), 기록) 정렬 목록, 높은 점수부터 keep개까지만 (삽입이 O(keep))
+        self.best = {}          # 이름 -> 그 플레이어의 최고 기록
+        self.next_seq = 0
+        self.version = 0        # 색인이 바뀔 때마다 +1 (화면을 다시 그릴지 판단용)
+        self.loaded = False
+        self.records = 0        # 로그 파일에 든 레코드 수 (압축 시점 판단용)
+        self.fsyncs = 0
+        self.file = None
+        self.requests = queue.Queue()
+        self.thread = threading.Thread(target=self.write_worker, name="score-writer", daemon=True)
+        self.thread.start()
+
+    # --- 메인 스레드: 메모리 색인만 보고 바로 돌아옴 ---
+    def add(self, name, score, stage, ticks, seed):
+        record = ScoreRecord(name, score, stage, ticks, seed, time.time())
+        self.index(record)
+        self.requests.put(record)
+        return record
+
+    def top(self, k):
+        with self.lock:
+            return [record for _, record in self.ranked[:k]]
+
+    def player_best(self, name):
+        with self.lock:
+            return self.best.get(name)
+
+    def index(self, record):
+        with self.lock:
+            record.seq = self.next_seq
+            self.next_seq += 1
+            key = (-record.score, record.seq)
+            if len(self.ranked) < self.keep or key < self.ranked[-1][0]:
+                bisect.insort(self.ranked, (key, record))
+                del self.ranked[self.keep:]
+            self.update_best(record)
+            self.version += 1
+
+    def index_loaded(self, records):
+        # 파일에서 읽은 기록: 로드가 끝나기 전에 add()로 들어온 기록보다 먼저 낸 것이므로
+        # 파일 순서대로 음수 seq를 매기고, 정렬은 한 번만
+        with self.lock:
+            for seq, record in enumerate(records, -len(records)):
+                record.seq = seq
+                self.update_best(record)
+            self.ranked.extend(((-record.score, record.seq), record) for record in records)
+            self.ranked.sort(key=lambda entry: entry[0])
+            del self.ranked[self.keep:]
+            self.version += 1
+
+    def update_best(self, record):
+        best = self.best.get(record.name)
+        if best is None or (-record.score, record.seq) < (-best.score, best.seq):
+            self.best[record.name] = record
+
+    def close(self):
+        # 남은 기록을 쓰고 fsync할 때까지 기다림
+        self.requests.put(None)
+        self.thread.join()
+
+    # --- 저장 스레드 ---
+    def write_worker(self):
+        try:
+            self.load()
+        except OSError as e:
+            print(f"Error: score log {self.path} unavailable ({e}), scores will not be saved")
+        closing = False
+        while not closing:
+            record = self.requests.get()
+            if record is None:
+                break
+            batch = [record]
+            deadline = time.perf_counter() + self.batch_seconds
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    record = self.requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if record is None:
+                    closing = True
+                    break
+                batch.append(record)
+            if self.file is not None:
+                self.append(batch)
+        if self.file is not None:
+            self.file.close()
+
+    def load(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        if data and data[:SCORES_HEADER.size] != SCORES_HEADER.pack(SCORES_MAGIC, SCORES_VERSION):
+            # 다른 파일을 덮어쓰지 않도록 옆으로 치워 둠
+            os.replace(self.path, self.path + ".bad")
+            print(f"Error: {self.path} is not a score log (moved to {self.path}.bad)")
+            data = b""
+
+        records = []
+        pos = SCORES_HEADER.size
+        while pos + SCORE_RECORD_HEADER.size <= len(data):
+            crc, length = SCORE_RECORD_HEADER.unpack_from(data, pos)
+            payload = data[pos + SCORE_RECORD_HEADER.size:pos + SCORE_RECORD_HEADER.size + length]
+            if len(payload) < max(length, SCORE_RECORD.size) or zlib.crc32(payload) != crc:
+                break
+            record = ScoreRecord.decode(payload)
+            record.saved = True
+            records.append(record)
+            pos += SCORE_RECORD_HEADER.size + length
+
+        if not data:
+            with open(self.path, "wb") as f:
+                f.write(SCORES_HEADER.pack(SCORES_MAGIC, SCORES_VERSION))
+                f.flush()
+                os.fsync(f.fileno())
+        elif pos < len(data):
+            print(f"scores: dropped {len(data) - pos} bytes of torn/corrupt log tail")
+            with open(self.path, "r+b") as f:
+                f.truncate(pos)
+                f.flush()
+                os.fsync(f.fileno())
+        self.file = open(self.path, "ab")
+
+        self.index_loaded(records)
+        self.records = len(records)
+        self.loaded = True
+        if self.needs_compaction():
+            self.compact()
+
+    def append(self, batch):
+        self.file.write(b"".join(record.encode() for record in batch))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.fsyncs += 1
+        for record in batch:
+            record.saved = True
+        self.records += len(batch)
+        if self.needs_compaction():
+            self.compact()
+
+    def needs_compaction(self):
+        # 남길 기록의 두 배가 넘게 쌓이면 압축
+        return self.records > 2 * (self.keep + len(self.best))
+
+    def compact(self):
+        # 전체 상위 keep개 + 플레이어별 최고 기록만 새 파일에 써서 원자적으로 바꿔치기
+        # (아직 큐에 있는 기록은 다음 append가 쓰므로 여기서는 빼야 중복이 안 생김)
+        with self.lock:
+            kept = {record.seq: record for _, record in self.ranked[:self.keep]}
+            kept.update((record.seq, record) for record in self.best.values())
+        kept = [kept[seq] for seq in sorted(kept) if kept[seq].saved]
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SCORES_HEADER.pack(SCORES_MAGIC, SCORES_VERSION))
+            f.write(b"".join(record.encode() for record in kept))
+            f.flush()
+            os.fsync(f.fileno())
+        self.file.close()
+        os.replace(tmp_path, self.path)
+        try:
+            # 이름 바꾸기까지 디스크에 남도록 디렉터리도 fsync (지원하지 않는 OS는 건너뜀)
+            dir_fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+        self.file = open(self.path, "ab")
+        self.records = len(kept)
+        print(f"scores: compacted log to {len(kept)} records")
+
+
+# === [화면 녹화] ===
+# 파일 형식 (리틀 엔디언):
+#   헤더: "SPCV", 버전(u8), 너비(u16), 높이(u16)
+#   프레임: 녹화 시작부터의 시각(u32, ms), 플래그(u8, 1 = 키프레임), 압축 길이(u32), 본문
+#   본문(deflate) = 바뀐 줄 비트맵(높이 비트) + 바뀐 줄의 RGB 픽셀을 직전 프레임과 XOR한 값
+#   (키프레임은 모든 줄을 XOR 없이 그대로)
+# 화면은 대부분 그대로이므로 바뀐 줄만, 그것도 XOR해서 거의 0인 값으로 넣어 무손실로도 작게 압축됩니다.
+# 메인 스레드는 미리 만들어 둔 버퍼에 화면 픽셀을 복사만 하고, 비교/변환/압축/쓰기는 녹화 스레드가 합니다.
+# 빈 버퍼가 없으면(녹화 스레드가 밀리면) 그 프레임은 버리고 수만 셉니다.
+CAPTURE_MAGIC = b"SPCV"
+CAPTURE_VERSION = 1
+CAPTURE_HEADER = struct.Struct("<4sBHH")
+CAPTURE_FRAME = struct.Struct("<IBI")
+CAPTURE_KEYFRAME = 1
+CAPTURE_KEYFRAME_FRAMES = FPS * 2   # 파일 끝이 잘려도 이만큼마다 처음부터 복원 가능
+CAPTURE_BUFFERS = 8
+
+class FrameCapture:
+    def __init__(self, path, surface, buffers=CAPTURE_BUFFERS, level=1):
+        self.path = path
+        self.width, self.height = surface.get_size()
+        self.pitch = surface.get_pitch()
+        self.bytesize = surface.get_bytesize()
+        if self.bytesize not in (3, 4):
+            raise ValueError(f"capture: unsupported {self.bytesize * 8}-bit screen format")
+        # 픽셀 안에서 R, G, B가 있는 바이트 위치 (리틀 엔디언 기준)
+        self.channels = [shift // 8 for shift in surface.get_shifts()[:3]]
+        self.level = level
+        self.buffers = [np.empty(self.pitch * self.height, np.uint8) for _ in range(buffers)]
+        self.free = queue.Queue()
+        for index in range(buffers):
+            self.free.put(index)
+        self.filled = queue.Queue()
+        self.start = time.perf_counter()
+        self.frames = 0         # 녹화 스레드에 넘긴 프레임 수
+        self.dropped = 0        # 버퍼가 없어서 버린 프레임 수
+        self.written = 0        # 파일에 쓴 바이트 수
+        self.file = open(path, "wb")
+        self.file.write(CAPTURE_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, self.width, self.height))
+        self.thread = threading.Thread(target=self.write_worker, name="capture-writer", daemon=True)
+        self.thread.start()
+
+    # --- 메인 스레드: 화면 버퍼를 미리 만든 버퍼로 복사만 하고 바로 돌아옴 ---
+    def add(self, surface):
+        try:
+            index = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        # 변환 없이 화면 메모리를 그대로 읽음 (뷰가 살아 있는 동안 화면이 잠기므로 바로 놓음)
+        view = surface.get_buffer()
+        np.copyto(self.buffers[index], np.frombuffer(view, np.uint8))
+        del view
+        self.filled.put((index, int((time.perf_counter() - self.start) * 1000)))
+        self.frames += 1
+        return True
+
+    def close(self):
+        # 남은 프레임을 다 쓸 때까지 기다림
+        self.filled.put(None)
+        self.thread.join()
+        return f"capture: {self.frames} frames -> {self.path} ({self.dropped} dropped, {self.written / 1048576:.1f} MB)"
+
+    def rows(self, index):
+        # 버퍼를 (줄, 줄 안의 픽셀 바이트) 로 본 뷰 (줄 끝의 pitch 여백은 뺌)
+        return self.buffers[index].reshape(self.height, self.pitch)[:, :self.width * self.bytesize]
+
+    # --- 녹화 스레드 ---
+    def write_worker(self):
+        previous = None     # 직전 프레임 버퍼 번호 (다음 프레임과 비교할 때까지 돌려주지 않음)
+        count = 0
+        while True:
+            item = self.filled.get()
+            if item is None:
+                break
+            index, ms = item
+            rows = self.rows(index)
+            keyframe = previous is None or count % CAPTURE_KEYFRAME_FRAMES == 0
+            if keyframe:
+                changed = np.ones(self.height, bool)
+                diff = rows
+            else:
+                # XOR은 바이트끼리 하므로 화면 픽셀 형식 그대로 비교하고, 바뀐 줄만 RGB로 바꿈
+                before = self.rows(previous)
+                changed = (rows != before).any(axis=1)
+                diff = np.bitwise_xor(rows[changed], before[changed])
+            pixels = diff.reshape(len(diff), self.width, self.bytesize)
+            rgb = np.stack([pixels[:, :, channel] for channel in self.channels], axis=-1)
+            data = zlib.compress(np.packbits(changed).tobytes() + rgb.tobytes(), self.level)
+            if previous is not None:
+                self.free.put(previous)
+            previous = index
+            self.file.write(CAPTURE_FRAME.pack(ms, CAPTURE_KEYFRAME if keyframe else 0, len(data)))
+            self.file.write(data)
+            self.written += CAPTURE_FRAME.size + len(data)
+            count += 1
+        self.file.close()
+
+def read_capture(path):
+    # (시각 ms, RGB 배열) 을 순서대로 돌려줌 (녹화 중에 끊긴 파일은 마지막 온전한 프레임까지)
+    with open(path, "rb") as f:
+        magic, version, width, height = CAPTURE_HEADER.unpack(f.read(CAPTURE_HEADER.size))
+        if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION:
+            raise ValueError(f"{path}: not a capture file (version {CAPTURE_VERSION})")
+        mask_size = (height + 7) // 8
+        frame = None
+        while True:
+            header = f.read(CAPTURE_FRAME.size)
+            if len(header) < CAPTURE_FRAME.size:
+                return
+            ms, flags, length = CAPTURE_FRAME.unpack(header)
+            data = f.read(length)
+            if len(data) < length:
+                return
+            try:
+                body = np.frombuffer(zlib.decompress(data), np.uint8)
+                changed = np.unpackbits(body[:mask_size])[:height].astype(bool)
+                rows = body[mask_size:].reshape(-1, width, 3)
+            except (zlib.error, ValueError):
+                return
+            if flags & CAPTURE_KEYFRAME:
+                frame = np.zeros((height, width, 3), np.uint8)
+                frame[changed] = rows
+            elif frame is None:
+                continue    # 키프레임 전의 조각은 복원할 수 없음
+            else:
+                frame = frame.copy()
+                frame[changed] ^= rows
+            yield ms, frame
+
+def export_capture(path, out_dir, fps=FPS):
+    # 고정 fps의 PNG 연번 파일로 풀어냄 (버려진 프레임 자리는 앞 프레임을 반복해 시간을 맞춤)
+    # 예: ffmpeg -framerate 60 -i out_dir/frame_%06d.png trailer.mp4
+    os.makedirs(out_dir, exist_ok=True)
+    count = 0
+    image = None
+    for ms, rgb in read_capture(path):
+        # 앞 프레임을 이 프레임 시각 전까지의 출력 프레임에 채움
+        while image is not None and count * 1000 / fps < ms:
+            pygame.image.save(image, os.path.join(out_dir, f"frame_{count:06d}.png"))
+            count += 1
+        image = pygame.image.frombuffer(rgb.tobytes(), (rgb.shape[1], rgb.shape[0]), "RGB")
+    if image is not None:
+        pygame.image.save(image, os.path.join(out_dir, f"frame_{count:06d}.png"))
+        count += 1
+    print(f"capture {path}: {count} frames at {fps} fps -> {out_dir}")
+
+def draw_text_center(surf, text, font, color, y_offset=0):
+    text_surface = text_cache.render(font, text, color)
+    rect = text_surface.get_rect()
+    rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + y_offset)
+    return surf.blit(text_surface, rect)
+
+def draw_hud_value(surf, label, value_text, digits, pos):
+    label_surf = text_cache.render(digits.font, label, digits.color)
+    rect = surf.blit(label_surf, pos)
+    end_x = digits.draw(surf, value_text, (rect.right, pos[1]))
+    return pygame.Rect(pos[0], pos[1], end_x - pos[0], max(label_surf.get_height(), digits.font.get_height()))
+
+def draw_hearts(surf, lives):
+    return surf.blits([sprite_atlas.entry("heart", 10 + (i * 40), 50) for i in range(lives)])
+
+def queue_world(queue, world, alpha=None):
+    # 아이템/총알/플레이어/적을 각자 레이어에 넣음 (alpha가 있으면 직전 틱과 현재 틱 사이 보간 위치)
+    queue.add_sprites(world.items, alpha)
+    queue.add_sprites(world.bullets, alpha)
+    for player in world.players:
+        dx, dy = interp_offset(player, alpha) if alpha is not None else (0, 0)
+        player.queue_draw(queue, player.rect.x + dx, player.rect.y + dy)
+    queue.add_sprites(world.enemies, alpha)
+
+def draw_playing(surface, world, hud_digits, shake_x=0, shake_y=0, alpha=1.0, particle_step=1):
+    # 게임 화면을 그리고, 이번 프레임에 그린 영역(Rect) 목록을 돌려줌 (발판은 정적 레이어로 따로)
+    queue_world(render_queue, world, alpha)
+    rects = render_queue.submit(surface, shake_x, shake_y)
+
+    rects += world.particles.draw(surface, shake_x, shake_y, particle_step)
+
+    # 고정 문구는 텍스트 캐시, 계속 바뀌는 숫자는 숫자 아틀라스로 그림
+    rects.append(draw_hud_value(surface, "Score: ", str(world.score), hud_digits, (10, 10)))
+    rects.append(draw_hud_value(surface, "Time: ", f"{world.elapsed_seconds:.1f}s", hud_digits, (10, 85)))
+    rects.append(surface.blit(text_cache.render(font_ui, f"Stage: {world.current_stage}", GOLD), (SCREEN_WIDTH - 150, 10)))
+    
+    rects += draw_hearts(surface, world.player_lives)
+
+    if world.timers.active("stage_text"):
+        rects.append(draw_text_center(surface, f"STAGE {world.current_stage}", font_title, GOLD, -50))
+    return rects
+
+# === [더티 렉트 렌더러] ===
+# 화면 전체를 매번 지우고 flip 하지 않고, 바뀐 영역만 display.update(rects)로 내보냅니다.
+# 지난 프레임에 그린 영역은 배경색으로 지우고, 이번 프레임에 그린 영역과 합쳐서 갱신합니다.
+class DirtyRenderer:
+    def __init__(self, surface, background=BLACK):
+        self.surface = surface
+        self.background = background
+        self.prev_rects = []
+        self.force_full = True
+        # 플레이 화면에서 지운 자리를 채울 배경 (배경색 + 발판 정적 레이어)
+        self.background_surface = None
+        # 메뉴류 화면에서 별 위에 올라가는 내용 (바뀔 때만 다시 그림)
+        self.layer = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+        self.layer_key = None
+        self.layer_changed = False
+
+    def begin(self, full=False):
+        # 플레이 화면: 지난 프레임에 그린 곳만 지움. 전체 갱신이 필요하면 True를 돌려줌
+        shaking = full
+        full = full or self.force_full
+        # 화면이 흔들리다 멈춘 첫 프레임은 흔들린 위치에 남은 배경까지 지워야 하므로 한 번 더 전체 갱신
+        self.force_full = shaking
+        self.layer_key = None
+        if full:
+            self.surface.fill(self.background)
+        elif self.background_surface is not None:
+            for rect in self.prev_rects:
+                self.surface.blit(self.background_surface, rect, rect)
+        else:
+            for rect in self.prev_rects:
+                self.surface.fill(self.background, rect)
+        return full
+
+    def set_background(self, surface):
+        self.background_surface = surface
+        self.force_full = True
+
+    def end(self, rects, full):
+        if full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.prev_rects + rects)
+        self.prev_rects = rects
+
+    def begin_layered(self, key, draw, rects):
+        # rects: 이번 프레임에 바뀌는 영역 (움직인 별의 이전/현재 자리). 레이어가 그대로면 여기만 지움
+        self.layer_changed = key != self.layer_key
+        if self.layer_changed:
+            self.layer_key = key
+            self.layer.fill((0, 0, 0, 0))
+            draw(self.layer)
+            self.surface.fill(self.background)
+        else:
+            for rect in rects:
+                self.surface.fill(self.background, rect)
+        # 다음에 플레이 화면으로 돌아가면 레이어 내용을 지워야 하므로 전체 갱신
+        self.force_full = True
+
+    def end_layered(self, rects):
+        if self.layer_changed:
+            self.surface.blit(self.layer, (0, 0))
+            pygame.display.flip()
+        else:
+            for rect in rects:
+                self.surface.blit(self.layer, rect, rect)
+            pygame.display.update(rects)
+        self.prev_rects = rects
+
+# === [프로파일러 HUD] ===
+# 프레임마다 단계별 소요 시간과 객체 수를 고정 크기 링 버퍼에 기록합니다.
+# 기록은 항상 하고(프레임당 배열 한 줄), F3으로 켰을 때만 화면에 그립니다.
+class FrameProfiler:
+    PHASES = ("input", "timers", "player", "bullets", "enemies", "particles", "collision", "draw", "flip")
+    STEP_PHASES = ("timers", "player", "bullets", "enemies", "particles", "collision")
+    COUNTS = ("enemies", "bullets", "items", "particles")
+    GRAPH_FRAMES = 120
+    GRAPH_HEIGHT = 50
+    GRAPH_MS = 33.3     # 그래프 세로 끝 = 30fps 프레임 시간
+    ROLLING = 60        # 화면에 보이는 평균/최대는 최근 60프레임 기준
+
+    def __init__(self, size=3600):
+        self.size = size
+        self.times = np.zeros((size, len(self.PHASES) + 1), np.float32)  # 단계별 + 프레임 전체 (초)
+        self.counts = np.zeros((size, len(self.COUNTS)), np.int32)
+        self.frame_numbers = np.zeros(size, np.int64)
+        self.index = 0
+        self.frames = 0
+        self.current = dict.fromkeys(self.PHASES, 0.0)
+        self.visible = False
+        self.font = None
+        self.panel = None
+
+    def reset(self):
+        # 새 판을 시작하면 이전 판의 기록(평균/최대, 그래프, CSV)을 비움
+        self.times[:] = 0
+        self.counts[:] = 0
+        self.index = 0
+        self.frames = 0
+        self.current = dict.fromkeys(self.PHASES, 0.0)
+
+    def add(self, phase, seconds):
+        self.current[phase] += seconds
+
+    def add_step(self, timings):
+        # 한 프레임에 틱이 여러 번 돌 수 있으므로 더해 둠
+        for phase in self.STEP_PHASES:
+            self.current[phase] += timings.get(phase, 0.0)
+
+    def end_frame(self, frame_seconds, world):
+        row = self.index
+        times = self.times[row]
+        for i, phase in enumerate(self.PHASES):
+            times[i] = self.current[phase]
+            self.current[phase] = 0.0
+        times[-1] = frame_seconds
+        self.counts[row] = (len(world.enemies), len(world.bullets), len(world.items), len(world.particles))
+        self.frame_numbers[row] = self.frames
+        self.frames += 1
+        self.index = (row + 1) % self.size
+
+    def recent(self, n):
+        n = min(n, self.frames, self.size)
+        rows = np.arange(self.index - n, self.index) % self.size
+        return self.times[rows], self.counts[rows]
+
+    def draw(self, surface):
+        if not self.visible or self.frames == 0:
+            return []
+        if self.font is None:
+            self.font = font_cache.font("arial", 16, True)
+            self.digits = DigitAtlas(self.font, WHITE)
+            self.panel = pygame.Surface((250, 4 + 18 * (len(self.PHASES) + 1) + 44 + self.GRAPH_HEIGHT + 6), pygame.SRCALPHA)
+            self.panel.fill((0, 0, 0, 170))
+
+        x, y = SCREEN_WIDTH - self.panel.get_width() - 10, 50
+        area = surface.blit(self.panel, (x, y))
+        times, counts = self.recent(self.ROLLING)
+        avg = times.mean(0) * 1000
+        peak = times.max(0) * 1000
+
+        line_y = y + 4
+        surface.blit(text_cache.render(self.font, "phase      avg ms   max ms", GOLD), (x + 8, line_y))
+        for i, phase in enumerate(self.PHASES + ("frame",)):
+            line_y += 18
+            surface.blit(text_cache.render(self.font, phase, WHITE), (x + 8, line_y))
+            self.digits.draw(surface, f"{avg[i]:.2f}", (x + 100, line_y))
+            self.digits.draw(surface, f"{peak[i]:.2f}", (x + 175, line_y))
+
+        line_y += 22
+        for i, name in enumerate(self.COUNTS):
+            label_x = x + 8 + 60 * i
+            surface.blit(text_cache.render(self.font, name[0].upper(), GREY), (label_x, line_y))
+            self.digits.draw(surface, str(counts[-1][i]), (label_x + 14, line_y))
+
+        # 프레임 시간 그래프 (가로선 = 60fps 예산 16.7ms)
+        graph_top = line_y + 22
+        graph_bottom = graph_top + self.GRAPH_HEIGHT
+        frame_ms = self.recent(self.GRAPH_FRAMES)[0][:, -1] * 1000
+        scale = self.GRAPH_HEIGHT / self.GRAPH_MS
+        budget_y = graph_bottom - round(1000 / FPS * scale)
+        pygame.draw.line(surface, DARK_RED, (x + 8, budget_y), (x + 8 + self.GRAPH_FRAMES * 2, budget_y))
+        if len(frame_ms) > 1:
+            heights = np.minimum(frame_ms * scale, self.GRAPH_HEIGHT)
+            points = [(x + 8 + i * 2, graph_bottom - h) for i, h in enumerate(heights.tolist())]
+            pygame.draw.lines(surface, BTN_GREEN, False, points)
+        return [area]
+
+    def dump_csv(self, path):
+        times, counts = self.recent(self.size)
+        n = len(times)
+        frame_numbers = self.frame_numbers[np.arange(self.index - n, self.index) % self.size]
+        header = ["frame"] + [f"{phase}_ms" for phase in self.PHASES] + ["frame_ms"] + list(self.COUNTS)
+        with open(path, "w") as f:
+            f.write(",".join(header) + "\n")
+            for number, row_times, row_counts in zip(frame_numbers.tolist(), (times * 1000).tolist(), counts.tolist()):
+                f.write(",".join([str(number)] + [f"{t:.3f}" for t in row_times] + [str(c) for c in row_counts]) + "\n")
+        return n
+
+# === [화질 자동 조절] ===
+# 플레이 중 프레임마다 작업 시간(clock.tick에서 기다린 시간은 뺌)을 보고 화질을 한 단계씩 내리거나 올립니다.
+# 최근 0.5초의 p90이 프레임 예산을 넘으면 내리고, 최근 3초 평균이 예산의 절반 아래면 올립니다.
+# 단계를 바꾸면 기록을 비우고 새로 모으며, 올리자마자 다시 내려가면 다음 올리기까지 두 배로 오래 기다립니다.
+# 화질은 그리는 방법만 바꾸므로 시뮬레이션(파티클 생성, 흔들림 값, 리플레이 해시)은 그대로입니다.
+class QualityLevel:
+    def __init__(self, name, particle_step, shake_scale, star_fraction, interpolate):
+        self.name = name
+        self.particle_step = particle_step      # 파티클을 몇 개 중 하나만 그릴지
+        self.shake_scale = shake_scale          # 화면 흔들림 배율 (0이면 흔들림 없음 → 더티 렉트도 전체 갱신이 줄어듦)
+        self.star_fraction = star_fraction      # 배경 별을 얼마나 그릴지
+        self.interpolate = interpolate          # 틱 사이 보간 위치로 그릴지 (끄면 스프라이트마다 계산이 빠짐)
+
+QUALITY_LEVELS = (
+    QualityLevel("HIGH", 1, 1.0, 1.0, True),
+    QualityLevel("MEDIUM", 2, 0.5, 0.5, True),
+    QualityLevel("LOW", 4, 0.25, 0.25, False),
+    QualityLevel("MINIMAL", 8, 0.0, 0.0, False),
+)
+QUALITY_NAMES = [level.name.lower() for level in QUALITY_LEVELS]
+
+class QualityGovernor:
+    DOWN_FRAMES = 30        # 내릴지 판단할 최근 프레임 수
+    UP_FRAMES = 180         # 올릴지 판단할 최근 프레임 수 (처음 값, 되돌아가면 두 배씩)
+    MAX_UP_FRAMES = FPS * 60
+    UP_RATIO = 0.5          # 평균이 예산의 이 비율 아래여야 올림
+
+    def __init__(self, budget=1 / FPS, level=0, auto=True):
+        self.budget = budget
+        self.index = level
+        self.auto = auto
+        self.times = np.zeros(self.MAX_UP_FRAMES, np.float32)
+        self.count = 0              # 단계를 바꾼 뒤 모은 프레임 수
+        self.up_frames = self.UP_FRAMES
+        self.raised_at = None       # 마지막으로 올린 프레임 (바로 다시 내려가는지 확인용)
+        self.frames = 0
+        self.changes = 0
+
+    @property
+    def level(self):
+        return QUALITY_LEVELS[self.index]
+
+    def add_frame(self, seconds):
+        self.frames += 1
+        if not self.auto:
+            return
+        self.times[self.count % len(self.times)] = seconds
+        self.count += 1
+        if self.count >= self.DOWN_FRAMES and self.index < len(QUALITY_LEVELS) - 1:
+            recent = self.recent(self.DOWN_FRAMES)
+            p90 = float(np.percentile(recent, 90))
+            if p90 > self.budget:
+                if self.raised_at is not None and self.frames - self.raised_at < self.up_frames:
+                    self.up_frames = min(self.up_frames * 2, self.MAX_UP_FRAMES)
+                self.change(self.index + 1, f"frame p90 {p90 * 1000:.1f} ms > {self.budget * 1000:.1f} ms budget")
+                return
+        if self.count >= self.up_frames and self.index > 0:
+            mean = float(self.recent(self.up_frames).mean())
+            if mean < self.budget * self.UP_RATIO:
+                self.raised_at = self.frames
+                self.change(self.index - 1, f"frame mean {mean * 1000:.2f} ms < {self.budget * self.UP_RATIO * 1000:.2f} ms "
+                                            f"for {self.up_frames} frames")
+
+    def recent(self, n):
+        rows = np.arange(self.count - n, self.count) % len(self.times)
+        return self.times[rows]
+
+    def change(self, index, reason):
+        print(f"quality: {self.level.name} -> {QUALITY_LEVELS[index].name} ({reason})")
+        self.index = index
+        self.count = 0
+        self.changes += 1
+
+    def draw(self, surface):
+        return [surface.blit(text_cache.render(font_info, f"Quality: {self.level.name}", GREY), (10, 115))]
+
+# === [배경 음악 관리] ===
+# mixer.music.load()는 메인 스레드에서 파일을 열기 때문에 곡을 바꾸는 프레임이 멈춥니다.
+# 곡은 백그라운드 스레드에서 Sound로 미리 디코딩해 두고, 예약한 채널 두 개를 번갈아 쓰며 크로스페이드합니다.
+# 디코딩한 곡은 44.1kHz 스테레오 16비트 기준 1분에 약 10MB라서, 합이 MUSIC_CACHE_BYTES를 넘으면
+# 지금 곡과 기다리는 곡만 남기고 가장 오래 안 쓴 곡부터 버립니다 (다시 틀면 백그라운드에서 새로 디코딩).
+MUSIC_CACHE_BYTES = 32 * 1024 * 1024
+
+class MusicManager:
+    def __init__(self, volume=0.5, fade_ms=800, cache_bytes=MUSIC_CACHE_BYTES):
+        self.volume = volume
+        self.fade_ms = fade_ms
+        self.cache_bytes = cache_bytes
+        self.sounds = OrderedDict() # 파일 이름 -> Sound (로드 실패는 None), 로더 스레드가 채움, 최근에 쓴 곡이 뒤
+        self.sizes = {}             # 파일 이름 -> 디코딩한 크기 (바이트)
+        self.queued = set()
+        self.lock = threading.Lock()
+        self.requests = queue.Queue()
+        self.current = None         # 재생 중인 곡
+        self.pending = None         # 로드가 끝나는 대로 틀 곡
+        self.requested_at = 0.0
+        self.channels = []          # start()에서 믹서를 켜면 채움
+        self.active = 0
+        self.started = False
+        self.closed = False
+        self.thread = threading.Thread(target=self.load_worker, name="music-loader", daemon=True)
+
+    def start(self):
+        # 처음 곡을 틀 때 메인 스레드에서 믹서를 켬 (SDL 오디오 초기화는 메인 스레드에서 해야 안전함)
+        # 로더 스레드는 그 뒤에 시작해서 디코딩만 함
+        self.started = True
+        start = time.perf_counter()
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            # 효과음이 음악 채널을 뺏어 가지 않도록 0, 1번 채널은 음악 전용
+            pygame.mixer.set_reserved(2)
+            self.channels = [pygame.mixer.Channel(0), pygame.mixer.Channel(1)]
+        except pygame.error as e:
+            print(f"Error: mixer init failed ({e}), playing without music", file=sys.stderr)
+            return
+        print(f"Mixer Ready ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        self.thread.start()
+
+    def load_worker(self):
+        while True:
+            filename = self.requests.get()
+            if filename is None or self.closed:
+                return
+            start = time.perf_counter()
+            try:
+                sound = pygame.mixer.Sound(filename)
+            except (pygame.error, OSError) as e:
+                sound = None
+                print(f"Error: cannot load music {filename} ({e})", file=sys.stderr)
+            load_ms = (time.perf_counter() - start) * 1000
+            size = 0
+            if sound is not None:
+                frequency, bits, channels = pygame.mixer.get_init()
+                size = int(sound.get_length() * frequency) * channels * abs(bits) // 8
+                print(f"Music Loaded: {filename} ({load_ms:.0f} ms, {sound.get_length():.0f}s, {size / 2 ** 20:.1f} MB)")
+            with self.lock:
+                self.sounds[filename] = sound
+                self.sizes[filename] = size
+
+    def preload(self, *filenames):
+        # 곧 쓸 곡을 미리 디코딩 (이미 요청한 곡은 무시)
+        for filename in filenames:
+            if filename not in self.queued:
+                self.queued.add(filename)
+                self.requests.put(filename)
+
+    def play(self, filename):
+        # 바로 돌아옴: 로드가 안 끝났으면 update()가 끝난 뒤에 바꿔 줌
+        if filename == self.current:
+            self.pending = None
+            return
+        if filename == self.pending:
+            return
+        self.preload(filename)
+        self.pending = filename
+        self.requested_at = time.perf_counter()
+        self.update()
+
+    def update(self):
+        # 매 프레임 호출: 기다리던 곡이 준비됐으면 크로스페이드 시작
+        self.trim()
+        if self.pending is None:
+            return
+        if not self.started:
+            self.start()
+        with self.lock:
+            if self.pending not in self.sounds:
+                return
+            sound = self.sounds[self.pending]
+            self.sounds.move_to_end(self.pending)
+        filename = self.pending
+        self.pending = None
+        if sound is None:
+            return
+        wait_ms = (time.perf_counter() - self.requested_at) * 1000
+        fade_ms = self.fade_ms if self.current is not None else 0
+        self.channels[self.active].fadeout(max(fade_ms, 1))
+        self.active ^= 1
+        channel = self.channels[self.active]
+        channel.set_volume(self.volume)
+        channel.play(sound, loops=-1, fade_ms=fade_ms)
+        self.current = filename
+        if wait_ms >= 1:
+            print(f"Music Playing: {filename} (waited {wait_ms:.0f} ms for load)")
+        else:
+            print(f"Music Playing: {filename}")
+
+    def trim(self):
+        # 캐시가 한도를 넘으면 오래 안 쓴 곡부터 버림 (페이드아웃 중인 곡은 채널이 따로 잡고 있어서 끝까지 나옴)
+        with self.lock:
+            total = sum(self.sizes.values())
+            if total <= self.cache_bytes:
+                return
+            for filename in list(self.sounds):
+                if total <= self.cache_bytes:
+                    break
+                if filename in (self.current, self.pending) or self.sounds[filename] is None:
+                    continue
+                total -= self.sizes.pop(filename)
+                del self.sounds[filename]
+                self.queued.discard(filename)
+                print(f"Music Evicted: {filename} (cache {total / 2 ** 20:.1f} MB)")
+
+    def set_volume(self, volume):
+        self.volume = volume
+        if self.channels:
+            self.channels[self.active].set_volume(volume)
+
+    def close(self):
+        # pygame.quit() 전에 디코딩 중인 곡이 끝나기를 기다림 (남은 요청은 버림)
+        self.closed = True
+        if self.thread.is_alive():
+            self.requests.put(None)
+            self.thread.join()
+
+
+def read_held_inputs():
+    keys = pygame.key.get_pressed()
+    inputs = 0
+    if keys[pygame.K_LEFT]: inputs |= INPUT_LEFT
+    if keys[pygame.K_RIGHT]: inputs |= INPUT_RIGHT
+    if keys[pygame.K_SPACE]: inputs |= INPUT_JUMP
+    return inputs
+
+def report_startup():
+    mark_startup("first frame")
+    parts = []
+    prev = STARTUP_START
+    for label, at in startup_marks:
+        parts.append(f"{label} +{(at - prev) * 1000:.1f} ms")
+        prev = at
+    print(f"startup: {', '.join(parts)} (total {(prev - STARTUP_START) * 1000:.1f} ms)")
+    print(font_cache.stats())
+
+def main(seed=None, render_fps=FPS, dirty_rects=False, star_count=50, record_path=None, replay=None, replay_speed=1.0,
+         profile_csv=None, startup_time=False, scores_path=SCORES_PATH, player_name="player", capture_path=None,
+         quality="auto"):
+    init_display()
+    capture = FrameCapture(capture_path, screen) if capture_path else None
+    # "auto"면 프레임 시간을 보고 화질을 자동으로 조절, 아니면 그 단계로 고정
+    quality = QualityGovernor(1 / (render_fps or FPS), 0 if quality == "auto" else QUALITY_NAMES.index(quality),
+                              quality == "auto")
+    game_state = STATE_MENU 
+    
+    world = None
+    # 점수 기록은 파일에 남기고, 게임 오버 화면은 메모리 색인만 조회
+    score_store = ScoreStore(scores_path)
+    score_version = None
+    high_scores = []
+    player_best = None
+    last_record = None
+
+    background_stars = Starfield(star_count)
+    static_layer = StaticLayer()
+    play_background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    frozen_layer = FrozenLayer()
+    frozen_state = None
+    hud_digits = DigitAtlas(font_ui, WHITE)
+
+    current_volume = 0.5
+    music = MusicManager(current_volume)
+    # 스테이지 3 곡도 미리 디코딩해 두어 전환할 때 기다리지 않게 함
+    music.preload("music.mp3", "music2.mp3")
+
+    btn_width, btn_height = 250, 60
+    center_x = SCREEN_WIDTH // 2 - btn_width // 2
+    
+    btn_start = Button("GAME START", center_x, 250, btn_width, btn_height, BTN_RED)
+    btn_guide = Button("HOW TO PLAY", center_x, 330, btn_width, btn_height, BTN_GREEN)
+    btn_option = Button("OPTION", center_x, 410, btn_width, btn_height, BTN_BLUE)
+    btn_exit = Button("EXIT", center_x, 490, btn_width, btn_height, BTN_YELLOW)
+    
+    menu_buttons = [btn_start, btn_guide, btn_option, btn_exit]
+
+    btn_back = Button("BACK", center_x, 500, btn_width, btn_height, GREY, WHITE)
+    btn_vol_down = Button("-", center_x - 80, 300, 60, 60, GREY, WHITE)
+    btn_vol_up = Button("+", center_x + 270, 300, 60, 60, GREY, WHITE)
+    btn_pause_exit = Button("EXIT GAME", center_x, 400, btn_width, btn_height, BTN_YELLOW)
+
+    # 화면별로 보이는 버튼 (더티 렉트 모드에서 hover가 바뀌었는지 확인용)
+    state_buttons = {
+        STATE_MENU: menu_buttons,
+        STATE_GUIDE: [btn_back],
+        STATE_OPTION: [btn_vol_down, btn_vol_up, btn_back],
+        STATE_PAUSE: [btn_vol_down, btn_vol_up, btn_pause_exit],
+    }
+    renderer = DirtyRenderer(screen)
+
+    def draw_stars(surface, ticks):
+        background_stars.update(ticks)
+        return background_stars.draw(surface)
+
+    def draw_screen(surface):
+        # 플레이 중이 아닌 화면 (메뉴/설명/옵션/일시정지/게임오버)에서 별 위에 올라가는 내용
+        if game_state == STATE_MENU:
+            draw_text_center(surface, "Shooting Python", font_title, BLUE, -200)
+            for btn in menu_buttons:
+                btn.draw(surface)
+
+        elif game_state == STATE_GUIDE:
+            draw_text_center(surface, "HOW TO PLAY", font_title, BTN_GREEN, -150)
+            guide_rect = pygame.Rect(150, 200, 500, 250)
+            pygame.draw.rect(surface, (30, 30, 40), guide_rect, border_radius=10)
+            pygame.draw.rect(surface, WHITE, guide_rect, 2, border_radius=10)
+            
+            instructions = ["MOVE: Arrow Keys", "JUMP: Space", "SHOOT: Z Key", "RESTART: R Key"]
+            for i, line in enumerate(instructions):
+                text_surf = text_cache.render(font_ui, line, WHITE)
+                surface.blit(text_surf, (200, 230 + i*50))
+            btn_back.draw(surface)
+
+        elif game_state == STATE_OPTION:
+            draw_text_center(surface, "OPTIONS", font_title, BTN_BLUE, -150)
+            draw_volume_bar(surface)
+            btn_vol_down.draw(surface)
+            btn_vol_up.draw(surface)
+            btn_back.draw(surface)
+
+        elif game_state == STATE_PAUSE:
+            frozen_layer.draw(surface)
+
+            draw_text_center(surface, "PAUSED", font_title, WHITE, -150)
+            draw_volume_bar(surface)
+            btn_vol_down.draw(surface)
+            btn_vol_up.draw(surface)
+            btn_pause_exit.draw(surface)
+
+        elif game_state == STATE_GAMEOVER:
+            frozen_layer.draw(surface)
+
+            draw_text_center(surface, "GAME OVER", font_title, RED, -200)
+            result_text = f"YOUR SCORE: {world.score}    TIME: {world.elapsed_seconds:.1f}s"
+            draw_text_center(surface, result_text, font_ui, WHITE, -130)
+            if player_best is not None:
+                draw_text_center(surface, f"{player_name}'s BEST: {player_best.score}", font_info, GREY, -95)
+
+            draw_text_center(surface, "--- TOP 3 HIGH SCORES ---", font_ui, GOLD, -60)
+            for i, record in enumerate(high_scores):
+                rank_text = f"{i+1}. {record.score} point  {record.name}"
+                color = YELLOW if record is last_record else WHITE
+                draw_text_center(surface, rank_text, font_ui, color, -20 + (i * 40))
+
+            draw_text_center(surface, "Press 'R' to Restart", font_sub, BLUE, 120)
+            draw_text_center(surface, "Press 'M' for Main Menu", font_info, GREY, 170)
+
+    def draw_frozen_world(surface):
+        # 일시정지/게임오버 진입 시 한 번만 불림
+        static_layer.draw(surface)
+        if game_state == STATE_PAUSE:
+            queue_world(render_queue, world)
+        else:
+            world.player.queue_draw(render_queue, *world.player.rect.topleft)
+            render_queue.add_sprites(world.enemies)
+        render_queue.submit(surface)
+
+    def draw_volume_bar(surface):
+        draw_text_center(surface, "MUSIC VOLUME", font_sub, WHITE, -50)
+        bar_width = 300
+        bar_height = 30
+        bar_x = (SCREEN_WIDTH - bar_width) // 2
+        bar_y = 315
+        pygame.draw.rect(surface, GREY, (bar_x, bar_y, bar_width, bar_height), border_radius=5)
+        fill_width = int(bar_width * current_volume)
+        pygame.draw.rect(surface, BTN_BLUE, (bar_x, bar_y, fill_width, bar_height), border_radius=5)
+        pygame.draw.rect(surface, WHITE, (bar_x, bar_y, bar_width, bar_height), 3, border_radius=5)
+        vol_percent = int(current_volume * 100)
+        draw_text_center(surface, f"{vol_percent}%", font_ui, WHITE, 20)
+
+    running = True
+    games_played = 0
+    profiler = FrameProfiler()
+
+    # 리플레이 재생: 메뉴 없이 바로 녹화된 게임을 돌림 (좌/우 방향키로 10초씩 이동)
+    if replay is not None:
+        world = replay.world
+        world.timings = {}
+        game_state = STATE_PLAYING
+
+    # 고정 시간 간격 루프: 시뮬레이션은 항상 1/60초 틱으로, 렌더링은 render_fps로 (0이면 제한 없음)
+    accumulator = 0.0
+    pending_inputs = 0
+    shake_x = shake_y = 0
+    last_time = time.perf_counter()
+    session_start = last_time
+
+    while running:
+        clock.tick(render_fps)
+        now = time.perf_counter()
+        # 창을 끌거나 멈췄을 때 틱이 한꺼번에 몰리지 않도록 제한
+        raw_frame_time = now - last_time
+        frame_time = min(raw_frame_time, MAX_FRAME_TIME)
+        last_time = now
+
+        start_game = False
+        inputs = 0
+
+        # === 이벤트 처리 ===
+        input_start = time.perf_counter()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.visible = not profiler.visible
+            
+            if game_state == STATE_MENU:
+                if btn_start.is_clicked(event):
+                    start_game = True
+                elif btn_guide.is_clicked(event):
+                    game_state = STATE_GUIDE
+                elif btn_option.is_clicked(event):
+                    game_state = STATE_OPTION
+                elif btn_exit.is_clicked(event):
+                    running = False
+
+            elif game_state == STATE_GUIDE:
+                if btn_back.is_clicked(event):
+                    game_state = STATE_MENU
+
+            elif game_state == STATE_OPTION:
+                if btn_back.is_clicked(event):
+                    game_state = STATE_MENU
+                
+                if btn_vol_down.is_clicked(event):
+                    current_volume = max(0.0, current_volume - 0.1)
+                    music.set_volume(current_volume)
+                elif btn_vol_up.is_clicked(event):
+                    current_volume = min(1.0, current_volume + 0.1)
+                    music.set_volume(current_volume)
+
+            elif game_state == STATE_PLAYING:
+                if event.type == pygame.KEYDOWN and replay is not None:
+                    if event.key == pygame.K_LEFT:
+                        replay.seek(world.tick - FPS * 10)
+                    elif event.key == pygame.K_RIGHT:
+                        replay.seek(world.tick + FPS * 10)
+                    elif event.key == pygame.K_ESCAPE:
+                        game_state = STATE_PAUSE
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_z:
+                        inputs |= INPUT_SHOOT
+                    elif event.key == pygame.K_ESCAPE:
+                        inputs |= INPUT_PAUSE
+                        game_state = STATE_PAUSE
+
+            elif game_state == STATE_PAUSE:
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        game_state = STATE_PLAYING
+                
+                if btn_vol_down.is_clicked(event):
+                    current_volume = max(0.0, current_volume - 0.1)
+                    music.set_volume(current_volume)
+                elif btn_vol_up.is_clicked(event):
+                    current_volume = min(1.0, current_volume + 0.1)
+                    music.set_volume(current_volume)
+                elif btn_pause_exit.is_clicked(event):
+                    game_state = STATE_MENU
+
+            elif game_state == STATE_GAMEOVER:
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_r:
+                        start_game = True
+                    elif event.key == pygame.K_m: 
+                        game_state = STATE_MENU
+
+        if start_game:
+            # 게임 초기화 (seed를 지정하면 매번 같은 게임이 재현됨)
+            if replay is not None:
+                replay.seek(0)
+            elif world is None:
+                world = GameWorld(seed)
+                world.timings = {}
+            else:
+                world.reset(seed)
+            games_played += 1
+            profiler.reset()
+
+            if record_path:
+                if world.recorder is not None:
+                    world.recorder.close()
+                world.recorder = ReplayRecorder(numbered_path(record_path, games_played), world.seed)
+
+            music.play("music.mp3")
+
+            game_state = STATE_PLAYING
+
+        profiler.add("input", time.perf_counter() - input_start)
+
+        # === 시뮬레이션 (고정 틱) ===
+        # Z/ESC 입력은 실제로 틱이 돌 때까지 보관 (렌더링이 60fps보다 빠를 때)
+        pending_inputs |= inputs
+        # ESC로 멈춘 프레임: 보관한 입력(ESC, 같은 프레임의 Z)을 마지막 한 틱으로 흘려 녹화에 남김
+        pause_flush = game_state == STATE_PAUSE and bool(pending_inputs & INPUT_PAUSE)
+        if pause_flush:
+            accumulator = TICK_SECONDS
+        elif game_state != STATE_PLAYING:
+            accumulator = 0.0
+            pending_inputs = 0
+        elif replay is not None:
+            accumulator += frame_time * replay_speed
+        else:
+            accumulator += frame_time
+        while (game_state == STATE_PLAYING or pause_flush) and accumulator >= TICK_SECONDS:
+            accumulator -= TICK_SECONDS
+            pause_flush = False
+            if replay is not None:
+                tick_events = replay.step()
+                if replay.done and not world.game_over:
+                    # 중간에 끊긴 녹화: 끝난 자리에서 게임 오버 화면으로
+                    game_state = STATE_GAMEOVER
+            else:
+                tick_inputs = pending_inputs | read_held_inputs()
+                pending_inputs = 0
+                tick_events = world.step(tick_inputs)
+            profiler.add_step(world.timings)
+
+            # 흔들림도 틱마다 한 번만 새로 뽑아서 렌더링 fps와 무관하게 유지
+            screen_shake = int(world.screen_shake * quality.level.shake_scale)
+            shake_x = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
+            shake_y = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
+
+            for world_event in tick_events:
+                if world_event == "stage_up" and world.current_stage == 3:
+                    music.play("music2.mp3")
+                elif world_event == "game_over":
+                    # 저장은 백그라운드 스레드가 하고, 색인에는 바로 들어감
+                    if replay is None:
+                        last_record = score_store.add(player_name, world.score, world.current_stage, world.tick, world.seed)
+                    game_state = STATE_GAMEOVER
+
+                    # [NEW] 게임 오버 시 원래 음악으로 복귀
+                    music.play("music.mp3")
+
+        if game_state == STATE_PLAYING:
+            # 보간을 끈 화질에서는 틱 위치 그대로 그림
+            alpha = accumulator / TICK_SECONDS if quality.level.interpolate else None
+        else:
+            shake_x = shake_y = 0
+
+        # 로드를 기다리던 곡이 있으면 준비된 뒤에 크로스페이드
+        music.update()
+
+        # 게임 오버 화면의 순위는 색인이 바뀌었을 때만 다시 조회 (파일 로드가 늦게 끝나도 반영)
+        if game_state == STATE_GAMEOVER and score_version != score_store.version:
+            score_version = score_store.version
+            high_scores = score_store.top(3)
+            player_best = score_store.player_best(player_name)
+
+        # === 화면 그리기 ===
+        # 발판 레이어는 레벨이 바뀔 때(새 게임)만 다시 그림
+        if world is not None and static_layer.update(world.platforms):
+            play_background.fill(BLACK)
+            static_layer.draw(play_background)
+            renderer.set_background(play_background)
+
+        # 일시정지/게임오버에 막 들어왔으면 멈춘 월드를 한 번만 찍어 둠
+        if game_state in (STATE_PAUSE, STATE_GAMEOVER):
+            if frozen_state != game_state:
+                frozen_layer.capture(draw_frozen_world, 150 if game_state == STATE_PAUSE else 200)
+                frozen_state = game_state
+        else:
+            frozen_state = None
+
+        draw_start = time.perf_counter()
+        level = quality.level
+        background_stars.shown = round(background_stars.count * level.star_fraction)
+        if not dirty_rects:
+            screen.fill(BLACK)
+            draw_stars(screen, frame_time * FPS)
+
+            if game_state == STATE_PLAYING:
+                static_layer.draw(screen, shake_x, shake_y)
+                draw_playing(screen, world, hud_digits, shake_x, shake_y, alpha, level.particle_step)
+                quality.draw(screen)
+                profiler.draw(screen)
+            else:
+                draw_screen(screen)
+
+            flip_start = time.perf_counter()
+            pygame.display.flip()
+
+        elif game_state == STATE_PLAYING:
+            # 흔들리는 동안은 화면 전체가 움직이므로 전체 flip
+            full = renderer.begin(shake_x != 0 or shake_y != 0)
+            rects = draw_stars(screen, frame_time * FPS)
+            if full:
+                static_layer.draw(screen, shake_x, shake_y)
+            else:
+                # 별은 발판 뒤에 있어야 하므로 별이 지나간 자리만 발판을 다시 덮음
+                for rect in rects:
+                    static_layer.draw_area(screen, rect)
+            rects += draw_playing(screen, world, hud_digits, shake_x, shake_y, alpha, level.particle_step)
+            rects += quality.draw(screen)
+            rects += profiler.draw(screen)
+            flip_start = time.perf_counter()
+            renderer.end(rects, full)
+
+        else:
+            # 메뉴류 화면: 별 위의 내용은 캐시된 레이어로 두고, 바뀔 때만 다시 그림
+            for btn in state_buttons.get(game_state, []):
+                btn.update_hover()
+            layer_key = (game_state, tuple(btn.hovered for btn in state_buttons.get(game_state, [])), current_volume,
+                         score_version)
+            # 별은 픽셀 위치가 바뀐 것만 지우고, 지운 자리에 걸친 별만 다시 그림
+            background_stars.update(frame_time * FPS)
+            rects = background_stars.moved_rects()
+            renderer.begin_layered(layer_key, draw_screen, rects)
+            background_stars.draw(screen, None if renderer.layer_changed else rects)
+            renderer.end_layered(rects)
+
+        # 화면에 내보낸 그대로 녹화 (복사만 하므로 프로파일러에서는 flip 시간에 포함됨)
+        if capture is not None:
+            capture.add(screen)
+
+        # 프로파일러는 플레이 중인 프레임만 기록
+        if game_state == STATE_PLAYING:
+            frame_end = time.perf_counter()
+            profiler.add("draw", flip_start - draw_start)
+            profiler.add("flip", frame_end - flip_start)
+            profiler.end_frame(raw_frame_time, world)
+            quality.add_frame(frame_end - now)
+
+        # --startup-time: 첫 화면이 나오면 단계별 시간을 출력하고 종료
+        if startup_time:
+            report_startup()
+            running = False
+        elif not music.started:
+            # 오디오 장치를 여는 것도 느릴 수 있어서 첫 화면을 띄운 다음에 첫 곡을 틂
+            music.play("music.mp3")
+
+    if world is not None and world.recorder is not None:
+        world.recorder.close()
+        print(f"replay saved: {world.recorder.path}")
+    if profile_csv:
+        print(f"profile: {profiler.dump_csv(profile_csv)} frames -> {profile_csv}")
+    print(text_cache.stats())
+    print(pool_stats(time.perf_counter() - session_start))
+    if capture is not None:
+        print(capture.close())
+    music.close()
+    score_store.close()
+    pygame.quit()
+    sys.exit()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Shooting Python")
+    parser.add_argument("--headless", action="store_true",
+                        help="화면 없이 봇 입력으로 시뮬레이션만 실행")
+    parser.add_argument("--ticks", type=int, default=FPS * 60 * 10,
+                        help="헤드리스 모드에서 실행할 틱 수 (기본 10분)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="난수 seed (같은 seed + 같은 입력 = 같은 게임)")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help="렌더링 fps 제한 (시뮬레이션은 항상 60틱/초)")
+    parser.add_argument("--uncapped", action="store_true",
+                        help="렌더링 fps 제한 없음")
+    parser.add_argument("--dirty", action="store_true",
+                        help="바뀐 영역만 화면에 갱신 (더티 렉트 렌더링)")
+    parser.add_argument("--stars", type=int, default=50,
+                        help="배경 별 개수")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="플레이 입력을 리플레이 파일로 저장 (두 번째 판부터 PATH-2, PATH-3 ...)")
+    parser.add_argument("--replay", metavar="PATH", default=None,
+                        help="리플레이 파일 재생 (--headless와 함께 쓰면 최대 속도로 검증)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="리플레이 재생 배속")
+    parser.add_argument("--seek", type=int, default=None,
+                        help="리플레이를 이 틱으로 바로 이동")
+    parser.add_argument("--profile-csv", metavar="PATH", default=None,
+                        help="종료할 때 프로파일러 기록(최근 1분)을 CSV로 저장 (F3: 프로파일러 HUD)")
+    parser.add_argument("--levels", metavar="PATH", default=None,
+                        help="발판 배치를 읽을 레벨 파일 (기본 levels.txt)")
+    parser.add_argument("--scores", metavar="PATH", default=SCORES_PATH,
+                        help=f"최고 점수 기록 파일 (기본 {SCORES_PATH})")
+    parser.add_argument("--player", default=None,
+                        help="점수 기록에 남길 플레이어 이름 (기본: 로그인 사용자 이름)")
+    parser.add_argument("--capture", metavar="PATH", default=None,
+                        help="게임 화면을 무손실 녹화 파일로 저장 (--export-frames와 함께 쓰면 PNG로 풀어냄)")
+    parser.add_argument("--export-frames", metavar="DIR", default=None,
+                        help="--capture 파일을 --fps 기준 PNG 연번 파일로 풀어냄")
+    parser.add_argument("--quality", choices=["auto"] + QUALITY_NAMES, default="auto",
+                        help="화질 단계 (auto: 프레임 시간이 예산을 넘으면 자동으로 낮추고, 여유가 생기면 다시 올림)")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="import부터 첫 화면(메뉴)까지 걸린 시간을 단계별로 출력하고 종료")
+    return parser.parse_args(argv)
+
+mark_startup("import")
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.levels:
+        default_levels = LevelSet(args.levels)
+    if args.export_frames:
+        if not args.capture:
+            sys.exit("--export-frames needs --capture PATH")
+        export_capture(args.capture, args.export_frames, args.fps)
+    elif args.headless and args.replay:
+        run_replay(args.replay, args.seek)
+    elif args.headless:
+        run_headless(args.ticks, args.seed, args.record)
+    else:
+        replay = None
+        if args.replay:
+            replay = ReplayPlayer(Replay.load(args.replay))
+            if args.seek is not None:
+                replay.seek(args.seek)
+        main(args.seed, 0 if args.uncapped else args.fps, args.dirty, args.stars,
+             args.record, replay, args.speed, args.profile_csv, args.startup_time, args.scores,
+             args.player or default_player_name(), args.capture, args.quality)
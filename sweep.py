@@ -0,0 +1,133 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import time
+
+# 화면/사운드 없이 실행 (shooting_python import 전에 설정해야 함)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# SDL이 SIGTERM을 가로채면 Pool이 워커를 끝내지 못하고 멈춤
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+import numpy as np
+
+import shooting_python as game
+
+# 기본 격자: 4 x 5 x 5 = 100개 조합 (나머지 값은 DEFAULT_TUNING 그대로)
+DEFAULT_GRID = {
+    "kill_goal": [5, 10, 15, 20],
+    "spawn_step": [100, 150, 200, 250, 300],
+    "speed_step": [0.1, 0.2, 0.3, 0.4, 0.5],
+}
+
+
+# 워커 프로세스에서 게임 한 판을 봇으로 끝까지 돌림
+def play_game(task):
+    point, tuning, seed, max_ticks, lives = task
+    world = game.GameWorld(seed, tuning)
+    # 파티클은 그림에만 쓰이므로 끔 (batch_env.py와 같음)
+    world.effects = False
+    world.player_lives = lives
+    while not world.game_over and world.tick < max_ticks:
+        world.step(game.bot_inputs(world))
+    return point, world.elapsed_seconds, world.current_stage, world.score
+
+
+def summarize(values):
+    values = np.array(values, float)
+    return {
+        "mean": round(float(values.mean()), 2),
+        "p10": round(float(np.percentile(values, 10)), 2),
+        "p50": round(float(np.percentile(values, 50)), 2),
+        "p90": round(float(np.percentile(values, 90)), 2),
+        "max": round(float(values.max()), 2),
+    }
+
+
+def run_sweep(grid, games, workers, max_minutes, seed=0, lives=3):
+    names = list(grid)
+    points = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    max_ticks = int(max_minutes * 60 * game.FPS)
+    # 모든 조합이 같은 seed 목록으로 돌도록 해서 조합 간 비교가 공정하게
+    tasks = [(i, point, seed + g, max_ticks, lives) for i, point in enumerate(points) for g in range(games)]
+
+    results = [{"survival": [], "stage": [], "score": []} for _ in points]
+    start = time.perf_counter()
+    # fork는 pygame(SDL)이 초기화된 프로세스를 복제하므로 새 프로세스로 띄움
+    pool = multiprocessing.get_context("spawn").Pool(workers)
+    for done, (i, survival, stage, score) in enumerate(pool.imap_unordered(play_game, tasks, chunksize=16), 1):
+        results[i]["survival"].append(survival)
+        results[i]["stage"].append(stage)
+        results[i]["score"].append(score)
+        if done % 1000 == 0:
+            print(f"  {done}/{len(tasks)} games ({time.perf_counter() - start:.0f}s)")
+    pool.close()
+    pool.join()
+    elapsed = time.perf_counter() - start
+
+    report = []
+    for point, result in zip(points, results):
+        report.append({
+            "tuning": point,
+            "games": len(result["survival"]),
+            "survival_s": summarize(result["survival"]),
+            "stage": summarize(result["stage"]),
+            "score": summarize(result["score"]),
+            "stage_histogram": {int(k): int(v) for k, v in zip(*np.unique(result["stage"], return_counts=True))},
+        })
+    return report, elapsed, len(tasks)
+
+
+def print_report(report, names):
+    header = " ".join(f"{name:>10}" for name in names)
+    print(f"{header} {'survive p50':>12} {'p90':>7} {'stage p50':>10} {'p90':>5} {'max':>5} {'score p50':>10}")
+    # 오래 버티는 조합부터
+    for row in sorted(report, key=lambda r: r["survival_s"]["p50"], reverse=True):
+        values = " ".join(f"{row['tuning'][name]:>10}" for name in names)
+        print(f"{values} {row['survival_s']['p50']:>11.1f}s {row['survival_s']['p90']:>6.1f}s "
+              f"{row['stage']['p50']:>10.0f} {row['stage']['p90']:>5.0f} {row['stage']['max']:>5.0f} "
+              f"{row['score']['p50']:>10.0f}")
+
+
+def parse_values(text, cast):
+    return [cast(value) for value in text.split(",")]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="난이도 조합별로 봇 게임을 여러 프로세스에서 돌려 비교")
+    parser.add_argument("--games", type=int, default=50, help="조합마다 돌릴 게임 수")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="프로세스 수 (기본: 코어 수)")
+    parser.add_argument("--max-minutes", type=float, default=10, help="한 판의 최대 시뮬레이션 시간 (분)")
+    parser.add_argument("--seed", type=int, default=0, help="첫 게임 seed (게임마다 1씩 증가)")
+    parser.add_argument("--lives", type=int, default=3, help="시작 목숨 (봇이 뒤쪽 스테이지까지 가 보도록 늘릴 때)")
+    parser.add_argument("--json", metavar="PATH", default=None, help="결과를 JSON으로 저장")
+    for name, default in game.DEFAULT_TUNING.items():
+        cast = float if isinstance(default, float) else int
+        values = ",".join(str(v) for v in DEFAULT_GRID.get(name, [default]))
+        parser.add_argument("--" + name.replace("_", "-"), type=lambda text, cast=cast: parse_values(text, cast),
+                            default=parse_values(values, cast), help=f"쉼표로 구분한 값 목록 (기본 {values})")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    grid = {name: getattr(args, name) for name in game.DEFAULT_TUNING}
+    varied = [name for name, values in grid.items() if len(values) > 1]
+    points = int(np.prod([len(values) for values in grid.values()]))
+    print(f"{points} tuning points x {args.games} games on {args.workers} workers")
+
+    report, elapsed, total = run_sweep(grid, args.games, args.workers, args.max_minutes, args.seed, args.lives)
+    print(f"{total} games in {elapsed:.1f}s ({total / elapsed:.0f} games/s)")
+    print_report(report, varied or list(grid))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"games": args.games, "max_minutes": args.max_minutes, "seed": args.seed, "lives": args.lives,
+                       "points": report}, f, indent=2)
+        print(f"saved {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 창/사운드 장치 없이 돌도록 (CI, 헤드리스 서버)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
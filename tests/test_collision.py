@@ -0,0 +1,43 @@
+import random
+
+import pygame
+
+import shooting_python as game
+
+def make_sprites(rng, count, size):
+    sprites = []
+    for _ in range(count):
+        sprite = pygame.sprite.Sprite()
+        sprite.rect = pygame.Rect(rng.randint(0, 300), rng.randint(0, 300), *size)
+        sprites.append(sprite)
+    return sprites
+
+def describe(hits, enemies, bullets):
+    return [(enemies.index(e), [bullets.index(b) for b in hit]) for e, hit in hits.items()]
+
+def test_bullet_hits_match_groupcollide_for_overlapping_enemies():
+    rng = random.Random(1)
+    for _ in range(20):
+        enemies = make_sprites(rng, 60, (35, 35))
+        bullets = make_sprites(rng, 40, (10, 20))
+        start = [tuple(e.rect) for e in enemies]
+        # 밀어내기처럼 일부 적을 옆 칸으로 옮김 (해시 칸 안의 순서가 그룹 순서와 달라짐)
+        moved = rng.sample(enemies, 30)
+        for enemy in moved:
+            enemy.rect.x += rng.choice((-40, 40))
+        end = [tuple(e.rect) for e in enemies]
+
+        group = pygame.sprite.Group(enemies)
+        expected = describe(pygame.sprite.groupcollide(group, pygame.sprite.Group(bullets), True, True),
+                            enemies, bullets)
+
+        group = pygame.sprite.Group(enemies)
+        for enemy, rect in zip(enemies, start):
+            enemy.rect = pygame.Rect(rect)
+        grid = game.SpatialHash()
+        grid.rebuild(group)
+        for enemy in moved:
+            enemy.rect = pygame.Rect(end[enemies.index(enemy)])
+            grid.move(enemy)
+        hits = game.collide_bullets_enemies(pygame.sprite.Group(bullets), grid)
+        assert describe(hits, enemies, bullets) == expected
@@ -0,0 +1,116 @@
+import netplay
+import shooting_python as game
+
+def test_entities_round_trip_from_empty_baseline():
+    table = {1: (netplay.ENTITY_ENEMY, 10, 20, 2), 5: (netplay.ENTITY_BULLET, -3, 300, -1),
+             300: (netplay.ENTITY_ITEM, 400, 0, 1)}
+    data = bytes(netplay.encode_entities(table, {}))
+    decoded, pos = netplay.decode_entities(data, 0, {})
+    assert decoded == table
+    assert pos == len(data)
+
+def test_entities_delta_against_baseline():
+    baseline = {1: (netplay.ENTITY_ENEMY, 10, 20, 0), 2: (netplay.ENTITY_ENEMY, 50, 50, 0),
+                3: (netplay.ENTITY_BULLET, 0, 0, 1), 4: (netplay.ENTITY_ITEM, 7, 7, 2),
+                6: (netplay.ENTITY_ENEMY, 90, 90, 1)}
+    table = {
+        1: (netplay.ENTITY_ENEMY, 10, 20, 0),       # 그대로
+        2: (netplay.ENTITY_ENEMY, 53, 49, 0),       # 조금 움직임 (dx, dy만)
+        3: (netplay.ENTITY_BULLET, 200, 0, 1),      # 크게 움직임 (전체 값)
+        6: (netplay.ENTITY_ENEMY, 90, 90, 3),       # 색이 바뀜 (전체 값)
+        9: (netplay.ENTITY_ITEM, 1, 2, 0),          # 새로 생김
+    }                                               # 4는 사라짐
+    data = bytes(netplay.encode_entities(table, baseline))
+    decoded, pos = netplay.decode_entities(data, 0, baseline)
+    assert decoded == table
+    assert pos == len(data)
+    # 바뀌지 않은 엔티티는 보내지 않으므로 전체를 보낼 때보다 작아야 함
+    assert len(data) < len(netplay.encode_entities(table, {}))
+
+def test_reused_pool_sprite_gets_a_new_entity_id():
+    world = game.GameWorld(3)
+    entities = netplay.NetEntities()
+    enemy = game.enemy_pool.acquire(100, 100, world.player, 3, game.RED)
+    world.enemies.add(enemy)
+    first = entities.table(world)
+    # 다음 스냅샷 전에 죽고 같은 객체가 다른 자리에 다시 나옴
+    enemy.kill()
+    again = game.enemy_pool.acquire(600, 300, world.player, 3, game.RED)
+    world.enemies.add(again)
+    assert again is enemy
+    second = entities.table(world)
+    assert set(first).isdisjoint(second)
+    again.kill()
+
+
+class Pipe:
+    # 메모리 안에서 주고받는 가짜 UDP 소켓 (drop이 True를 돌려주면 그 패킷은 버림)
+    def __init__(self, address):
+        self.address = address
+        self.peer = None
+        self.inbox = []
+        self.drop = lambda data: False
+
+    def sendto(self, data, address):
+        if not self.drop(data):
+            self.peer.inbox.append((bytes(data), self.address))
+        return len(data)
+
+    def recvfrom(self, size):
+        if not self.inbox:
+            raise BlockingIOError
+        return self.inbox.pop(0)
+
+def connect_pair(seed=3):
+    server_sock, client_sock = Pipe(("server", 1)), Pipe(("client", 1))
+    server_sock.peer, client_sock.peer = client_sock, server_sock
+    server = netplay.NetServer(server_sock, seed=seed)
+    client = netplay.NetClient(client_sock, server_sock.address)
+    client.connect()
+    server.poll()
+    client.poll()
+    assert client.connected
+    return server, client, server_sock
+
+def play(server, client, ticks):
+    for tick in range(ticks):
+        client.send_input(game.INPUT_SHOOT if tick % 10 == 0 else game.INPUT_RIGHT)
+        server.poll()
+        server.step()
+        client.poll()
+
+def test_client_decodes_deltas_against_acked_baseline():
+    server, client, server_sock = connect_pair()
+    baselines = []
+    send = server_sock.sendto
+    def record(data, address):
+        if data[:1] == netplay.MSG_SNAPSHOT:
+            baselines.append(netplay.SNAPSHOT_HEADER.unpack_from(data)[2])
+        return send(data, address)
+    server_sock.sendto = record
+    play(server, client, 300)
+
+    # 첫 스냅샷 말고는 클라이언트가 받았다고 알려 준 스냅샷을 기준으로 한 차이만 와야 함
+    assert baselines[0] == 0
+    assert all(baselines[1:])
+    assert client.undecodable == 0
+    session = server.sessions[0]
+    assert client.entities == session.table
+    assert client.world[1] == session.world.tick
+
+def test_lost_snapshots_do_not_break_delta_decoding():
+    server, client, server_sock = connect_pair()
+    sent = [0]
+    def lossy(data):
+        # 스냅샷 세 개 중 하나를 버림: 서버는 계속 마지막으로 확인된 스냅샷을 기준으로 씀
+        if data[:1] != netplay.MSG_SNAPSHOT:
+            return False
+        sent[0] += 1
+        return sent[0] % 3 == 0
+    server_sock.drop = lossy
+    play(server, client, 300)
+    assert client.undecodable == 0
+    assert client.snapshots < sent[0]
+    server_sock.drop = lambda data: False
+    play(server, client, 10)
+    assert client.entities == server.sessions[0].table
@@ -0,0 +1,41 @@
+import numpy as np
+import pygame
+
+import shooting_python as game
+
+def lit(particles, step):
+    surface = pygame.Surface((game.SCREEN_WIDTH, game.SCREEN_HEIGHT), 0, 32)
+    particles.draw(surface, step=step)
+    return {tuple(p) for p in np.argwhere(pygame.surfarray.pixels2d(surface) != 0)}
+
+def test_thinning_keeps_the_same_particles_when_others_expire():
+    particles = game.ParticleSystem(rng=np.random.default_rng(1))
+    for i in range(40):
+        particles.emit(10 + 15 * i, 100 + 5 * (i % 7), game.RED, 1)
+    n = len(particles)
+    particles.vel[:n] = 0
+    particles.size[:n] = 4
+    particles.life[:n] = 100
+    particles.life[:n:3] = 1        # 앞쪽부터 섞여 있는 파티클이 다음 update에서 사라짐
+
+    before = lit(particles, 2)
+    alive_ids = set(particles.ids[:n][particles.life[:n] > 1].tolist())
+    particles.update()
+    after = lit(particles, 2)
+
+    # 배열 위치가 당겨져도 남은 파티클 중 그려지는 것은 그대로 (번호가 짝수인 것)
+    assert set(particles.ids[:len(particles)].tolist()) == alive_ids
+    assert after <= before
+    drawn = {i for i in alive_ids if i % 2 == 0}
+    assert len(after) == 16 * len(drawn)
+
+def test_snapshot_keeps_particle_ids():
+    particles = game.ParticleSystem(rng=np.random.default_rng(1))
+    particles.emit(100, 100, game.RED, 10)
+    particles.life[:5] = 1
+    particles.update()
+    state = particles.snapshot()
+    restored = game.ParticleSystem(rng=np.random.default_rng(2))
+    restored.restore(state)
+    restored.emit(100, 100, game.RED, 1)
+    assert restored.ids[:len(restored)].tolist() == [5, 6, 7, 8, 9, 10]
@@ -0,0 +1,63 @@
+import shooting_python as game
+
+KEYFRAME_TICKS = 60
+
+def record_game(path, seed=3, ticks=1500):
+    # 봇으로 한 판을 녹화 (게임 오버나 ticks 중 먼저 오는 쪽까지)
+    world = game.GameWorld(seed)
+    world.recorder = game.ReplayRecorder(str(path), world.seed, KEYFRAME_TICKS)
+    while world.tick < ticks and not world.game_over:
+        world.step(game.bot_inputs(world))
+    world.recorder.close()
+    return world
+
+def play_to_end(replay):
+    player = game.ReplayPlayer(replay)
+    while not player.done:
+        player.step()
+    return player
+
+def test_playback_matches_recording(tmp_path):
+    path = tmp_path / "replay.rpl"
+    world = record_game(path)
+    replay = game.Replay.load(str(path))
+    player = play_to_end(replay)
+    assert len(replay) == world.tick
+    assert player.desyncs == []
+    assert player.world.state_digest() == world.state_digest()
+
+def test_seek_to_end_is_bounded_by_keyframe_interval(tmp_path):
+    path = tmp_path / "replay.rpl"
+    record_game(path)
+    replay = game.Replay.load(str(path))
+    assert len(replay) > 2 * KEYFRAME_TICKS
+    assert len(replay.keyframes) == len(replay) // KEYFRAME_TICKS
+
+    expected = play_to_end(replay).world.state_digest()
+    player = game.ReplayPlayer(replay)
+    steps = 0
+    step = player.world.step
+    def counting_step(inputs):
+        nonlocal steps
+        steps += 1
+        return step(inputs)
+    player.world.step = counting_step
+    player.seek(len(replay))
+    assert steps <= KEYFRAME_TICKS
+    assert player.world.tick == len(replay)
+    assert player.world.state_digest() == expected
+
+def test_seek_backwards_matches_forward_playback(tmp_path):
+    path = tmp_path / "replay.rpl"
+    record_game(path)
+    replay = game.Replay.load(str(path))
+    target = len(replay) // 2 + 7
+
+    forward = game.ReplayPlayer(replay)
+    while forward.world.tick < target:
+        forward.step()
+    player = game.ReplayPlayer(replay)
+    player.seek(len(replay))
+    player.seek(target)
+    assert player.world.tick == target
+    assert player.world.state_digest() == forward.world.state_digest()
@@ -0,0 +1,76 @@
+import os
+import threading
+
+import shooting_python as game
+
+def wait_loaded(store):
+    # 로드는 저장 스레드가 하므로 끝날 때까지 기다림
+    for _ in range(500):
+        if store.loaded:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("score log did not load")
+
+def write_log(path, scores):
+    store = game.ScoreStore(str(path))
+    wait_loaded(store)
+    for i, score in enumerate(scores):
+        store.add(f"p{i}", score, 1, 60, i)
+    store.close()
+
+def test_scores_survive_reopen(tmp_path):
+    path = tmp_path / "scores.log"
+    write_log(path, [300, 100, 200])
+    store = game.ScoreStore(str(path))
+    wait_loaded(store)
+    assert [r.score for r in store.top(3)] == [300, 200, 100]
+    store.close()
+
+def test_truncated_tail_is_dropped_and_log_stays_appendable(tmp_path, capsys):
+    path = tmp_path / "scores.log"
+    write_log(path, [300, 100, 200])
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.truncate(size - 5)      # 마지막 레코드 중간에서 꺼진 것처럼
+
+    store = game.ScoreStore(str(path))
+    wait_loaded(store)
+    assert [r.score for r in store.top(3)] == [300, 100]
+    assert "torn/corrupt" in capsys.readouterr().out
+    store.add("late", 150, 1, 60, 9)
+    store.close()
+
+    store = game.ScoreStore(str(path))
+    wait_loaded(store)
+    assert [(r.name, r.score) for r in store.top(5)] == [("p0", 300), ("late", 150), ("p1", 100)]
+    store.close()
+
+def test_loaded_records_rank_above_ties_added_during_load(tmp_path, monkeypatch):
+    path = tmp_path / "scores.log"
+    write_log(path, [100])
+
+    # 로드가 끝나기 전에 같은 점수가 들어와도 파일에 먼저 있던 기록이 위
+    release = threading.Event()
+    load = game.ScoreStore.load
+    def slow_load(self):
+        release.wait(5)
+        load(self)
+    monkeypatch.setattr(game.ScoreStore, "load", slow_load)
+    store = game.ScoreStore(str(path))
+    store.add("p0", 100, 1, 60, 1)
+    store.add("new", 100, 1, 60, 2)
+    release.set()
+    wait_loaded(store)
+    assert [r.seed for r in store.top(3)] == [0, 1, 2]
+    assert store.player_best("p0").seed == 0
+    store.close()
+
+def test_ranking_keeps_only_top_records(tmp_path):
+    store = game.ScoreStore(str(tmp_path / "scores.log"), keep=5)
+    wait_loaded(store)
+    for score in range(20):
+        store.add("p", score * 10, 1, 60, score)
+    assert len(store.ranked) == 5
+    assert [r.score for r in store.top(3)] == [190, 180, 170]
+    assert store.player_best("p").score == 190
+    store.close()
@@ -0,0 +1,45 @@
+import shooting_python as game
+
+def coop_inputs(world, tick):
+    # 1P는 봇, 2P는 좌우로 오가며 계속 쏨
+    second = (game.INPUT_LEFT if tick // 90 % 2 else game.INPUT_RIGHT) | (game.INPUT_SHOOT if tick % 7 == 0 else 0)
+    return [game.bot_inputs(world), second]
+
+def run(world, ticks):
+    for _ in range(ticks):
+        world.step(coop_inputs(world, world.tick))
+
+def test_headless_digest_is_stable():
+    world = game.GameWorld(42)
+    for _ in range(600):
+        world.step(game.bot_inputs(world))
+    again = game.GameWorld(42)
+    for _ in range(600):
+        again.step(game.bot_inputs(again))
+    assert world.state_digest() == again.state_digest()
+
+def test_coop_snapshot_restores_every_player():
+    world = game.GameWorld(7)
+    world.add_player()
+    # 2P가 맞아서 무적 타이머가 돌고 있는 틱을 저장
+    while world.tick < 1000 and not world.timers.active(("invincible", 1)):
+        run(world, 1)
+    assert world.timers.active(("invincible", 1))
+    snapshot = world.snapshot()
+    run(world, 300)
+    expected = world.state_digest()
+
+    # 혼자인 새 월드에 복원해도 플레이어 수, 타이머, 적이 쫓는 플레이어까지 돌아와야 함
+    restored = game.GameWorld(7)
+    restored.restore(snapshot)
+    assert len(restored.players) == 2
+    run(restored, 300)
+    assert restored.state_digest() == expected
+
+def test_digest_covers_extra_players():
+    world = game.GameWorld(5)
+    world.add_player()
+    run(world, 60)
+    before = world.state_digest()
+    world.players[1].rect.x += 1
+    assert world.state_digest() != before